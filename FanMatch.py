@@ -1,11 +1,103 @@
+import numpy as np
 import pandas as pd
 import re
-from datetime import datetime
+import lxml.html
+from datetime import datetime, timedelta
 from cloudscraper import CloudScraper
 from bs4 import BeautifulSoup, Tag
-from bs4.element import NavigableString
-from typing import Any, Dict, Optional, List, Union
-from .utils import get_html
+from bs4.element import CData, NavigableString
+from typing import Any, Dict, Iterator, Optional, List, Tuple, Union
+from page_cache import get_html
+
+
+def _lx_text(el, separator: str = "", strip: bool = False) -> str:
+    """lxml equivalent of bs4 `Tag.get_text(separator, strip)`."""
+    if strip:
+        return separator.join(t.strip() for t in el.itertext() if t.strip())
+    return separator.join(el.itertext())
+
+
+def _lx_find(el, tag: str, cls: Optional[str] = None, style: Optional[str] = None):
+    """First descendant `tag` with class token `cls` / style containing `style`."""
+    for child in el.iter(tag):
+        if cls is not None and cls not in (child.get("class") or "").split():
+            continue
+        if style is not None and style not in (child.get("style") or ""):
+            continue
+        return child
+    return None
+
+
+def _lx_direct_strings(el) -> List[str]:
+    """Text nodes that are direct children of `el`, in document order."""
+    strings = [el.text] + [child.tail for child in el]
+    return [text for text in strings if text]
+
+
+
+def _compile_patterns(
+    patterns: Dict[str, str], flags: Dict[str, int], tight: Dict[str, str]
+) -> Dict[str, "re.Pattern"]:
+    """Compile every pattern once, with its flags.
+
+    Where `tight` has a tightened rewrite of a pattern it is used instead.
+    """
+    return {
+        key: re.compile(tight.get(key, pattern), flags.get(key, 0))
+        for key, pattern in patterns.items()
+    }
+
+
+def _combine_patterns(patterns: Dict[str, str], keys, ignorecase) -> tuple:
+    """Compile `keys` into one alternation with a named group per key.
+
+    Returns the compiled pattern and the number of inner groups per key; the
+    inner groups of key `k` follow its named group `groupindex[k]`.
+    """
+    alternatives = []
+    inner_groups = {}
+    for key in keys:
+        pattern = f"(?i:{patterns[key]})" if key in ignorecase else patterns[key]
+        alternatives.append(f"(?P<{key}>{pattern})")
+        inner_groups[key] = re.compile(patterns[key]).groups
+    return re.compile("|".join(alternatives)), inner_groups
+
+
+class _ColumnBuffer:
+    """Columnar store for records: one preallocated object array per column,
+    doubled when full and turned into a DataFrame once, with the same dtype
+    inference a DataFrame built from the records would get.
+    """
+
+    def __init__(self, columns: List[str], capacity: int = 8192):
+        self.columns = list(columns)
+        self._capacity = max(int(capacity), 1)
+        self._size = 0
+        self._data = {col: np.empty(self._capacity, dtype=object) for col in self.columns}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, record: Dict[str, Any]) -> None:
+        if self._size == self._capacity:
+            self._grow()
+        i = self._size
+        for col, values in self._data.items():
+            values[i] = record.get(col, np.nan)
+        self._size += 1
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for col, values in self._data.items():
+            grown = np.empty(self._capacity, dtype=object)
+            grown[: self._size] = values[: self._size]
+            self._data[col] = grown
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {col: pd.Series(values[: self._size]).infer_objects() for col, values in self._data.items()},
+            columns=self.columns,
+        )
 
 
 class FanMatch:
@@ -18,6 +110,13 @@ class FanMatch:
             by the `login` function.
         date (str or None): Date to scrape, in format "YYYY-MM-DD", such as "2020-01-29".
         html_content (str, bytes or None): Optionally pass in html to use instead of fetching.
+        engine (str): Parser engine, "bs4" (BeautifulSoup with html.parser, the default) or
+            "lxml" (lxml.html tree with a per-row fast path). Both produce the same fm_df and
+            summary attributes on well-formed pages. Where a row is missing a closing `</td>`,
+            lxml closes the cell instead of nesting the following cells inside it, so
+            text no longer bleeds into the next column.
+        typed (bool): If True, fm_df is converted with `to_typed`: nullable ints and floats,
+            categorical team/place columns and PredictedScore split into two score columns.
 
     Attributes:
         url (str): Full url for the page to be scraped.
@@ -34,8 +133,12 @@ class FanMatch:
         expected_record_favs (str): Expected record of favorites for the day.
         exact_mov (str): Number of games where margin of victory was accurately predicted out of total played.
         fm_df (pandas dataframe or None): Pandas dataframe containing parsed FanMatch table. If there are no games that day, fm_df will be None.
+        no_games (bool): True when the page says there were no games that day. fm_df is also None for
+            a page of another date or without the table, so this tells a real empty day from a bad page.
     """
 
+    # What the page says instead of a table on a day without games
+    NO_GAMES_TEXT = "Sorry, no games today."
     _TABLE_ID = "fanmatch-table"
     _DATE_CLASS = "lh12"
     _RANK_CLASS = "seed-gray"
@@ -52,6 +155,8 @@ class FanMatch:
     _COL_EXCITEMENT = 6
     _MIN_COLUMNS = 5
 
+    _ENGINES = ("bs4", "lxml")
+
     _PATTERNS = {
         # date and time
         "date": r"for \w+, (\w+ \d{1,2}[a-z]{2})",
@@ -70,6 +175,8 @@ class FanMatch:
         "non_ranked": r"NR\s+([A-Za-z\s&\'.]+?)\s+(?:vs\.|at)",
         # Completed game
         "completed_game": r"(\d+|NR)\s+(.+?)\s+(\d+),\s+(\d+|NR)\s+(.+?)\s+(\d+)",
+        "mvp_suffix": r"MVP:.*$",
+        "team_score": r"\s*(\d{2,3})",
         # Summary statistics
         "ppg": r"Points per game:\s*(\d+\.?\d*)",
         "avg_eff": r"Average efficiency:\s*(\d+\.?\d*)",
@@ -82,6 +189,48 @@ class FanMatch:
         "exact_mov": r"Exact.*?(\d+)\s+of\s+(\d+)",
     }
 
+    # Summary statistics, in page order; mae_total_score must stay ahead of
+    # mae_mov since both start at "Mean absolute error"
+    _SUMMARY_KEYS = (
+        "ppg",
+        "avg_eff",
+        "pos_40",
+        "mae_total_score",
+        "pred_score_bias",
+        "mae_mov",
+        "fav_records",
+        "exp_record",
+        "exact_mov",
+    )
+    _SUMMARY_IGNORECASE = ("mae_total_score", "mae_mov", "exact_mov")
+    # The literal each summary pattern starts with
+    _SUMMARY_START = re.compile(
+        r"Points per game:|Average efficiency:|Possessions per 40 minutes:"
+        r"|(?i:Mean absolute error)|Bias|Record of favorites today:|\(expected:|(?i:Exact)"
+    )
+    _SUMMARY_SCAN, _SUMMARY_GROUPS = _combine_patterns(
+        _PATTERNS, _SUMMARY_KEYS, _SUMMARY_IGNORECASE
+    )
+
+    _PATTERN_FLAGS = {"time": re.IGNORECASE, **{key: re.IGNORECASE for key in _SUMMARY_IGNORECASE}}
+    # Tightened rewrites of per-row patterns. Open-ended runs are bounded to
+    # what a FanMatch page holds (letters in day and month names, two-digit
+    # minutes, at most three digits of possessions, percentage or rank), so a
+    # near miss fails within a few characters instead of backtracking through
+    # a long run. They match the same text as _PATTERNS on FanMatch pages,
+    # which benchmarks/profile_fanmatch_patterns.py checks by replaying every
+    # call. Plain `re` syntax, so they also work on Python 3.10 (as in CI).
+    _TIGHT_PATTERNS = {
+        "date": r"for [A-Za-z]+, ([A-Za-z]+ \d{1,2}[a-z]{2})",
+        "time": r"(\d{1,2}:\d{2}\s*[ap]m)",
+        "possessions": r"\[(\d{1,3})\]",
+        "win_probability": r"\((\d{1,3}(?:\.\d+)?%)\)",
+        "rank_marker": r"·(\d{1,3})·",
+    }
+    # Compiled once for the class; look patterns up here rather than passing
+    # _PATTERNS strings to the re module functions
+    _RE = _compile_patterns(_PATTERNS, _PATTERN_FLAGS, _TIGHT_PATTERNS)
+
     _OUTPUT_COLS = [
         "Game",
         "Team1",
@@ -117,12 +266,157 @@ class FanMatch:
         "Possessions",
     ]
 
+    # Column types for `to_typed`
+    _RANK_COLS = ["Team1Rank", "Team2Rank", "ThrillScoreRank", "ComebackRank", "ExcitementRank"]
+    _INT_COLS = ["WinnerScore", "LoserScore", "PredictedPossessions", "Possessions"]
+    _FLOAT_COLS = ["PredictedMOV", "ActualMOV", "ThrillScore", "Comeback", "Excitement"]
+    # Team columns share one category set so they can be compared with each other
+    _TEAM_COLS = ["Team1", "Team2", "PredictedWinner", "PredictedLoser", "Winner", "Loser"]
+    _CATEGORY_COLS = ["Conference", "Network", "Tournament", "City", "State", "Arena"]
+    _TYPED_OUTPUT_COLS = [
+        col
+        for name in _OUTPUT_COLS
+        for col in (
+            ("PredictedWinnerScore", "PredictedLoserScore") if name == "PredictedScore" else (name,)
+        )
+    ]
+
     def __init__(
         self,
         browser: CloudScraper,
         date: Optional[str] = None,
         html_content: Optional[Union[bytes, str]] = None,
+        engine: str = "bs4",
+        typed: bool = False,
     ):
+        if engine not in self._ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {self._ENGINES}")
+
+        self._init_attributes(date)
+
+        if html_content is None:
+            html_content = get_html(browser, self.url)
+
+        games_data = self._parse_page(html_content, date, engine)
+        if not games_data:
+            return
+
+        self.fm_df = pd.DataFrame(games_data)
+
+        self._post_process_df()
+
+        if typed:
+            self.fm_df = self.to_typed(self.fm_df)
+
+    @classmethod
+    def to_typed(cls, fm_df: pd.DataFrame) -> pd.DataFrame:
+        """Convert an `fm_df` (or `season_df`) frame to typed columns.
+
+        Ranks, scores and possessions become nullable Int16 ("NR" and blanks
+        become <NA>); MOVs and the ThrillScore/Comeback/Excitement values become
+        nullable Float64; WinProbability becomes a Float64 fraction ("73%" ->
+        0.73); OT becomes nullable boolean; team, conference, network,
+        tournament and place names become categoricals; PredictedScore
+        ("75-68") is replaced by PredictedWinnerScore and PredictedLoserScore.
+        Other columns are left as they are.
+        """
+        typed = fm_df.copy()
+
+        for col in cls._RANK_COLS + cls._INT_COLS:
+            typed[col] = pd.to_numeric(typed[col], errors="coerce").astype("Int16")
+        for col in cls._FLOAT_COLS:
+            typed[col] = pd.to_numeric(typed[col], errors="coerce").astype("Float64")
+
+        win_probability = typed["WinProbability"].astype("string").str.rstrip("%")
+        typed["WinProbability"] = pd.to_numeric(win_probability, errors="coerce").astype("Float64") / 100
+
+        typed["OT"] = typed["OT"].astype("boolean")
+
+        # Not stack(), whose NA handling depends on the pandas version
+        teams = pd.concat([typed[col].dropna() for col in cls._TEAM_COLS]).unique()
+        team_dtype = pd.CategoricalDtype(sorted(teams))
+        for col in cls._TEAM_COLS:
+            typed[col] = typed[col].astype(team_dtype)
+        for col in cls._CATEGORY_COLS:
+            typed[col] = typed[col].astype("category")
+
+        predicted = typed["PredictedScore"].astype("string").str.extract(r"^(\d+)-(\d+)$")
+        typed["PredictedWinnerScore"] = pd.to_numeric(predicted[0], errors="coerce").astype("Int16")
+        typed["PredictedLoserScore"] = pd.to_numeric(predicted[1], errors="coerce").astype("Int16")
+
+        output_cols = set(cls._OUTPUT_COLS) | set(cls._TYPED_OUTPUT_COLS)
+        leading = [col for col in typed.columns if col not in output_cols]
+        return typed[leading + cls._TYPED_OUTPUT_COLS]
+
+    @classmethod
+    def iter_games(
+        cls,
+        browser: CloudScraper,
+        start_date: str,
+        end_date: Optional[str] = None,
+        engine: str = "bs4",
+        html_pages: Optional[Dict[str, Union[bytes, str]]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the games of every date from `start_date` to `end_date` (inclusive).
+
+        Pages are fetched and parsed one date at a time and dropped before the
+        next one, and no per-date DataFrame is built. Each record holds a
+        "Date" ("YYYY-MM-DD") and the `fm_df` columns, with the values `fm_df`
+        would hold for that game.
+
+        Args:
+            browser (CloudScraper): Authenticated browser, as for `FanMatch`.
+            start_date (str): First date, "YYYY-MM-DD".
+            end_date (str or None): Last date, "YYYY-MM-DD"; defaults to `start_date`.
+            engine (str): Parser engine, see `FanMatch`.
+            html_pages (dict or None): Optional html per date to use instead of fetching.
+        """
+        if engine not in cls._ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {cls._ENGINES}")
+
+        day = datetime.strptime(start_date, "%Y-%m-%d")
+        last = datetime.strptime(end_date or start_date, "%Y-%m-%d")
+        while day <= last:
+            date = day.strftime("%Y-%m-%d")
+            fm = cls.__new__(cls)
+            fm._init_attributes(date)
+
+            html_content = (html_pages or {}).get(date)
+            if html_content is None:
+                html_content = get_html(browser, fm.url)
+
+            for record in fm._parse_page(html_content, date, engine):
+                yield fm._finish_record(record, date)
+            day += timedelta(days=1)
+
+    @classmethod
+    def season_df(
+        cls,
+        browser: CloudScraper,
+        start_date: str,
+        end_date: Optional[str] = None,
+        engine: str = "bs4",
+        html_pages: Optional[Dict[str, Union[bytes, str]]] = None,
+        capacity: int = 8192,
+        typed: bool = False,
+    ) -> pd.DataFrame:
+        """All games from `start_date` to `end_date` in one DataFrame.
+
+        Records from `iter_games` go straight into a preallocated columnar
+        buffer, and the frame is built once at the end. The columns are "Date"
+        followed by the `fm_df` columns.
+
+        Args:
+            capacity (int): Rows to preallocate; the buffer doubles when full.
+            typed (bool): Convert the frame with `to_typed`.
+        """
+        buffer = _ColumnBuffer(["Date"] + cls._OUTPUT_COLS, capacity)
+        for record in cls.iter_games(browser, start_date, end_date, engine, html_pages):
+            buffer.append(record)
+        season = buffer.to_frame()
+        return cls.to_typed(season) if typed else season
+
+    def _init_attributes(self, date: Optional[str]) -> None:
         self.url = "https://kenpom.com/fanmatch.php"
         self.date = date
         self.fm_date = None
@@ -137,48 +431,74 @@ class FanMatch:
         self.expected_record_favs: Optional[str] = None
         self.exact_mov: Optional[str] = None
         self.fm_df = None
+        self.no_games = False
 
         if self.date is not None:
             self.url = self.url + "?d=" + self.date
 
-        if html_content is None:
-            fm = BeautifulSoup(get_html(browser, self.url), "html.parser")
-        else:
-            fm = BeautifulSoup(html_content, "html.parser")
+    def _parse_page(
+        self, html_content: Union[bytes, str], date: Optional[str], engine: str
+    ) -> List[Dict]:
+        """Parse a page, setting the date and summary attributes; returns the raw game records."""
+        if engine == "lxml":
+            return self._parse_with_lxml(html_content, date)
+        return self._parse_with_bs4(html_content, date)
+
+    def _parse_with_bs4(self, html_content: Union[bytes, str], date: Optional[str]) -> List[Dict]:
+        fm = BeautifulSoup(html_content, "html.parser")
 
         self.fm_date = self._extract_fm_date(fm)
 
-        if "Sorry, no games today." in fm.text:
-            return
+        if self.NO_GAMES_TEXT in fm.text:
+            self.no_games = True
+            return []
 
         if date is not None:
             if not self._validate_date(date, self.fm_date):
-                return
+                return []
 
         table = fm.find("table", id="fanmatch-table")
         if not table:
-            return
+            return []
 
         tbody = table.find("tbody")
         if not tbody:
-            return
+            return []
 
-        rows = tbody.find_all("tr")
+        games_data, cells_by_row, night_index, last_game_row = self._scan_rows(tbody.find_all("tr"))
 
-        games_data = []
-        for row in rows:
-            game_data = self._parse_game_row(row)
-            if game_data:
-                games_data.append(game_data)
-
-        if not games_data:
-            return
+        if games_data:
+            self._parse_summary_stats(cells_by_row, night_index, last_game_row)
+        return games_data
 
-        self.fm_df = pd.DataFrame(games_data)
+    def _scan_rows(self, rows: List[Tag]) -> Tuple[List[Dict], List[List[Tag]], Optional[int], Optional[Tag]]:
+        """Single pass over the table rows.
 
-        self._post_process_df()
+        Game rows are parsed, and the first other row whose first cell mentions
+        "the night" marks where the lines of the night start.
 
-        self._parse_summary_stats(fm)
+        Returns:
+            games_data, the cells of every row, the index of the "lines of the
+            night" header row (or None) and the last game row (or None).
+        """
+        cells_by_row = []
+        games_data = []
+        last_game_row = None
+        night_index = None
+        for i, row in enumerate(rows):
+            cells = row.find_all("td")
+            cells_by_row.append(cells)
+            game_data = self._parse_game_row(row, cells)
+            if game_data:
+                games_data.append(game_data)
+                last_game_row = row
+            elif (
+                night_index is None
+                and cells
+                and "the night" in cells[0].get_text(strip=True).lower()
+            ):
+                night_index = i
+        return games_data, cells_by_row, night_index, last_game_row
 
     def _extract_fm_date(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract the date from the fanmatch page."""
@@ -186,15 +506,16 @@ class FanMatch:
         if date_div is None:
             return None
 
-        date_text = date_div.get_text()
-        date_match = re.search(self._PATTERNS["date"], date_text)
+        return self._fm_date_from_text(date_div.get_text())
+
+    def _fm_date_from_text(self, date_text: str) -> Optional[str]:
+        """Turn the page header text into an "MM-DD" date."""
+        date_match = self._RE["date"].search(date_text)
         if date_match is None:
             return None
 
         try:
-            extracted_date_str = re.sub(
-                self._PATTERNS["ordinal"], "", date_match.group(1)
-            )
+            extracted_date_str = self._RE["ordinal"].sub("", date_match.group(1))
             extracted_date = datetime.strptime(extracted_date_str, "%B %d")
             extracted_mmdd = extracted_date.strftime("%m-%d")
             return extracted_mmdd
@@ -212,9 +533,10 @@ class FanMatch:
         except (ValueError, AttributeError):
             return False
 
-    def _parse_game_row(self, row: Tag) -> Optional[Dict]:
+    def _parse_game_row(self, row: Tag, cells: Optional[List[Tag]] = None) -> Optional[Dict]:
         """Parse a single game row from the FanMatch table."""
-        cells = row.find_all("td")
+        if cells is None:
+            cells = row.find_all("td")
         if len(cells) < 5:
             return None
 
@@ -229,8 +551,8 @@ class FanMatch:
         game_text = game_cell.get_text(separator=" ", strip=True)
 
         # Check if game is completed
-        game_text_no_mvp = re.sub(r"MVP:.*$", "", game_text).strip()
-        completed_match = re.search(self._PATTERNS["completed_game"], game_text_no_mvp)
+        game_text_no_mvp = self._RE["mvp_suffix"].sub("", game_text).strip()
+        completed_match = self._RE["completed_game"].search(game_text_no_mvp)
 
         if completed_match is not None:
             team_info = self._parse_completed_game(game_text, completed_match)
@@ -279,11 +601,11 @@ class FanMatch:
             game_data["ExcitementRank"] = None
 
         # Extract MVP if present
-        mvp_match = re.search(self._PATTERNS["mvp"], game_text)
+        mvp_match = self._RE["mvp"].search(game_text)
         game_data["MVP"] = mvp_match.group(1).strip() if mvp_match else None
 
         # Extract Tournament info
-        tournament_match = re.search(self._PATTERNS["tournament"], game_text)
+        tournament_match = self._RE["tournament"].search(game_text)
         game_data["Tournament"] = (
             tournament_match.group(1) if tournament_match else None
         )
@@ -332,7 +654,7 @@ class FanMatch:
 
         result["OT"] = "(OT)" in game_text
 
-        poss_match = re.search(self._PATTERNS["possessions"], game_text)
+        poss_match = self._RE["possessions"].search(game_text)
         result["Possessions"] = poss_match.group(1) if poss_match else None
 
         if " vs. " in game_text or " vs." in game_text:
@@ -348,22 +670,28 @@ class FanMatch:
         self, game_cell: Tag, team_links: List[Tag], game_text: str
     ) -> Dict[str, Any]:
         """Parse team information from the game cell for upcoming games."""
-        result: Dict[str, Any] = {}
-
         rank_spans = game_cell.find_all("span", class_=self._RANK_CLASS)
 
         teams: List[str] = []
         for link in team_links:
             teams.append(link.get_text(strip=True))
 
+        rank_texts = [span.get_text(strip=True) for span in rank_spans]
+        return self._game_teams_from_parts(teams, rank_texts, game_text)
+
+    def _game_teams_from_parts(
+        self, teams: List[str], rank_texts: List[str], game_text: str
+    ) -> Dict[str, Any]:
+        """Build upcoming-game team info from team link and rank span texts."""
+        result: Dict[str, Any] = {}
+
         if len(teams) < 2:
-            non_ranked_match = re.search(self._PATTERNS["non_ranked"], game_text)
+            non_ranked_match = self._RE["non_ranked"].search(game_text)
             if non_ranked_match:
                 teams.insert(0, non_ranked_match.group(1).strip())
 
         ranks: List[Optional[str]] = []
-        for span in rank_spans:
-            rank_text = span.get_text(strip=True)
+        for rank_text in rank_texts:
             ranks.append(rank_text if rank_text != "NR" else None)
 
         result["team1"] = teams[0] if len(teams) > 0 else None
@@ -421,7 +749,7 @@ class FanMatch:
             return result
 
         # Extract predicted winner (team name before the score)
-        winner_match = re.search(self._PATTERNS["score"], prediction_text)
+        winner_match = self._RE["score"].search(prediction_text)
         if winner_match:
             result["PredictedWinner"] = winner_match.group(1).strip()
             result["PredictedScore"] = winner_match.group(2)
@@ -431,12 +759,12 @@ class FanMatch:
                 result["PredictedMOV"] = float(int(scores[0]) - int(scores[1]))
 
         # Extract win probability
-        prob_match = re.search(self._PATTERNS["win_probability"], prediction_text)
+        prob_match = self._RE["win_probability"].search(prediction_text)
         if prob_match:
             result["WinProbability"] = prob_match.group(1)
 
         # Extract predicted possessions
-        poss_match = re.search(self._PATTERNS["possessions"], prediction_text)
+        poss_match = self._RE["possessions"].search(prediction_text)
         if poss_match:
             result["PredictedPossessions"] = float(poss_match.group(1))
 
@@ -477,7 +805,7 @@ class FanMatch:
 
             if next_text and isinstance(next_text, str):
                 # Extract the score (first 2-3 digit number in this text)
-                score_match = re.search(r"\s*(\d{2,3})", next_text)
+                score_match = self._RE["team_score"].search(next_text)
                 if score_match:
                     scores.append(int(score_match.group(1)))
 
@@ -511,13 +839,11 @@ class FanMatch:
         time_link = time_cell.find("a")
         if time_link:
             time_text = time_link.get_text(strip=True)
-            if time_text.lower() != "box" and re.match(
-                self._PATTERNS["time"], time_text, re.IGNORECASE
-            ):
+            if time_text.lower() != "box" and self._RE["time"].match(time_text):
                 result["Time"] = time_text
         else:
             time_text = time_cell.get_text(strip=True)
-            time_match = re.match(self._PATTERNS["time"], time_text, re.IGNORECASE)
+            time_match = self._RE["time"].match(time_text)
             if time_match:
                 result["Time"] = time_match.group(1)
 
@@ -546,7 +872,7 @@ class FanMatch:
 
         location_text = " ".join(location_parts)
 
-        city_state_match = re.match(self._PATTERNS["city_state"], location_text)
+        city_state_match = self._RE["city_state"].match(location_text)
         if city_state_match:
             result["City"] = city_state_match.group(1).strip()
             result["State"] = city_state_match.group(2).strip()
@@ -594,7 +920,7 @@ class FanMatch:
         if rank_span:
             rank_text = rank_span.get_text(strip=True)
 
-            rank_match = re.search(self._PATTERNS["rank_marker"], rank_text)
+            rank_match = self._RE["rank_marker"].search(rank_text)
             result["rank"] = (
                 rank_match.group(1)
                 if rank_match
@@ -647,6 +973,26 @@ class FanMatch:
 
         self.fm_df = self.fm_df.reindex(columns=self._OUTPUT_COLS)
 
+    def _finish_record(self, record: Dict[str, Any], date: str) -> Dict[str, Any]:
+        """Per-record equivalent of `_post_process_df`, for `iter_games`."""
+        record["Team1Rank"] = record.get("team1_rank")
+        record["Team2Rank"] = record.get("team2_rank")
+        record["Team1"] = record.get("team1")
+        record["Team2"] = record.get("team2")
+
+        score1 = record.get("Team1Score")
+        score2 = record.get("Team2Score")
+        if not (pd.isna(score1) or pd.isna(score2)):
+            if pd.to_numeric(score1, errors="coerce") > pd.to_numeric(score2, errors="coerce"):
+                record["Winner"], record["Loser"] = record["Team1"], record["Team2"]
+            else:
+                record["Winner"], record["Loser"] = record["Team2"], record["Team1"]
+
+        finished = {"Date": date}
+        for col in self._OUTPUT_COLS:
+            finished[col] = record.get(col, np.nan)
+        return finished
+
     def _parse_game_results(self) -> None:
         """Parse actual game results for completed games."""
         if self.fm_df is None:
@@ -681,43 +1027,43 @@ class FanMatch:
         self.fm_df.loc[team2_wins, "Winner"] = self.fm_df.loc[team2_wins, "Team2"]
         self.fm_df.loc[team2_wins, "Loser"] = self.fm_df.loc[team2_wins, "Team1"]
 
-    def _parse_summary_stats(self, soup: BeautifulSoup) -> None:
-        """Parse summary statistics from the bottom of the page."""
+    def _parse_summary_stats(
+        self, cells_by_row: List[List[Tag]], night_index: Optional[int], last_game_row: Tag
+    ) -> None:
+        """Parse lines of the night and summary statistics from the bottom of the page.
 
-        table = soup.find("table", id=self._TABLE_ID)
-        if not table:
-            return
-
-        tbody = table.find("tbody")
-        if not tbody:
-            return
-
-        rows = tbody.find_all("tr")
-
-        for row in rows:
-            cells = row.find_all("td")
-            if not cells:
-                continue
-
-            cell_text = cells[0].get_text(strip=True)
+        `cells_by_row` holds the `<td>`s of every table row, as found while the
+        game rows were parsed, and `night_index` the position of the "lines of
+        the night" header row (None if there is none).
+        """
+        if night_index is not None:
+            self._collect_lines_of_night(
+                cells[0].get_text(strip=True) if cells else None
+                for cells in cells_by_row[night_index + 1:]
+            )
 
-            if "the night" in cell_text.lower():
-                self._extract_lines_of_night(rows, rows.index(row))
-                break
+        self._extract_summary_statistics(self._text_after(last_game_row))
 
-        self._extract_summary_statistics(soup)
+    @staticmethod
+    def _text_after(element: Tag) -> str:
+        """Page text following `element` (its own contents excluded), as get_text() would render it."""
+        last = element
+        while getattr(last, "contents", None):
+            last = last.contents[-1]
+        return "".join(
+            s for s in last.next_elements if type(s) in (NavigableString, CData)
+        )
 
-    def _extract_lines_of_night(self, rows: List, start_index: int) -> None:
-        """Extract lines of the night."""
+    def _collect_lines_of_night(self, first_cell_texts) -> None:
+        """Collect lines of the night from the first-cell texts of the rows that
+        follow the header; None marks a row without cells."""
         lines = []
-        for i in range(start_index + 1, len(rows)):
-            row = rows[i]
-            cells = row.find_all("td")
-            if not cells:
+        for text in first_cell_texts:
+            if text is None:
                 break
 
             cell_text = (
-                str(cells[0].get_text(strip=True))
+                str(text)
                 .replace("•", "")
                 .replace("  ", " ")
                 .replace('"', "")
@@ -741,61 +1087,332 @@ class FanMatch:
         if lines:
             self.lines_of_night = lines
 
-    def _extract_summary_statistics(self, soup: BeautifulSoup) -> None:
-        """Extract summary statistics."""
-        page_text = soup.get_text()
+    def _extract_summary_statistics(self, footer_text: str) -> None:
+        """Extract summary statistics from the text that follows the last game row.
+
+        Only the footer (lines of the night and the summary rows) is searched,
+        so the cost does not grow with the number of games. Every summary
+        pattern starts with a literal anchor, so nothing can match before the
+        earliest anchor; the block from there on is scanned once with a
+        combined pattern and the first match per statistic is kept, the same
+        one a separate `re.search` per statistic would find.
+        """
+        start = self._SUMMARY_START.search(footer_text)
+        if start is None:
+            return
+        block = footer_text[start.start():]
+
+        found: Dict[str, re.Match] = {}
+        for match in self._SUMMARY_SCAN.finditer(block):
+            key = match.lastgroup
+            if key not in found:
+                found[key] = match
+                if len(found) == len(self._SUMMARY_KEYS):
+                    break
+
+        def groups(key: str):
+            match = found.get(key)
+            if match is None:
+                # Only reachable if this statistic's text sits inside another
+                # statistic's match; search for it on its own.
+                match = self._RE[key].search(block)
+                return match.groups() if match else None
+            base = self._SUMMARY_SCAN.groupindex[key]
+            return tuple(
+                match.group(i) for i in range(base + 1, base + 1 + self._SUMMARY_GROUPS[key])
+            )
+
+        ppg = groups("ppg")
+        if ppg:
+            self.ppg = float(ppg[0])
+
+        avg_eff = groups("avg_eff")
+        if avg_eff:
+            self.avg_eff = float(avg_eff[0])
+
+        pos_40 = groups("pos_40")
+        if pos_40:
+            self.pos_40 = float(pos_40[0])
+
+        mae_total_score = groups("mae_total_score")
+        if mae_total_score:
+            self.mean_abs_err_pred_total_score = float(mae_total_score[0])
+
+        bias = groups("pred_score_bias")
+        if bias:
+            self.bias_pred_total_score = float(bias[0])
+
+        mae_mov = groups("mae_mov")
+        if mae_mov:
+            self.mean_abs_err_pred_mov = float(mae_mov[0])
+
+        fav_records = groups("fav_records")
+        if fav_records:
+            self.record_favs = fav_records[0]
+
+        exp_record = groups("exp_record")
+        if exp_record:
+            self.expected_record_favs = exp_record[0]
 
-        ppg_match = re.search(self._PATTERNS["ppg"], page_text)
-        if ppg_match:
-            self.ppg = float(ppg_match.group(1))
+        exact_mov = groups("exact_mov")
+        if exact_mov:
+            self.exact_mov = f"{exact_mov[0]}/{exact_mov[1]}"
 
-        eff_match = re.search(self._PATTERNS["avg_eff"], page_text)
-        if eff_match:
-            self.avg_eff = float(eff_match.group(1))
+    # ------------------------------------------------------------------
+    # lxml engine: same output as the bs4 methods above, read straight off
+    # lxml elements. Pure-text helpers (_parse_completed_game,
+    # _parse_prediction, ...) are shared with the bs4 engine.
+    # ------------------------------------------------------------------
 
-        pos_match = re.search(self._PATTERNS["pos_40"], page_text)
-        if pos_match:
-            self.pos_40 = float(pos_match.group(1))
+    @staticmethod
+    def _lx_document(html_content: Union[bytes, str]):
+        if isinstance(html_content, str):
+            html_content = html_content.encode("utf-8")
+        try:
+            html_content.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            encoding = "windows-1252"
+        parser = lxml.html.HTMLParser(encoding=encoding)
+        return lxml.html.document_fromstring(html_content, parser=parser)
+
+    def _parse_with_lxml(self, html_content: Union[bytes, str], date: Optional[str]) -> List[Dict]:
+        root = self._lx_document(html_content)
+
+        date_div = _lx_find(root, "div", cls=self._DATE_CLASS)
+        if date_div is not None:
+            self.fm_date = self._fm_date_from_text(_lx_text(date_div))
+
+        # Like bs4's get_text(), leave out script and style contents
+        page_text = "".join(
+            root.xpath("//text()[not(ancestor::script) and not(ancestor::style)]")
+        )
+
+        if self.NO_GAMES_TEXT in page_text:
+            self.no_games = True
+            return []
+
+        if date is not None:
+            if not self._validate_date(date, self.fm_date):
+                return []
+
+        table = next(
+            (t for t in root.iter("table") if t.get("id") == self._TABLE_ID), None
+        )
+        if table is None:
+            return []
+
+        tbody = next(table.iter("tbody"), None)
+        if tbody is None:
+            return []
+
+        games_data, cells_by_row, night_index, last_game_row = self._lx_scan_rows(tbody.iter("tr"))
+
+        if games_data:
+            self._lx_parse_summary_stats(cells_by_row, night_index, last_game_row)
+        return games_data
+
+    def _lx_scan_rows(self, rows) -> Tuple[List[Dict], List[List], Optional[int], Optional[object]]:
+        """lxml version of `_scan_rows`."""
+        cells_by_row = []
+        games_data = []
+        last_game_row = None
+        night_index = None
+        for i, row in enumerate(rows):
+            cells = list(row.iter("td"))
+            cells_by_row.append(cells)
+            game_data = self._lx_parse_game_row(row, cells)
+            if game_data:
+                games_data.append(game_data)
+                last_game_row = row
+            elif (
+                night_index is None
+                and cells
+                and "the night" in _lx_text(cells[0], strip=True).lower()
+            ):
+                night_index = i
+        return games_data, cells_by_row, night_index, last_game_row
+
+    def _lx_parse_game_row(self, row, cells: Optional[List] = None) -> Optional[Dict]:
+        """lxml version of `_parse_game_row`."""
+        if cells is None:
+            cells = list(row.iter("td"))
+        if len(cells) < 5:
+            return None
+
+        game_data: Dict[str, Any] = {}
+
+        game_cell = cells[self._COL_GAME]
+        game_text = _lx_text(game_cell, separator=" ", strip=True)
+
+        # Check if game is completed
+        game_text_no_mvp = self._RE["mvp_suffix"].sub("", game_text).strip()
+        completed_match = self._RE["completed_game"].search(game_text_no_mvp)
+
+        if completed_match is not None:
+            team_info = self._parse_completed_game(game_text, completed_match)
+        else:
+            teams = [_lx_text(a, strip=True) for a in game_cell.iter("a")]
+            rank_texts = [
+                _lx_text(span, strip=True)
+                for span in game_cell.iter("span")
+                if self._RANK_CLASS in (span.get("class") or "").split()
+            ]
+            team_info = self._game_teams_from_parts(teams, rank_texts, game_text)
+
+        game_data["Game"] = self._construct_game_string(team_info)
+        game_data.update(team_info)
+
+        prediction_text = _lx_text(cells[self._COL_PREDICTION], strip=True)
+        game_data.update(self._parse_prediction(prediction_text, team_info))
+
+        game_data.update(self._lx_parse_time(cells[self._COL_TIME]))
+        game_data.update(self._lx_parse_location(cells[self._COL_LOCATION]))
+        game_data.update(self._lx_parse_thrill_score(cells[self._COL_THRILL]))
+
+        if len(cells) > self._COL_COMEBACK:
+            comeback_data = self._lx_parse_metric_with_rank(cells[self._COL_COMEBACK])
+            game_data["Comeback"] = comeback_data.get("value")
+            game_data["ComebackRank"] = comeback_data.get("rank")
+        else:
+            game_data["Comeback"] = None
+            game_data["ComebackRank"] = None
+
+        if len(cells) > self._COL_EXCITEMENT:
+            excitement_data = self._lx_parse_metric_with_rank(cells[self._COL_EXCITEMENT])
+            game_data["Excitement"] = excitement_data.get("value")
+            game_data["ExcitementRank"] = excitement_data.get("rank")
+        else:
+            game_data["Excitement"] = None
+            game_data["ExcitementRank"] = None
+
+        mvp_match = self._RE["mvp"].search(game_text)
+        game_data["MVP"] = mvp_match.group(1).strip() if mvp_match else None
 
-        # Parse mean absolute error for predicted total score
-        mae_score_match = re.search(
-            self._PATTERNS["mae_total_score"],
-            page_text,
-            re.IGNORECASE,
+        tournament_match = self._RE["tournament"].search(game_text)
+        game_data["Tournament"] = (
+            tournament_match.group(1) if tournament_match else None
         )
-        if mae_score_match:
-            self.mean_abs_err_pred_total_score = float(mae_score_match.group(1))
-
-        # Parse bias for predicted total score
-        bias_match = re.search(self._PATTERNS["pred_score_bias"], page_text)
-        if bias_match:
-            self.bias_pred_total_score = float(bias_match.group(1))
-
-        # Parse mean absolute error for predicted MOV
-        mae_mov_match = re.search(
-            self._PATTERNS["mae_mov"],
-            page_text,
-            re.IGNORECASE,
+
+        conference_span = _lx_find(game_cell, "span", style=self._CONFERENCE_COLOR)
+        game_data["Conference"] = (
+            _lx_text(conference_span, strip=True) if conference_span is not None else None
         )
-        if mae_mov_match:
-            self.mean_abs_err_pred_mov = float(mae_mov_match.group(1))
-
-        # Parse record of favorites
-        record_match = re.search(self._PATTERNS["fav_records"], page_text)
-        if record_match:
-            self.record_favs = record_match.group(1)
-
-        # Parse expected record
-        exp_record_match = re.search(self._PATTERNS["exp_record"], page_text)
-        if exp_record_match:
-            self.expected_record_favs = exp_record_match.group(1)
-
-        # Parse exact MOV
-        exact_mov_match = re.search(
-            self._PATTERNS["exact_mov"], page_text, re.IGNORECASE
+
+        return game_data
+
+    def _lx_parse_time(self, time_cell) -> Dict[str, Any]:
+        """lxml version of `_parse_time`."""
+        result: Dict[str, Any] = {"Time": None, "Network": None}
+
+        time_link = next(time_cell.iter("a"), None)
+        if time_link is not None:
+            time_text = _lx_text(time_link, strip=True)
+            if time_text.lower() != "box" and self._RE["time"].match(time_text):
+                result["Time"] = time_text
+        else:
+            time_text = _lx_text(time_cell, strip=True)
+            time_match = self._RE["time"].match(time_text)
+            if time_match:
+                result["Time"] = time_match.group(1)
+
+        network_span = _lx_find(time_cell, "span", cls=self._RANK_BLOCK_CLASS)
+        if network_span is not None:
+            network_link = next(network_span.iter("a"), None)
+            if network_link is not None:
+                result["Network"] = _lx_text(network_link, strip=True)
+            else:
+                network_text = _lx_text(network_span, strip=True)
+                if network_text and not network_text.strip().isdigit():
+                    result["Network"] = network_text
+
+        return result
+
+    def _lx_parse_location(self, location_cell) -> Dict[str, Any]:
+        """lxml version of `_parse_location`."""
+        result: Dict[str, Any] = {"City": None, "State": None, "Arena": None}
+
+        location_parts = [
+            text.strip() for text in _lx_direct_strings(location_cell) if text.strip()
+        ]
+        location_text = " ".join(location_parts)
+
+        city_state_match = self._RE["city_state"].match(location_text)
+        if city_state_match:
+            result["City"] = city_state_match.group(1).strip()
+            result["State"] = city_state_match.group(2).strip()
+
+        arena_link = next(location_cell.iter("a"), None)
+        if arena_link is not None:
+            arena_span = _lx_find(arena_link, "span", cls=self._WIN_PROB_CLASS)
+            if arena_span is not None:
+                result["Arena"] = _lx_text(arena_span, strip=True)
+
+        return result
+
+    def _lx_parse_thrill_score(self, thrill_cell) -> Dict[str, Any]:
+        """lxml version of `_parse_thrill_score`."""
+        result: Dict[str, Any] = {"ThrillScore": None, "ThrillScoreRank": None}
+
+        rank_span = _lx_find(thrill_cell, "span", cls=self._RANK_BLOCK_CLASS)
+
+        if rank_span is not None:
+            result["ThrillScoreRank"] = _lx_text(rank_span, strip=True)
+
+            direct = _lx_direct_strings(thrill_cell)
+            if direct:
+                result["ThrillScore"] = direct[0].strip()
+        else:
+            thrill_text = _lx_text(thrill_cell, strip=True)
+            result["ThrillScore"] = thrill_text if thrill_text else None
+
+        return result
+
+    def _lx_parse_metric_with_rank(self, cell) -> Dict[str, Optional[str]]:
+        """lxml version of `_parse_metric_with_rank`."""
+        result: Dict[str, Any] = {"value": None, "rank": None}
+
+        if cell is None:
+            return result
+
+        rank_span = _lx_find(cell, "span", cls=self._WIN_PROB_CLASS)
+        if rank_span is None:
+            rank_span = _lx_find(cell, "span", cls=self._RANK_BLOCK_CLASS)
+
+        if rank_span is not None:
+            rank_text = _lx_text(rank_span, strip=True)
+
+            rank_match = self._RE["rank_marker"].search(rank_text)
+            result["rank"] = (
+                rank_match.group(1)
+                if rank_match
+                else (rank_text if rank_text else None)
+            )
+
+            direct = _lx_direct_strings(cell)
+            if direct:
+                stripped_value = direct[0].strip()
+                result["value"] = stripped_value if stripped_value else None
+        else:
+            text = _lx_text(cell, strip=True)
+            result["value"] = text if text else None
+
+        return result
+
+    def _lx_parse_summary_stats(
+        self, cells_by_row: List[List], night_index: Optional[int], last_game_row
+    ) -> None:
+        """lxml version of `_parse_summary_stats`."""
+        if night_index is not None:
+            self._collect_lines_of_night(
+                _lx_text(cells[0], strip=True) if cells else None
+                for cells in cells_by_row[night_index + 1:]
+            )
+
+        footer_text = "".join(
+            last_game_row.xpath("following::text()[not(ancestor::script) and not(ancestor::style)]")
         )
-        if exact_mov_match:
-            self.exact_mov = f"{exact_mov_match.group(1)}/{exact_mov_match.group(2)}"
+        self._extract_summary_statistics(footer_text)
 
     def __repr__(self) -> str:
         lines = [
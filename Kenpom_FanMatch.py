@@ -8,13 +8,21 @@
 import os
 import re
 import time
+import queue
+import argparse
+import threading
 import pandas as pd
 import FanMatch as kf
 from datetime import datetime, timedelta, date
-from kenpompy.utils import login
+from typing import Optional
+from page_cache import get_html, login
 from supabase.client import create_client, Client
 from tqdm import tqdm
-from scipy.stats import norm
+from lookups import ArenaIndex, get_alias_resolver
+from rate_limit import TokenBucket, default_pacer
+from journal import Journal, default_journal
+from spread import spread_from_win_probability
+import metrics
 
 # %%
 # --- 1. SETUP & AUTHENTICATION ---
@@ -24,33 +32,50 @@ PASSWORD = os.environ.get("KENPOM_PW")
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
 
-browser = login(USERNAME, PASSWORD)
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Journal source name, and where a backfill journals when INGEST_JOURNAL is not set
+JOURNAL_SOURCE = "kenpom_fanmatch"
+BACKFILL_JOURNAL_PATH = os.environ.get("INGEST_JOURNAL", ".ingest_journal.sqlite")
+
+# Created in __main__ (once per run, also for a backfill) so the module can be imported
+browser = None
+supabase: Optional[Client] = None
 
 # --- 2. HELPER FUNCTIONS ---
 def build_team_lookup(supabase):
-    lookup = {}
-    res = supabase.table("teams").select("team_id, team_name").execute()
-    for r in res.data:
-        lookup[r["team_name"]] = r["team_id"]
-    res = supabase.table("team_aliases").select("alias_name, canonical_team_id").execute()
-    for r in res.data:
-        lookup[r["alias_name"]] = r["canonical_team_id"]
-    return lookup
-
-def lookup_arena_id(supabase, arena_name):
-    if not arena_name: return None
-    resp = supabase.table("arenas").select("arena_id, team_id").eq("arena_name", arena_name).execute()
-    return [(row["arena_id"], row["team_id"]) for row in resp.data]
+    # Process-wide cached resolver shared with the other loaders
+    return get_alias_resolver(supabase)
 
 def clean_team_name(name: str):
-    if name is None: return None
+    if name is None or pd.isna(name): return None
     return re.sub(r'\s*\(\d+\)', '', str(name)).strip()
 
 def clean_rank(rank):
-    if rank is None or str(rank).strip() in ["", "nan", "None"]: return "NR"
+    if rank is None or pd.isna(rank) or str(rank).strip() in ["", "nan", "None"]: return "NR"
     return str(rank).strip()
 
+def season_for_date(date_str):
+    """KenPom convention: a season is named for the year it ends, so November 2025 is 2026."""
+    year = int(date_str[:4])
+    month = int(date_str[5:7])
+    return year + 1 if month >= 7 else year
+
+def played_games(df):
+    """Games with a result on a FanMatch frame: what build_game_rows should turn into rows."""
+    if df is None or df.empty:
+        return 0
+    return int(df["Winner"].notna().sum())
+
+def day_complete(fm, rows):
+    """Whether `rows` cover the whole day, so the date can be journaled.
+
+    An empty frame counts only when the page says there were no games (a
+    login, error or other-date page gives an empty frame too), and every
+    played game must have become a row (none dropped for an unresolved name).
+    """
+    if fm.fm_df is None or fm.fm_df.empty:
+        return fm.no_games
+    return len(rows) == played_games(fm.fm_df)
+
 def parse_location(location_text):
     try:
         parts = location_text.split(" ", 2)
@@ -60,18 +85,18 @@ def parse_location(location_text):
         return None
 
 # --- 3. MAIN LOGIC ---
-def insert_fanmatch_to_supabase(date_str, browser):
-    team_lookup = build_team_lookup(supabase)
-    try:
-        fm = kf.FanMatch(browser, date=date_str)
-        df = fm.fm_df
-    except Exception as e:
-        print(f"Error fetching FanMatch for {date_str}: {e}")
-        return
-
+@metrics.timed("transform")
+def build_game_rows(date_str, df, team_lookup, arena_index):
+    """Turn one day's typed FanMatch frame into rows for the games table."""
     if df is None or df.empty:
-        print(f"No results for {date_str}")
-        return
+        return []
+
+    season = season_for_date(date_str)
+
+    # Spread for the whole day in one go; NaN where there is no prediction
+    df["adjusted_spread"] = spread_from_win_probability(
+        df["WinProbability"], df["PredictedWinnerScore"], df["PredictedLoserScore"]
+    )
 
     rows_to_insert = []
     for _, row in df.iterrows():
@@ -98,40 +123,23 @@ def insert_fanmatch_to_supabase(date_str, browser):
             winner_rank = clean_rank(row["Team2Rank"])
             loser_rank  = clean_rank(row["Team1Rank"])
 
-        #Predicted Score and Spread Calculation
-        pred_score = row["PredictedScore"].split('-')
-        pred_score = [int(i) for i in pred_score]
-
-        win_probability = str(row["WinProbability"]).strip()
-
-        wp = (int(win_probability[:-1]))/ 100
-        if wp <= 0.97: 
-            adjusted_spread = 11.06 * norm.ppf(wp, loc=0, scale=1)
-        else:
-            adjusted_spread = pred_score[0] - pred_score[1]
+        #Predicted Score and Spread
+        pred_score = [row["PredictedWinnerScore"], row["PredictedLoserScore"]]
+        wp = row["WinProbability"]
+        adjusted_spread = None if pd.isna(row["adjusted_spread"]) else float(row["adjusted_spread"])
 
 
         if not winner_id or not loser_id:
             continue
 
         # Logic for OT and Score
-        if row["OT"] == 'nan':
-            ot = False 
-        else:
-            ot = True
-            ot_count = 1
+        ot = False if pd.isna(row["OT"]) else bool(row["OT"])
+        ot_count = 1 if ot else 0
 
         # Location parsing
         arena_name = row["Arena"]
         city = row['City']
-        arena_data = lookup_arena_id(supabase, arena_name)
-        
-        arena_id, home_team, is_neutral = None, None, True
-        if arena_data:
-            arena_id, home_team_id = arena_data[0]
-            if winner_id == home_team_id: home_team = winner_id
-            elif loser_id == home_team_id: home_team = loser_id
-            is_neutral = False if home_team else True
+        arena_id, home_team, is_neutral = arena_index.resolve_site(arena_name, winner_id, loser_id)
 
         game_row = {
             "game_date": date_str,
@@ -143,10 +151,11 @@ def insert_fanmatch_to_supabase(date_str, browser):
             "winner_score": int(row["WinnerScore"]),
             "loser_id": loser_id,
             "loser_score": int(row["LoserScore"]),
-            "predicted_score": None if pd.isna(row["PredictedScore"]) else row["PredictedScore"],
+            "predicted_score": None if pd.isna(pred_score[0]) else f"{pred_score[0]}-{pred_score[1]}",
             "game_total": int(row["WinnerScore"]) + int(row["LoserScore"]),
             "actual_score": f"{row['WinnerScore']}-{row['LoserScore']}",
-            "win_probability": str(row["WinProbability"]),
+            # Back to the page's text ("73%", "73.25%"): 12 significant digits undo the /100 without rounding
+            "win_probability": None if pd.isna(wp) else f"{float(wp) * 100:.12g}%",
             "predicted_possessions": None if pd.isna(row["PredictedPossessions"]) else int(row["PredictedPossessions"]),
             "actual_possessions": None if pd.isna(row["Possessions"]) else int(row["Possessions"]),
             "ot": ot,
@@ -157,18 +166,191 @@ def insert_fanmatch_to_supabase(date_str, browser):
             "location_text": city,
             "predicted_winner": p_winner_id,
             "predicted_loser": p_loser_id,
-            "KPS_p_winner": -1 * adjusted_spread,
+            "KPS_p_winner": None if adjusted_spread is None else -1 * adjusted_spread,
             "KPS_p_loser": adjusted_spread,
-            "season": 2026
+            "season": season
         }
         rows_to_insert.append(game_row)
 
-    if rows_to_insert:
-        supabase.table("games").upsert(rows_to_insert, on_conflict="game_date, team1_id, team2_id").execute()
-        print(f"✅ Successfully processed {len(rows_to_insert)} games for {date_str}")
+    return rows_to_insert
+
+def upsert_game_rows(rows, date_str):
+    if rows:
+        with metrics.stage("upsert"):
+            supabase.table("games").upsert(rows, on_conflict="game_date, team1_id, team2_id").execute()
+        metrics.count("rows_written", len(rows))
+        print(f"✅ Successfully processed {len(rows)} games for {date_str}")
+
+def insert_fanmatch_to_supabase(date_str, browser, arena_index=None):
+    journal = default_journal()
+    if journal and journal.done(JOURNAL_SOURCE, date_str):
+        print(f"{date_str} already uploaded (journal), skipping")
+        return
+
+    team_lookup = build_team_lookup(supabase)
+    if arena_index is None:
+        arena_index = ArenaIndex.load(supabase)
+    try:
+        # A login page raises (and is not cached) instead of parsing as an empty day
+        html = get_html(browser, f"https://kenpom.com/fanmatch.php?d={date_str}")
+        with metrics.stage("parse"):
+            fm = kf.FanMatch(None, date=date_str, html_content=html, typed=True)
+    except Exception as e:
+        print(f"Error fetching FanMatch for {date_str}: {e}")
+        return
+
+    rows = build_game_rows(date_str, fm.fm_df, team_lookup, arena_index)
+    if not rows and not fm.no_games:
+        print(f"No results for {date_str}")
+    upsert_game_rows(rows, date_str)
+    if not day_complete(fm, rows):
+        print(f"⚠️ {date_str} is incomplete ({len(rows)} of {played_games(fm.fm_df)} games); not journaled")
+    elif journal:
+        journal.mark(JOURNAL_SOURCE, date_str, "uploaded", detail=str(len(rows)))
+    team_lookup.report_misses()
+
+# --- 4. SEASON BACKFILL ---
+_DONE = object()
+
+def backfill(start_date, end_date, browser, journal=None, resume=True,
+             queue_size=4, requests_per_second=None, pacer=None):
+    """Load every date from start_date to end_date (inclusive) into the games table.
+
+    Fetch, parse + transform and upsert run as three stages joined by bounded
+    queues, so the next pages are fetched and parsed while a day is upserted
+    and at most `queue_size` days wait between two stages. The team and arena
+    lookups are loaded once for the run.
+
+    Each date is marked fetched, parsed and uploaded in the journal (by
+    default the one at BACKFILL_JOURNAL_PATH); with `resume` dates already
+    uploaded are skipped, so a rerun picks up where an interrupted one
+    stopped. A date whose page could not be fetched or parsed (a logged-out,
+    error or other-date page included) or with games whose teams did not
+    resolve is reported and left for the next run; an upsert error stops the
+    run.
+
+    Page fetches are paced by `pacer` (the process-wide AdaptivePacer by
+    default), which speeds up while KenPom answers quickly and backs off on
+    errors; requests_per_second adds a fixed cap on top.
+    """
+    journal = journal or default_journal() or Journal(BACKFILL_JOURNAL_PATH)
+
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    dates = [str(start + timedelta(days=i)) for i in range((end - start).days + 1)]
+
+    if resume:
+        total = len(dates)
+        dates = journal.pending(JOURNAL_SOURCE, dates)
+        if len(dates) < total:
+            print(f"Resuming: {total - len(dates)} dates already uploaded, {len(dates)} left")
+
+    team_lookup = build_team_lookup(supabase)
+    arena_index = ArenaIndex.load(supabase)
+    limiter = TokenBucket(requests_per_second) if requests_per_second else None
+    pacer = pacer or default_pacer()
+
+    pages = queue.Queue(maxsize=queue_size)
+    day_rows = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def fetch_stage():
+        for date_str in dates:
+            if stop.is_set():
+                break
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                html = get_html(browser, f"https://kenpom.com/fanmatch.php?d={date_str}", pacer=pacer)
+                journal.mark(JOURNAL_SOURCE, date_str, "fetched")
+            except Exception as e:
+                print(f"Error fetching FanMatch for {date_str}: {e}")
+                html = None
+            pages.put((date_str, html))
+        pages.put(_DONE)
+
+    def transform_stage():
+        while True:
+            item = pages.get()
+            if item is _DONE:
+                break
+            date_str, html = item
+            if stop.is_set():
+                continue
+            rows, complete = None, False
+            if html is not None:
+                try:
+                    with metrics.stage("parse"):
+                        fm = kf.FanMatch(None, date=date_str, html_content=html, typed=True)
+                    rows = build_game_rows(date_str, fm.fm_df, team_lookup, arena_index)
+                    if day_complete(fm, rows):
+                        journal.mark(JOURNAL_SOURCE, date_str, "parsed")
+                        complete = True
+                    else:
+                        print(f"⚠️ {date_str} is incomplete ({len(rows)} of {played_games(fm.fm_df)} games)")
+                except Exception as e:
+                    print(f"Error parsing FanMatch for {date_str}: {e}")
+            day_rows.put((date_str, rows, complete))
+        day_rows.put(_DONE)
+
+    stages = [threading.Thread(target=fetch_stage, daemon=True),
+              threading.Thread(target=transform_stage, daemon=True)]
+    for stage in stages:
+        stage.start()
+
+    started = time.perf_counter()
+    games = 0
+    failed = []
+    try:
+        with tqdm(total=len(dates), desc="FanMatch backfill") as progress:
+            while True:
+                item = day_rows.get()
+                if item is _DONE:
+                    break
+                date_str, rows, complete = item
+                if rows is not None:
+                    # The games that did resolve are written either way
+                    upsert_game_rows(rows, date_str)
+                    games += len(rows)
+                if complete:
+                    journal.mark(JOURNAL_SOURCE, date_str, "uploaded", detail=str(len(rows)))
+                else:
+                    failed.append(date_str)
+                progress.update(1)
+    except BaseException:
+        # Let the stages wind down before giving up
+        stop.set()
+        while day_rows.get() is not _DONE:
+            pass
+        raise
+    finally:
+        for stage in stages:
+            stage.join()
+
+    print(f"Backfill {start_date} to {end_date}: {games} games over {len(dates)} dates "
+          f"in {time.perf_counter() - started:.1f} s")
+    if failed:
+        print(f"Failed dates, retried on the next run ({len(failed)}): {', '.join(failed)}")
+    team_lookup.report_misses()
+    return failed
 
 #%%
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load KenPom FanMatch games into Supabase")
+    parser.add_argument("--start", help="first date (YYYY-MM-DD) of a backfill; default is yesterday only")
+    parser.add_argument("--end", help="last date of a backfill; default is yesterday")
+    parser.add_argument("--journal", default=BACKFILL_JOURNAL_PATH, help="backfill journal (SQLite)")
+    parser.add_argument("--no-resume", action="store_true", help="redo dates the journal has as uploaded")
+    args = parser.parse_args()
+
+    browser = login(USERNAME, PASSWORD)
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
     # Yesterday's data
     target_date = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
-    insert_fanmatch_to_supabase(target_date, browser)
\ No newline at end of file
+    with metrics.run(JOURNAL_SOURCE):
+        if args.start:
+            backfill(args.start, args.end or target_date, browser, journal=Journal(args.journal),
+                     resume=not args.no_resume)
+        else:
+            insert_fanmatch_to_supabase(target_date, browser)
\ No newline at end of file
@@ -1,25 +1,44 @@
 #%%
 #Import Libraries
+import numpy as np
 import pandas as pd
 import time
 from datetime import datetime, timedelta, date
+from typing import Optional
 from dotenv import load_dotenv
 from supabase.client import create_client, Client
 import os
+from collections import Counter
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rate_limit import TokenBucket
+from lookups import get_alias_resolver
+from page_cache import fetch_url
+from tr_table import extract_stat_table
+from http_client import default_client
+from journal import default_journal
+import metrics
 
 # Use os.environ.get directly; GitHub Actions will provide these
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("Supabase credentials not found in environment variables")
+# Created in __main__ so the scraper and transforms can be imported (e.g. by benchmarks)
+supabase: Optional[Client] = None
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Journal source; each (stat, date) cell is one unit
+JOURNAL_SOURCE = "tr"
+
+def journal_unit(stat, date):
+    return f"{stat}/{date}"
 #%%
 # Scrape class
 class TRScraper:
-    def __init__(self, start_date, end_date = None):
+    BASE_URL = "https://www.teamrankings.com"
+
+    def __init__(self, start_date, end_date = None, client = None):
+        # Pooled keep-alive HTTP client shared by every fetch (and worker thread)
+        self.client = client or default_client()
         self.start = datetime.strptime(start_date, "%Y-%m-%d")
 
         if end_date:
@@ -35,41 +54,76 @@ class TRScraper:
             cur += timedelta(days=1)
 
 
-    def scrape_by_date(self, stat, date):
-        print("Scraping data for the date:", start_date)
-        url = f"https://www.teamrankings.com/ncaa-basketball/stat/{stat}?date={date}"
-
-        try:
-            df = pd.read_html(url)[0]
-            stat_col = df.columns[2] 
-
-            ret_df = df[['Team', stat_col]].copy()
-
-            ret_df.rename(columns={stat_col: 'value'}, inplace=True)
-            ret_df['date'] = date
-            ret_df['stat'] = stat
-            return ret_df
-        except Exception as e:
-            print("Failed:", url, e)
-            return None
-
-    def scrape_stat(self, stat):
-        """Scrape one stat for all dates in range."""
-        all_frames = []
-        for i, date in enumerate(self.date_range(), start=1):
-
-            # Print every 10 days
-            if i % 10 == 0:
-                print(f"Progress: Day {i} — currently scraping {date}")
-
-            df = self.scrape_by_date(stat, date)
-            if df is not None:
-                all_frames.append(df)
-
-            time.sleep(3)
-
-        if all_frames:
-            return pd.concat(all_frames, ignore_index=True)
+    def fetch_stat_table(self, stat, date):
+        """Fetch one (stat, date) page and keep the team and value columns. Raises on failure."""
+        url = f"{self.BASE_URL}/ncaa-basketball/stat/{stat}?date={date}"
+
+        html = fetch_url(url, client=self.client)
+
+        with metrics.stage("parse"):
+            table = extract_stat_table(html)
+            return pd.DataFrame({
+                'Team': table.teams,
+                'value': table.values,
+                'date': date,
+                'stat': stat,
+            })
+
+    def scrape_grid(self, stats, max_workers=4, requests_per_second=None, limiter=None, journal=None):
+        """
+        Scrape every (stat, date) cell in the range on a worker pool.
+
+        Requests are paced by the client's per-host pacer, which speeds up
+        while TeamRankings answers quickly and backs off on 429/5xx. A
+        requests_per_second (or a TokenBucket limiter) adds a fixed global
+        cap on top, shared by all workers. Each cell's outcome is recorded in
+        self.cell_report as (stat, date, status, rows, seconds, error).
+        With a journal, cells already uploaded are skipped and scraped cells
+        are marked parsed.
+        Returns one frame ordered by stat then date, or None if nothing came back.
+        """
+        if limiter is None and requests_per_second:
+            limiter = TokenBucket(requests_per_second)
+        cells = [(stat, date) for stat in stats for date in self.date_range()]
+        if journal:
+            uploaded = journal.units(JOURNAL_SOURCE)
+            todo = [cell for cell in cells if journal_unit(*cell) not in uploaded]
+            if len(todo) < len(cells):
+                print(f"Skipping {len(cells) - len(todo)} cells already uploaded (journal)")
+            cells = todo
+        frames = {}
+        self.cell_report = []
+
+        def run_cell(cell):
+            if limiter is not None:
+                limiter.acquire()
+            started = time.perf_counter()
+            return self.fetch_stat_table(*cell), time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(run_cell, cell): cell for cell in cells}
+            progress = tqdm(as_completed(futures), total=len(cells))
+            for future in progress:
+                stat, date = futures[future]
+                try:
+                    df, elapsed = future.result()
+                except Exception as e:
+                    metrics.count("cells_failed")
+                    self.cell_report.append((stat, date, "failed", 0, None, str(e)))
+                    progress.write(f"Failed: {stat} {date} {e}")
+                    continue
+                frames[(stat, date)] = df
+                self.cell_report.append((stat, date, "ok", len(df), elapsed, None))
+                if journal:
+                    journal.mark(JOURNAL_SOURCE, journal_unit(stat, date), "parsed")
+                progress.set_postfix_str(f"{stat} {date}: {len(df)} rows")
+
+        failed = sum(1 for r in self.cell_report if r[2] == "failed")
+        print(f"Scraped {len(frames)}/{len(cells)} cells, {failed} failed")
+
+        ordered = [frames[cell] for cell in cells if cell in frames]
+        if ordered:
+            return pd.concat(ordered, ignore_index=True)
         return None
 
 
@@ -77,24 +131,8 @@ class TRScraper:
 #%%
 #Helper Functions
 def alias_info_lookup():
-    alias_lookup = {}
-
-    res = supabase.table("team_aliases") \
-                .select("alias_name, canonical_team_id") \
-                .execute()
-
-    res2 = supabase.table('teams') \
-                .select('team_name, team_id') \
-                .execute()
-    for row in res.data:
-        alias_lookup[row["alias_name"]] = row["canonical_team_id"]
-
-    for rows in res2.data:
-        alias_lookup[rows["team_name"]] = rows["team_id"]
-
-    print("Loaded alias lookup:", len(alias_lookup))
-
-    return alias_lookup
+    # Cached per process (and optionally on disk), so repeat calls are free
+    return get_alias_resolver(supabase)
 
 
 def clean_value(val):
@@ -134,60 +172,129 @@ stats_d = ['opponent-three-point-pct', 'opponent-two-point-pct', 'opponent-free-
 # end_date_list = ['2023-04-08', '2024-04-08', '2025-04-15']
 
 # %%
-#Main Function for automated script
-def scrape_data(stat, start_date, end_date):
-    time.sleep(3)
-    rows = []
-    scrape = TRScraper(start_date=start_date, end_date=end_date)
-    df_check = scrape.scrape_stat(stat)
-
-    if df_check is None:
-        print(f"Nothing found for the date: {start_date}")
-        return
-
-    alias_lookup = alias_info_lookup()
-    #print(df_check)
-
-    for _, row in tqdm(df_check.iterrows(), total=len(df_check)):
-        team_name = row['Team']
-
-        if team_name not in alias_lookup:
-            print("Missing alias:", team_name)
-            continue
-
-        team_id = alias_lookup[team_name]
-        stat_date = row['date']
-        stat_value = clean_value(row['value'])
-        season_year = get_season_year(stat_date)
-        rows.append({
+#Row building and upload
+@metrics.timed("transform")
+def build_rows(df_check, alias_lookup, lost=None):
+    """
+    Turn scraped (Team, value, date, stat) rows into tr_team_daily_stats records.
+
+    Columnar equivalent of calling clean_value / get_season_year / the alias
+    lookup row by row: names and dates are resolved once per distinct value,
+    values are coerced to float in bulk, and records are zipped from columns.
+    Rows whose team does not resolve are dropped; when `lost` is a set, the
+    journal unit of every (stat, date) that lost rows is added to it.
+    """
+    if df_check is None or df_check.empty:
+        return []
+
+    # Alias lookup once per distinct team name
+    team_codes, team_names = pd.factorize(df_check['Team'])
+    counts = np.bincount(team_codes[team_codes >= 0], minlength=len(team_names))
+    team_ids = np.array(alias_lookup.get_many(list(team_names), counts) + [None], dtype=object)
+    # factorize marks NaN names with -1, which indexes the trailing None
+    row_team_ids = team_ids[team_codes]
+    keep = pd.notna(row_team_ids)
+    if not keep.all():
+        if lost is not None:
+            dropped = df_check.loc[~keep, ['stat', 'date']].drop_duplicates()
+            lost.update(journal_unit(stat, date) for stat, date in zip(dropped['stat'], dropped['date']))
+        df_check = df_check[keep]
+        row_team_ids = row_team_ids[keep]
+
+    # '38.2%' -> 38.2, '1,024' -> 1024; anything to_numeric can't read goes through clean_value
+    raw = df_check['value']
+    numeric = pd.to_numeric(
+        raw.astype(str).str.strip().str.replace('%', '', regex=False).str.replace(',', '', regex=False),
+        errors='coerce',
+    )
+    values = numeric.astype(object).where(numeric.notna(), None)
+    retry = numeric.isna() & raw.notna()
+    if retry.any():
+        values[retry] = pd.Series([clean_value(v) for v in raw[retry]], index=raw.index[retry], dtype=object)
+
+    # Season year once per distinct date
+    date_codes, dates = pd.factorize(df_check['date'])
+    years = np.array([int(d[:4]) for d in dates])
+    months = np.array([int(d[5:7]) for d in dates])
+    seasons = np.where(months >= 7, years, years - 1)[date_codes]
+
+    return [
+        {
             "team_id": team_id,
-            "stat_name": stat,
+            "stat_name": stat_name,
             "stat_value": stat_value,
             "stat_date": stat_date,
             "season_year": season_year,
             "source": "TR"
-        })
-    return rows
-
-
-# %%
-#Uploading in batches for automated script
-for stat in stats:
-    time.sleep(2)
-    print(f"Uploading {stat}")
-    rows = scrape_data(stat, start_date , end_date)
-
-    batch_size = 500
+        }
+        for team_id, stat_name, stat_value, stat_date, season_year in zip(
+            row_team_ids.tolist(),
+            df_check['stat'].tolist(),
+            values.tolist(),
+            df_check['date'].tolist(),
+            seasons.tolist(),
+        )
+    ]
+
+
+def upload_rows(rows, batch_size=500, journal=None, incomplete=()):
+    # Rows still to write per (stat, date), so each cell is marked uploaded with its last batch.
+    # Cells in `incomplete` (rows lost in build_rows) are written but never marked.
+    remaining = Counter(journal_unit(r["stat_name"], r["stat_date"]) for r in rows) if journal else None
 
     for i in range(0, len(rows), batch_size):
         batch = rows[i:i+batch_size]
 
-        resp = supabase.table("tr_team_daily_stats").upsert(
-            batch,
-            on_conflict="team_id,stat_name,stat_date"
-        ).execute()
+        with metrics.stage("upsert"):
+            resp = supabase.table("tr_team_daily_stats").upsert(
+                batch,
+                on_conflict="team_id,stat_name,stat_date"
+            ).execute()
+        metrics.count("rows_written", len(batch))
 
         print(f"Inserted batch {i//batch_size+1}")
-    print(f"{stat} update successful. Moving to next! \n")
 
-print("All data successfully uploaded!")
+        if journal:
+            finished = []
+            for r in batch:
+                unit = journal_unit(r["stat_name"], r["stat_date"])
+                remaining[unit] -= 1
+                if remaining[unit] == 0 and unit not in incomplete:
+                    finished.append(unit)
+            journal.mark_many(JOURNAL_SOURCE, finished, "uploaded")
+
+
+# %%
+#Scrape the full (stat, date) grid in parallel, then upload in batches
+if __name__ == "__main__":
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Supabase credentials not found in environment variables")
+
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+    journal = default_journal()
+
+    with metrics.run(JOURNAL_SOURCE):
+        scrape = TRScraper(start_date=start_date, end_date=end_date)
+        df_all = scrape.scrape_grid(stats, journal=journal)
+
+        if df_all is None:
+            print(f"Nothing found for the date: {start_date}")
+        else:
+            alias_lookup = alias_info_lookup()
+            lost = set()
+            rows = build_rows(df_all, alias_lookup, lost)
+            upload_rows(rows, journal=journal, incomplete=lost)
+            if journal:
+                # Cells that scraped no rows are finished too; cells that lost
+                # rows to unresolved teams stay pending until the aliases are fixed
+                journal.mark_many(JOURNAL_SOURCE, [
+                    unit for unit in (
+                        journal_unit(stat, date) for stat, date, status, *_ in scrape.cell_report if status == "ok"
+                    ) if unit not in lost
+                ], "uploaded")
+                if lost:
+                    print(f"{len(lost)} cells lost rows to unresolved teams; left for the next run")
+            alias_lookup.report_misses()
+
+            print("All data successfully uploaded!")
@@ -0,0 +1,112 @@
+#%%
+#======================================================================================
+#          BENCHMARK + PARITY: box page linescore parsing per game
+#======================================================================================
+"""
+Time `BoxScore.parse_linescore` against the BeautifulSoup + `pd.read_html`
++ `iterrows` parse it replaced, page by page, and check both give the same
+rows (team, H1, H2, OT) and ot_count.
+
+Uses saved pages (a directory of .html files or a page cache holding box.php
+URLs) when given, synthetic ones otherwise.
+
+    python benchmarks/bench_box_linescore.py --pages 60
+    python benchmarks/bench_box_linescore.py --pages-dir ~/.cache/cbb-pages
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from io import StringIO
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from box import BoxScore  # noqa: E402
+from box_pages import load_pages, synthetic_pages  # noqa: E402
+
+
+def parse_legacy(html):
+    """The original parse_box_score body, kept as the parity reference."""
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.select_one("#linescore-table2")
+
+    if table is None:
+        return None, None
+
+    df = pd.read_html(StringIO(str(table)))[0]
+    df.rename(columns={"Unnamed: 0": "Team"}, inplace=True)
+
+    ot_count = max(0, df.shape[1] - 6)
+
+    df["H1"] = df["Q1"] + df["Q2"]
+    df["H2"] = df["Q3"] + df["Q4"]
+    df["OT"] = df["T"] - df["H1"] - df["H2"] if ot_count > 0 else 0
+
+    rows = []
+    for _, r in df.iterrows():
+        rows.append({
+            "team_name": r["Team"],
+            "H1": int(r["H1"]),
+            "H2": int(r["H2"]),
+            "OT": int(r["OT"])
+        })
+
+    return rows, ot_count
+
+
+def time_per_page(fn, pages, repeat):
+    times = []
+    for _, html in pages:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(html)
+            best = min(best, time.perf_counter() - started)
+        times.append(best)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=60, help="synthetic pages when --pages-dir is not given")
+    parser.add_argument("--pages-dir")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N per page")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir) if args.pages_dir else list(synthetic_pages(args.pages))
+    if not pages:
+        raise SystemExit("No pages found")
+    # A page without a linescore (postponed game) must come back as (None, None) on both paths
+    pages.append(("no-linescore", b"<html><body><p>Game postponed</p></body></html>"))
+
+    mismatches = 0
+    overtime = 0
+    for name, html in pages:
+        old, new = parse_legacy(html), BoxScore.parse_linescore(html)
+        overtime += bool(old[1])
+        if old != new:
+            mismatches += 1
+            print(f"MISMATCH: {name}\n  legacy: {old}\n  new:    {new}")
+    print(f"{len(pages)} pages, {overtime} with overtime")
+
+    old_times = time_per_page(parse_legacy, pages, args.repeat)
+    new_times = time_per_page(BoxScore.parse_linescore, pages, args.repeat)
+    for label, times in (("bs4 + read_html", old_times), ("parse_linescore", new_times)):
+        print(
+            f"{label:>16}: median {statistics.median(times) * 1e3:7.3f} ms/page, "
+            f"max {max(times) * 1e3:7.3f} ms, {len(times) / sum(times):8.1f} pages/s"
+        )
+    print(f"speedup: {sum(old_times) / sum(new_times):.1f}x")
+
+    if mismatches:
+        raise SystemExit(f"{mismatches} page(s) differ")
+    print(f"parity: {len(pages)} pages identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#%%
+#======================================================================================
+#             BENCHMARK: BoxScore box page fetching over a session pool
+#======================================================================================
+"""
+Fetch synthetic box pages through `BoxScore.fetch_box_scores` with stub
+browsers in place of KenPom sessions. This shows throughput growing with the
+pool size at a fixed per-session rate, and checks that:
+- every page is parsed;
+- each session stays within its rate;
+- a session that expires is logged in again on its own.
+
+Stub browsers answer after `--latency` seconds and serve the login form once
+they have served `--expire-after` pages; the stub login returns a fresh one.
+
+    python benchmarks/bench_box_sessions.py --pages 120 --rate 10 --sizes 1 2 4
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from box import BoxScore  # noqa: E402
+from box_pages import synthetic_pages  # noqa: E402
+from session_pool import SessionPool  # noqa: E402
+
+LOGIN_PAGE = b'<html><body><form action="handlers/login_handler.php" method="post"></form></body></html>'
+
+
+class StubResponse:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+
+class StubBrowser:
+    """Serves `pages` by URL, and the login form once `expire_after` pages were served."""
+
+    _ids = itertools.count()
+
+    def __init__(self, pages, latency, expire_after=None):
+        self.id = next(self._ids)
+        self.pages = pages
+        self.latency = latency
+        self.expire_after = expire_after
+        self.served = 0
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        time.sleep(self.latency)
+        with self._lock:
+            self.served += 1
+            expired = self.expire_after is not None and self.served > self.expire_after
+        return StubResponse(LOGIN_PAGE if expired else self.pages[url])
+
+
+def run(pages, size, rate, latency, expire_after, workers_per_session):
+    logins = []
+
+    def login():
+        browser = StubBrowser(pages, latency, expire_after)
+        logins.append(browser.id)
+        return browser
+
+    sessions = SessionPool(login=login, size=size, requests_per_second=rate, burst=1)
+    bs = BoxScore(
+        browser=sessions.sessions[0].browser,
+        supabase_client=None,
+        start_date="2025-01-01",
+        max_workers=size * workers_per_session,
+        sessions=sessions,
+    )
+    urls = list(pages)
+    started = time.perf_counter()
+    results = bs.fetch_box_scores(urls)
+    seconds = time.perf_counter() - started
+    parsed = sum(1 for rows, _ in results if rows)
+    return sessions, parsed, seconds, len(logins) - size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=120)
+    parser.add_argument("--rate", type=float, default=10.0, help="requests per second per session")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--expire-after", type=int, default=25)
+    parser.add_argument("--workers-per-session", type=int, default=2)
+    args = parser.parse_args()
+
+    pages = {f"https://kenpom.com/box.php?g={i}": html for i, (_, html) in enumerate(synthetic_pages(args.pages))}
+    problems = []
+    for size in args.sizes:
+        sessions, parsed, seconds, relogins = run(
+            pages, size, args.rate, args.latency, args.expire_after, args.workers_per_session
+        )
+        requests = [s["requests"] for s in sessions.stats()]
+        per_session = [s["relogins"] for s in sessions.stats()]
+        # Each session serves its share plus one repeat per expiry
+        ceiling = args.rate * seconds + 1
+        print(
+            f"{size} session(s): {parsed}/{len(pages)} pages in {seconds:5.2f} s "
+            f"({len(pages) / seconds:5.1f} pages/s), requests per session {requests}, "
+            f"re-logins per session {per_session}"
+        )
+        if parsed != len(pages):
+            problems.append(f"{size} sessions: {len(pages) - parsed} pages not parsed")
+        if max(requests) > ceiling:
+            problems.append(f"{size} sessions: a session made {max(requests)} requests, limit {ceiling:.0f}")
+        if sum(per_session) != relogins:
+            problems.append(f"{size} sessions: {relogins} logins but {sum(per_session)} re-logins counted")
+        for s in sessions.sessions:
+            # A session re-logs in only once it has served expire_after pages since its last login
+            if args.expire_after and s.relogins > s.requests // (args.expire_after + 1):
+                problems.append(f"{size} sessions: session {s.index} re-logged in {s.relogins} times")
+
+    if problems:
+        raise SystemExit("; ".join(problems))
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
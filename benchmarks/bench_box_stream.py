@@ -0,0 +1,193 @@
+#%%
+#======================================================================================
+#          BENCHMARK + PARITY: BoxScore collect + upload vs stream
+#======================================================================================
+"""
+Run a date range through `BoxScore.collect()` then `upload()`, and through
+`BoxScore.stream()`, with stub KenPom sessions and an in-memory stand-in for
+Supabase whose upserts take `--write-latency` seconds. Reports wall time
+against the scrape and write times, and peak traced memory. Checks that both
+runs write the same rows.
+
+    python benchmarks/bench_box_stream.py --days 30 --games 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lookups  # noqa: E402
+from bench_box_sessions import StubBrowser  # noqa: E402
+from box import BoxScore  # noqa: E402
+from box_pages import synthetic_box_page  # noqa: E402
+from session_pool import SessionPool  # noqa: E402
+
+TEAMS = [f"Team {i:03d}" for i in range(1, 365)]
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, db, table):
+        self.db, self.table, self.filters, self.rows, self.span = db, table, [], None, None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda r: r[column] == value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda r: r[column] >= value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda r: r[column] <= value)
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.span = (start, end)
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.rows = rows
+        return self
+
+    def execute(self):
+        if self.rows is not None:
+            time.sleep(self.db.write_latency)
+            # Keep a digest per row, not the rows, so peak memory is the loader's
+            with self.db.lock:
+                self.db.written.extend(hash(tuple(sorted(r.items()))) for r in self.rows)
+            return _Result(self.rows)
+        rows = [r for r in self.db.tables[self.table] if all(f(r) for f in self.filters)]
+        if self.span:
+            rows = rows[self.span[0]:self.span[1] + 1]
+        return _Result(rows)
+
+
+class FakeSupabase:
+    def __init__(self, tables, write_latency):
+        self.tables = tables
+        self.write_latency = write_latency
+        self.written = []
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+def synthetic_range(n_days, n_games, seed=0):
+    """FanMatch and box pages by URL, plus the games and teams tables behind them."""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    pages, games = {}, []
+    for d in range(n_days):
+        day = (start + timedelta(days=d)).isoformat()
+        teams = rng.sample(range(len(TEAMS)), 2 * n_games)
+        links = []
+        for i in range(n_games):
+            t1, t2 = TEAMS[teams[2 * i]], TEAMS[teams[2 * i + 1]]
+            game_id = len(games) + 1
+            # Some games are stored in the reverse order of the FanMatch page
+            ids = (teams[2 * i] + 1, teams[2 * i + 1] + 1)
+            ids = ids if rng.random() < 0.7 else ids[::-1]
+            games.append({"game_id": game_id, "game_date": day, "team1_id": ids[0], "team2_id": ids[1]})
+            pages[f"https://kenpom.com/box.php?g={game_id}"] = synthetic_box_page(
+                t1, t2, seed=game_id, n_ot=int(rng.random() < 0.08)
+            )
+            links.append(
+                f'<tr><td><a href="team.php?team={t1}">{t1}</a> 70, <a href="team.php?team={t2}">{t2}</a> 65</td>'
+                f'<td><a href="box.php?g={game_id}">box</a></td></tr>'
+            )
+        pages[f"https://kenpom.com/fanmatch.php?d={day}"] = (
+            f'<html><body><table id="fanmatch-table">{"".join(links)}</table></body></html>'
+        ).encode("utf-8")
+    tables = {
+        "games": games,
+        "teams": [{"team_id": i + 1, "team_name": name} for i, name in enumerate(TEAMS)],
+        "team_aliases": [],
+    }
+    return start, pages, tables
+
+
+def run(mode, start, n_days, pages, tables, args):
+    # Fresh alias resolver per run, so both load it the same way
+    lookups._alias_resolver = None
+    db = FakeSupabase(tables, args.write_latency)
+    sessions = SessionPool(
+        browsers=[StubBrowser(pages, args.page_latency)], requests_per_second=1e6, burst=1000
+    )
+    bs = BoxScore(
+        browser=None,
+        supabase_client=db,
+        start_date=start.isoformat(),
+        end_date=(start + timedelta(days=n_days - 1)).isoformat(),
+        max_workers=args.workers,
+        sessions=sessions,
+    )
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "stream":
+            stats = bs.stream(queue_size=args.queue_size)
+        else:
+            bs.collect()
+            scraped = time.perf_counter()
+            stats = bs.upload()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    write_s = sum(s["seconds"] for s in stats)
+    scrape_s = scraped - started if mode != "stream" else None
+    return seconds, scrape_s, write_s, peak, sorted(db.written)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--games", type=int, default=20, help="games per day")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--page-latency", type=float, default=0.01, help="seconds per stub page fetch")
+    parser.add_argument("--write-latency", type=float, default=0.06, help="seconds per upsert batch")
+    parser.add_argument("--queue-size", type=int, default=4)
+    args = parser.parse_args()
+
+    start, pages, tables = synthetic_range(args.days, args.games)
+    print(f"{args.days} days x {args.games} games, {args.page_latency * 1e3:.0f} ms per page, "
+          f"{args.write_latency * 1e3:.0f} ms per upsert")
+
+    results = {}
+    for mode in ("collect+upload", "stream"):
+        seconds, scrape_s, write_s, peak, written = run(mode, start, args.days, pages, tables, args)
+        results[mode] = (seconds, scrape_s, write_s, written)
+        print(f"{mode:>15}: {seconds:6.2f} s wall, {write_s:5.2f} s writing, "
+              f"{len(written)} rows written, peak {peak / 2**20:6.2f} MiB")
+
+    sequential_s, scrape_s, write_s, written = results["collect+upload"]
+    streamed_s, _, _, streamed = results["stream"]
+    print(f"scrape {scrape_s:.2f} s + write {write_s:.2f} s; stream is "
+          f"{streamed_s / max(scrape_s, write_s):.2f}x max(scrape, write)")
+    if written != streamed:
+        raise SystemExit("MISMATCH: stream wrote different rows than collect + upload")
+    print(f"speedup: {sequential_s / streamed_s:.2f}x, parity: {len(written)} identical rows")
+
+
+if __name__ == "__main__":
+    main()
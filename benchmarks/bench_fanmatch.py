@@ -0,0 +1,109 @@
+#%%
+#======================================================================================
+#                       BENCHMARK + PARITY: FanMatch parser engines
+#======================================================================================
+"""
+Parse the same FanMatch pages with every engine, report time per engine and
+check that all engines return the same fm_df and summary attributes.
+
+    python benchmarks/bench_fanmatch.py                   # synthetic season
+    python benchmarks/bench_fanmatch.py --pages DIR       # saved .html files or a page cache
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FanMatch import FanMatch  # noqa: E402
+from fanmatch_pages import load_pages, synthetic_pages  # noqa: E402
+
+SUMMARY_ATTRS = [
+    "fm_date",
+    "lines_of_night",
+    "ppg",
+    "avg_eff",
+    "pos_40",
+    "mean_abs_err_pred_total_score",
+    "bias_pred_total_score",
+    "mean_abs_err_pred_mov",
+    "record_favs",
+    "expected_record_favs",
+    "exact_mov",
+]
+
+
+def compare(reference: FanMatch, other: FanMatch):
+    """Return a list of differences between two parsed pages (empty when identical)."""
+    problems = []
+    for attr in SUMMARY_ATTRS:
+        if getattr(reference, attr) != getattr(other, attr):
+            problems.append(f"{attr}: {getattr(reference, attr)!r} != {getattr(other, attr)!r}")
+
+    if (reference.fm_df is None) != (other.fm_df is None):
+        problems.append("fm_df: one engine returned None")
+    elif reference.fm_df is not None:
+        try:
+            pd.testing.assert_frame_equal(reference.fm_df, other.fm_df)
+        except AssertionError as e:
+            problems.append(f"fm_df: {str(e).splitlines()[0]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="directory of saved FanMatch pages or a page cache")
+    parser.add_argument("--synthetic", type=int, default=150, help="synthetic pages when --pages is not given")
+    parser.add_argument("--games", type=int, default=60, help="games per synthetic page")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="share of synthetic rows with a missing </td>")
+    parser.add_argument("--engines", nargs="+", default=list(FanMatch._ENGINES))
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = list(synthetic_pages(args.synthetic, args.games, args.malformed_rate))
+    print(f"{len(pages)} pages")
+
+    results = {engine: [] for engine in args.engines}
+    timings = {engine: 0.0 for engine in args.engines}
+    rows = 0
+
+    for name, html in pages:
+        for engine in args.engines:
+            started = time.perf_counter()
+            results[engine].append(FanMatch(None, html_content=html, engine=engine))
+            timings[engine] += time.perf_counter() - started
+        fm_df = results[args.engines[0]][-1].fm_df
+        rows += 0 if fm_df is None else len(fm_df)
+
+    base = args.engines[0]
+    for engine in args.engines:
+        secs = timings[engine]
+        print(
+            f"{engine:>5}: {secs:7.3f} s  {len(pages) / secs:7.1f} pages/s  "
+            f"{rows / secs:9.0f} rows/s  ({timings[base] / secs:.2f}x vs {base})"
+        )
+
+    mismatches = 0
+    for engine in args.engines[1:]:
+        for (name, _), ref, other in zip(pages, results[base], results[engine]):
+            problems = compare(ref, other)
+            if problems:
+                mismatches += 1
+                print(f"MISMATCH {engine} vs {base} on {name}:")
+                for problem in problems:
+                    print(f"    {problem}")
+
+    if mismatches:
+        raise SystemExit(f"{mismatches} page(s) differ between engines")
+    print(f"parity: all engines agree on {len(pages)} pages ({rows} games)")
+
+
+if __name__ == "__main__":
+    main()
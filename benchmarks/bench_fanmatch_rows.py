@@ -0,0 +1,129 @@
+#%%
+#======================================================================================
+#               BENCHMARK + PARITY: FanMatch row scan (bs4 engine)
+#======================================================================================
+"""
+Time the original row handling of the bs4 engine (game rows parsed, then the
+table found again, every row's cells found again and the "lines of the night"
+header located with `rows.index(row)`, which compares Tags structurally)
+against the current single pass that shares the rows and cells, on a
+synthetic page with a few hundred rows, and check both give the same result.
+HTML parsing is done once up front and is not part of the timings.
+
+    python benchmarks/bench_fanmatch_rows.py --games 400
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FanMatch import FanMatch  # noqa: E402
+from bench_fanmatch import SUMMARY_ATTRS, compare  # noqa: E402
+from fanmatch_pages import synthetic_fanmatch_page  # noqa: E402
+
+
+def blank():
+    fm = FanMatch.__new__(FanMatch)
+    for attr in SUMMARY_ATTRS:
+        setattr(fm, attr, None)
+    fm.fm_df = None
+    return fm
+
+
+def legacy_rows(fm, soup):
+    """The original bs4 row handling, kept as the parity and timing reference."""
+    rows = soup.find("table", id=FanMatch._TABLE_ID).find("tbody").find_all("tr")
+    games_data = []
+    last_game_row = None
+    for row in rows:
+        game_data = fm._parse_game_row(row)
+        if game_data:
+            games_data.append(game_data)
+            last_game_row = row
+    fm.fm_df = pd.DataFrame(games_data)
+    legacy_summary(fm, soup, last_game_row)
+
+
+def legacy_summary(fm, soup, last_game_row):
+    """The original `_parse_summary_stats`: table, rows and cells found again."""
+    rows = soup.find("table", id=FanMatch._TABLE_ID).find("tbody").find_all("tr")
+    for row in rows:
+        cells = row.find_all("td")
+        if not cells:
+            continue
+        if "the night" in cells[0].get_text(strip=True).lower():
+            start_index = rows.index(row)
+
+            def first_cell_texts():
+                for i in range(start_index + 1, len(rows)):
+                    cells = rows[i].find_all("td")
+                    yield cells[0].get_text(strip=True) if cells else None
+
+            fm._collect_lines_of_night(first_cell_texts())
+            break
+    fm._extract_summary_statistics(fm._text_after(last_game_row))
+
+
+def single_pass_rows(fm, soup):
+    """What `FanMatch.__init__` does now."""
+    rows = soup.find("table", id=FanMatch._TABLE_ID).find("tbody").find_all("tr")
+    games_data, cells_by_row, night_index, last_game_row = fm._scan_rows(rows)
+    fm.fm_df = pd.DataFrame(games_data)
+    fm._parse_summary_stats(cells_by_row, night_index, last_game_row)
+
+
+def scan(soup):
+    rows = soup.find("table", id=FanMatch._TABLE_ID).find("tbody").find_all("tr")
+    return blank()._scan_rows(rows)
+
+
+def timed(fn, soup, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fm = blank()
+        fn(fm, soup)
+    return (time.perf_counter() - started) / repeat, fm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, nargs="+", default=[60, 400])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    failures = 0
+    for n_games in args.games:
+        soup = BeautifulSoup(synthetic_fanmatch_page(n_games, seed=n_games), "html.parser")
+        old_s, old = timed(legacy_rows, soup, args.repeat)
+        new_s, new = timed(single_pass_rows, soup, args.repeat)
+
+        # The summary stage on its own, after the game rows were parsed
+        _, cells_by_row, night_index, last_game_row = scan(soup)
+        old_summary_s, _ = timed(lambda fm, s: legacy_summary(fm, s, last_game_row), soup, args.repeat)
+        new_summary_s, _ = timed(
+            lambda fm, s: fm._parse_summary_stats(cells_by_row, night_index, last_game_row), soup, args.repeat
+        )
+
+        problems = compare(old, new)
+        failures += bool(problems)
+        print(
+            f"{n_games:>5} games ({len(cells_by_row)} rows): "
+            f"rows total {old_s * 1e3:7.1f} -> {new_s * 1e3:7.1f} ms, "
+            f"summary stage {old_summary_s * 1e3:6.2f} -> {new_summary_s * 1e3:6.3f} ms "
+            f"({old_summary_s / new_summary_s:.0f}x)  {'ok' if not problems else 'MISMATCH'}"
+        )
+        for problem in problems:
+            print(f"    {problem}")
+
+    if failures:
+        raise SystemExit(f"{failures} page(s) differ")
+
+
+if __name__ == "__main__":
+    main()
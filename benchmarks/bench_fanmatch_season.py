@@ -0,0 +1,110 @@
+#%%
+#======================================================================================
+#               BENCHMARK + PARITY: FanMatch season frame assembly
+#======================================================================================
+"""
+Build a season of FanMatch games two ways: one `FanMatch` per date with its
+own `fm_df`, concatenated at the end (the old backfill pattern), and
+`FanMatch.season_df`, which streams records into one columnar buffer. For
+ranges of growing length, report time, the traced peak memory beyond the
+final frame, and check both hold the same values. Also report the frame's
+own size with and without `FanMatch.to_typed`.
+
+    python benchmarks/bench_fanmatch_season.py --days 30 150
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FanMatch import FanMatch  # noqa: E402
+from fanmatch_pages import synthetic_fanmatch_page  # noqa: E402
+
+START = date(2025, 11, 3)
+
+
+def season_pages(n_days, n_games):
+    pages = {}
+    for i in range(n_days):
+        day = START + timedelta(days=i)
+        pages[day.isoformat()] = synthetic_fanmatch_page(n_games, seed=i, day=day, completed=i % 5 != 4)
+    return pages
+
+
+def per_date_frames(pages, engine):
+    frames = []
+    for date_str, html in pages.items():
+        fm = FanMatch(None, date=date_str, html_content=html, engine=engine)
+        if fm.fm_df is not None:
+            frames.append(fm.fm_df.assign(Date=date_str))
+    season = pd.concat(frames, ignore_index=True)
+    return season[["Date"] + FanMatch._OUTPUT_COLS]
+
+
+def streamed(pages, engine):
+    dates = list(pages)
+    return FanMatch.season_df(None, dates[0], dates[-1], engine=engine, html_pages=pages)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    frame = fn(*args)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return frame, seconds, peak - frame.memory_usage(deep=True).sum()
+
+
+def same_values(a, b):
+    """Compare two frames cell by cell, treating every kind of NA as equal."""
+    if list(a.columns) != list(b.columns) or len(a) != len(b):
+        return False
+    for col in a.columns:
+        left = [None if pd.isna(v) else v for v in a[col].tolist()]
+        right = [None if pd.isna(v) else v for v in b[col].tolist()]
+        if left != right:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 150])
+    parser.add_argument("--games", type=int, default=60)
+    parser.add_argument("--engine", default="lxml", choices=FanMatch._ENGINES)
+    args = parser.parse_args()
+
+    failures = 0
+    for n_days in args.days:
+        pages = season_pages(n_days, args.games)
+        old, old_s, old_peak = measure(per_date_frames, pages, args.engine)
+        new, new_s, new_peak = measure(streamed, pages, args.engine)
+        same = same_values(old, new)
+        failures += not same
+        print(
+            f"{n_days:>4} days ({len(new):>5} games): "
+            f"per-date frames {old_s:6.2f} s, {old_peak / 2**20:6.1f} MiB over the result | "
+            f"season_df {new_s:6.2f} s, {new_peak / 2**20:6.1f} MiB  {'ok' if same else 'MISMATCH'}"
+        )
+        started = time.perf_counter()
+        typed = FanMatch.to_typed(new)
+        print(
+            f"{'':>22}frame {new.memory_usage(deep=True).sum() / 2**20:6.2f} MiB, "
+            f"typed {typed.memory_usage(deep=True).sum() / 2**20:6.2f} MiB "
+            f"(to_typed {time.perf_counter() - started:.3f} s)"
+        )
+
+    if failures:
+        raise SystemExit(f"{failures} range(s) differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#%%
+#======================================================================================
+#               BENCHMARK + PARITY: FanMatch summary statistics extraction
+#======================================================================================
+"""
+Time the footer-only, single-pass `FanMatch._extract_summary_statistics`
+against the original nine `re.search` calls over the whole page text, on
+pages of growing length, and check both set the same attributes.
+
+    python benchmarks/bench_fanmatch_summary.py --games 60 400 2000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FanMatch import FanMatch  # noqa: E402
+from fanmatch_pages import synthetic_fanmatch_page  # noqa: E402
+
+ATTRS = [
+    "ppg",
+    "avg_eff",
+    "pos_40",
+    "mean_abs_err_pred_total_score",
+    "bias_pred_total_score",
+    "mean_abs_err_pred_mov",
+    "record_favs",
+    "expected_record_favs",
+    "exact_mov",
+]
+
+
+def extract_nine_searches(fm, page_text):
+    """The original implementation, kept as the parity reference."""
+    p = FanMatch._PATTERNS
+    m = re.search(p["ppg"], page_text)
+    if m:
+        fm.ppg = float(m.group(1))
+    m = re.search(p["avg_eff"], page_text)
+    if m:
+        fm.avg_eff = float(m.group(1))
+    m = re.search(p["pos_40"], page_text)
+    if m:
+        fm.pos_40 = float(m.group(1))
+    m = re.search(p["mae_total_score"], page_text, re.IGNORECASE)
+    if m:
+        fm.mean_abs_err_pred_total_score = float(m.group(1))
+    m = re.search(p["pred_score_bias"], page_text)
+    if m:
+        fm.bias_pred_total_score = float(m.group(1))
+    m = re.search(p["mae_mov"], page_text, re.IGNORECASE)
+    if m:
+        fm.mean_abs_err_pred_mov = float(m.group(1))
+    m = re.search(p["fav_records"], page_text)
+    if m:
+        fm.record_favs = m.group(1)
+    m = re.search(p["exp_record"], page_text)
+    if m:
+        fm.expected_record_favs = m.group(1)
+    m = re.search(p["exact_mov"], page_text, re.IGNORECASE)
+    if m:
+        fm.exact_mov = f"{m.group(1)}/{m.group(2)}"
+
+
+def blank():
+    fm = FanMatch.__new__(FanMatch)
+    for attr in ATTRS:
+        setattr(fm, attr, None)
+    return fm
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fm = blank()
+        fn(fm)
+    return (time.perf_counter() - started) / repeat, fm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, nargs="+", default=[60, 400, 2000])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    pages = {n: synthetic_fanmatch_page(n, seed=n) for n in args.games}
+    # Every statistic on its own line instead of <br>-separated
+    pages["multiline"] = pages[args.games[0]].replace("<br>", "<br>\n")
+
+    failures = 0
+    for label, html in pages.items():
+        soup = BeautifulSoup(html, "html.parser")
+        rows = soup.find("table", id=FanMatch._TABLE_ID).find("tbody").find_all("tr")
+        last_game_row = [r for r in rows if len(r.find_all("td")) >= FanMatch._MIN_COLUMNS][-1]
+
+        old_s, old = timed(lambda fm: extract_nine_searches(fm, soup.get_text()), args.repeat)
+        new_s, new = timed(
+            lambda fm: fm._extract_summary_statistics(FanMatch._text_after(last_game_row)),
+            args.repeat,
+        )
+        same = all(getattr(old, a) == getattr(new, a) for a in ATTRS)
+        failures += not same
+        print(
+            f"{str(label):>10} ({len(rows):>5} rows): page text + nine searches {old_s * 1e6:9.1f} us, "
+            f"footer single pass {new_s * 1e6:8.1f} us  {'ok' if same else 'MISMATCH'}"
+        )
+
+    if failures:
+        raise SystemExit(f"{failures} page(s) differ")
+
+
+if __name__ == "__main__":
+    main()
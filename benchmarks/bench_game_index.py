@@ -0,0 +1,158 @@
+#%%
+#======================================================================================
+#          BENCHMARK + PARITY: per-date game lookups vs one GameIndex
+#======================================================================================
+"""
+Resolve a season of box score rows to game ids two ways, against an
+in-memory stand-in for the Supabase client that counts queries and adds
+a fixed round-trip latency to each:
+- the per-date `eq("game_date", ...)` lookups `BoxScore.upload` used to build;
+- one `lookups.GameIndex` loaded with a paged range query.
+
+Reports queries, time, and the memory held by the lookup structures, and
+checks that both resolve every (date, team1, team2) in either order to the
+same (game_id, swapped).
+
+    python benchmarks/bench_game_index.py --days 150 --games-per-day 40
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookups import GameIndex  # noqa: E402
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeGamesTable:
+    """Just enough of the supabase query builder for selects on `games`."""
+
+    def __init__(self, games, latency):
+        self.games = games
+        self.latency = latency
+        self.queries = 0
+
+    def table(self, name):
+        self._filters, self._range = [], None
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda g: g[column] == value)
+        return self
+
+    def gte(self, column, value):
+        self._filters.append(lambda g: g[column] >= value)
+        return self
+
+    def lte(self, column, value):
+        self._filters.append(lambda g: g[column] <= value)
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def execute(self):
+        self.queries += 1
+        time.sleep(self.latency)
+        rows = [g for g in self.games if all(f(g) for f in self._filters)]
+        if self._range:
+            rows = rows[self._range[0]:self._range[1] + 1]
+        return _Result(rows)
+
+
+def build_game_lookup(supabase, game_date):
+    """The original per-date lookup from BoxScore, kept as the parity reference."""
+    res = (
+        supabase
+        .table("games")
+        .select("game_id, team1_id, team2_id")
+        .eq("game_date", game_date)
+        .execute()
+    )
+    lookup = {}
+    for r in res.data:
+        lookup[(r["team1_id"], r["team2_id"])] = (r["game_id"], False)
+        lookup[(r["team2_id"], r["team1_id"])] = (r["game_id"], True)
+    return lookup
+
+
+def synthetic_games(n_days, games_per_day, seed=0):
+    rng = random.Random(seed)
+    start = date(2024, 11, 4)
+    games = []
+    for d in range(n_days):
+        day = (start + timedelta(days=d)).isoformat()
+        teams = rng.sample(range(1, 365), 2 * games_per_day)
+        for i in range(games_per_day):
+            games.append({
+                "game_id": len(games) + 100000,
+                "game_date": day,
+                "team1_id": teams[2 * i],
+                "team2_id": teams[2 * i + 1],
+            })
+    return games
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, seconds, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=150)
+    parser.add_argument("--games-per-day", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated round trip per query, seconds")
+    args = parser.parse_args()
+
+    games = synthetic_games(args.days, args.games_per_day)
+    dates = sorted({g["game_date"] for g in games})
+    rng = random.Random(1)
+    # Box score rows name the teams in either order
+    probes = [
+        (g["game_date"], g["team1_id"], g["team2_id"]) if rng.random() < 0.5
+        else (g["game_date"], g["team2_id"], g["team1_id"])
+        for g in games
+    ] + [(dates[0], 9998, 9999)]
+    print(f"{len(games):,} games over {len(dates)} dates, {args.latency * 1e3:.0f} ms per query")
+
+    old_db = FakeGamesTable(games, args.latency)
+    lookups, old_s, old_mem = measure(lambda: {d: build_game_lookup(old_db, d) for d in dates})
+    new_db = FakeGamesTable(games, args.latency)
+    index, new_s, new_mem = measure(lambda: GameIndex.load(new_db, dates[0], dates[-1]))
+
+    print(f"per-date lookups: {old_db.queries:4d} queries, {old_s:6.2f} s, {old_mem / 2**20:6.2f} MiB held")
+    print(f"GameIndex:        {new_db.queries:4d} queries, {new_s:6.2f} s, {new_mem / 2**20:6.2f} MiB held")
+
+    mismatches = sum(
+        lookups[d].get((t1, t2)) != index.lookup(d, t1, t2) for d, t1, t2 in probes
+    )
+    if mismatches:
+        raise SystemExit(f"{mismatches} of {len(probes)} lookups differ")
+    print(f"parity: {len(probes):,} lookups identical")
+
+
+if __name__ == "__main__":
+    main()
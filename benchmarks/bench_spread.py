@@ -0,0 +1,85 @@
+#%%
+#======================================================================================
+#               BENCHMARK + PARITY: win probability -> spread conversion
+#======================================================================================
+"""
+Time `spread.spread_from_win_probability` against the per-row `norm.ppf`
+loop the FanMatch loader used, on a day-sized and a season-sized frame, and
+check both give the same spreads.
+
+    python benchmarks/bench_spread.py --rows 60 6000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spread import spread_from_win_probability  # noqa: E402
+
+
+def spread_loop(df):
+    """The original per-row conversion, kept as the parity reference."""
+    spreads = []
+    for _, row in df.iterrows():
+        pred_score = [int(i) for i in row["PredictedScore"].split("-")]
+        wp = int(str(row["WinProbability"]).strip()[:-1]) / 100
+        if wp <= 0.97:
+            spreads.append(11.06 * norm.ppf(wp, loc=0, scale=1))
+        else:
+            spreads.append(pred_score[0] - pred_score[1])
+    return np.array(spreads, dtype=float)
+
+
+def synthetic_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    winner = rng.integers(60, 95, n_rows)
+    loser = winner - rng.integers(1, 25, n_rows)
+    wp = rng.integers(50, 100, n_rows)
+    return pd.DataFrame({
+        "PredictedScore": [f"{w}-{l}" for w, l in zip(winner, loser)],
+        "WinProbability": [f"{p}%" for p in wp],
+        "PredictedWinnerScore": pd.array(winner, dtype="Int16"),
+        "PredictedLoserScore": pd.array(loser, dtype="Int16"),
+        "WinProbabilityFraction": pd.array(wp / 100, dtype="Float64"),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[60, 6000])
+    args = parser.parse_args()
+
+    failures = 0
+    for n_rows in args.rows:
+        df = synthetic_frame(n_rows, seed=n_rows)
+
+        started = time.perf_counter()
+        old = spread_loop(df)
+        old_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        new = spread_from_win_probability(
+            df["WinProbabilityFraction"], df["PredictedWinnerScore"], df["PredictedLoserScore"]
+        )
+        new_s = time.perf_counter() - started
+
+        same = np.array_equal(old, new)
+        failures += not same
+        print(
+            f"{n_rows:>7} rows: per-row loop {old_s * 1e3:9.2f} ms, "
+            f"vectorized {new_s * 1e3:7.3f} ms ({old_s / new_s:6.0f}x)  {'ok' if same else 'MISMATCH'}"
+        )
+
+    if failures:
+        raise SystemExit(f"{failures} frame(s) differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#%%
+#======================================================================================
+#                   BENCHMARK: TeamRankings row building (TR_Upload.build_rows)
+#======================================================================================
+"""
+Compare the columnar `build_rows` against the original `iterrows` loop on a
+synthetic season-sized frame, and check both produce identical records.
+
+    python benchmarks/bench_tr_rows.py --teams 360 --days 150 --stats 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TR_Upload import build_rows, clean_value, get_season_year  # noqa: E402
+from lookups import AliasResolver  # noqa: E402
+
+
+def build_rows_loop(df_check, alias_lookup):
+    """The original per-row implementation, kept as the parity reference."""
+    rows = []
+    for _, row in df_check.iterrows():
+        team_name = row['Team']
+
+        if team_name not in alias_lookup:
+            continue
+
+        team_id = alias_lookup[team_name]
+        stat_date = row['date']
+        stat_value = clean_value(row['value'])
+        season_year = get_season_year(stat_date)
+        rows.append({
+            "team_id": team_id,
+            "stat_name": row['stat'],
+            "stat_value": stat_value,
+            "stat_date": stat_date,
+            "season_year": season_year,
+            "source": "TR"
+        })
+    return rows
+
+
+def synthetic_frame(n_teams, n_days, n_stats, seed=0):
+    """A scrape_grid-shaped frame with percent strings, plain numbers and gaps."""
+    rng = random.Random(seed)
+    start = date(2024, 11, 4)
+    teams = [f"Team {i}" for i in range(n_teams)] + ["Unknown College"]
+    frames = []
+    for s in range(n_stats):
+        stat = f"stat-{s}"
+        pct = s % 2 == 0
+        for d in range(n_days):
+            day = (start + timedelta(days=d)).isoformat()
+            values = []
+            for _ in teams:
+                r = rng.random()
+                if r < 0.01:
+                    values.append(None)
+                elif r < 0.02:
+                    values.append("--")
+                elif pct:
+                    values.append(f"{rng.uniform(20, 60):.1f}%")
+                else:
+                    values.append(f"{rng.uniform(5, 25):.1f}")
+            frames.append(pd.DataFrame({"Team": teams, "value": values, "date": day, "stat": stat}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def records_equal(a, b):
+    if len(a) != len(b):
+        return False
+    for x, y in zip(a, b):
+        vx, vy = x["stat_value"], y["stat_value"]
+        same_value = vx == vy or (vx != vx and vy != vy)
+        if not same_value or {**x, "stat_value": 0} != {**y, "stat_value": 0}:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=360)
+    parser.add_argument("--days", type=int, default=150)
+    parser.add_argument("--stats", type=int, default=10)
+    parser.add_argument("--skip-loop", action="store_true", help="only time the columnar path")
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.teams, args.days, args.stats)
+    aliases = AliasResolver({f"Team {i}": i + 1 for i in range(args.teams)})
+    print(f"Frame: {len(df):,} rows")
+
+    started = time.perf_counter()
+    fast = build_rows(df, aliases)
+    fast_s = time.perf_counter() - started
+    print(f"columnar build_rows: {fast_s:8.3f} s  ({len(df) / fast_s:,.0f} rows/s)")
+
+    if args.skip_loop:
+        return
+
+    started = time.perf_counter()
+    slow = build_rows_loop(df, aliases)
+    slow_s = time.perf_counter() - started
+    print(f"iterrows loop:       {slow_s:8.3f} s  ({len(df) / slow_s:,.0f} rows/s)")
+    print(f"speedup: {slow_s / fast_s:.1f}x")
+
+    if not records_equal(fast, slow):
+        raise SystemExit("MISMATCH: columnar output differs from the iterrows loop")
+    print(f"parity: {len(fast):,} identical records")
+
+
+if __name__ == "__main__":
+    main()
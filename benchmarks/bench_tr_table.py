@@ -0,0 +1,106 @@
+#%%
+#======================================================================================
+#          BENCHMARK + PARITY: TeamRankings stat table extraction per page
+#======================================================================================
+"""
+Time `tr_table.extract_stat_table` (plus the small frame `fetch_stat_table`
+builds from it) against the `pd.read_html(...)[0]` path it replaced, page by
+page, and check that both give the same stat column, teams and, through
+`build_rows`, the same uploaded values.
+
+Uses saved pages (a directory of .html files or a page cache holding
+TeamRankings stat URLs) when given, synthetic ones otherwise.
+
+    python benchmarks/bench_tr_table.py --pages 40
+    python benchmarks/bench_tr_table.py --pages-dir ~/.cache/cbb-pages
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TR_Upload import build_rows  # noqa: E402
+from lookups import AliasResolver  # noqa: E402
+from tr_pages import load_pages, synthetic_pages  # noqa: E402
+from tr_table import extract_stat_table  # noqa: E402
+
+
+def read_html_table(html):
+    """The original extraction, kept as the parity reference."""
+    df = pd.read_html(BytesIO(html))[0]
+    stat_col = df.columns[2]
+    ret_df = df[['Team', stat_col]].copy()
+    ret_df.rename(columns={stat_col: 'value'}, inplace=True)
+    return stat_col, ret_df
+
+
+def targeted_table(html):
+    table = extract_stat_table(html)
+    return table.stat_col, pd.DataFrame({'Team': table.teams, 'value': table.values})
+
+
+def time_per_page(fn, pages, repeat):
+    times = []
+    for _, html in pages:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(html)
+            best = min(best, time.perf_counter() - started)
+        times.append(best)
+    return times
+
+
+def uploaded_values(df, aliases):
+    df = df.assign(date="2025-01-15", stat="s")
+    return [(r["team_id"], r["stat_value"]) for r in build_rows(df, aliases)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40, help="synthetic pages when --pages-dir is not given")
+    parser.add_argument("--pages-dir")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N per page")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir) if args.pages_dir else list(synthetic_pages(args.pages))
+    if not pages:
+        raise SystemExit("No pages found")
+    print(f"{len(pages)} pages, median {statistics.median(len(html) for _, html in pages) / 1024:.0f} KiB")
+
+    mismatches = 0
+    for name, html in pages:
+        old_col, old = read_html_table(html)
+        new_col, new = targeted_table(html)
+        aliases = AliasResolver({team: i for i, team in enumerate(old['Team'].astype(str))})
+        if (
+            str(old_col) != new_col
+            or old['Team'].astype(str).tolist() != new['Team'].tolist()
+            or uploaded_values(old, aliases) != uploaded_values(new, aliases)
+        ):
+            mismatches += 1
+            print(f"MISMATCH: {name}")
+
+    old_times = time_per_page(read_html_table, pages, args.repeat)
+    new_times = time_per_page(targeted_table, pages, args.repeat)
+    for label, times in (("pd.read_html", old_times), ("extract_stat_table", new_times)):
+        print(
+            f"{label:>18}: median {statistics.median(times) * 1e3:7.2f} ms/page, "
+            f"max {max(times) * 1e3:7.2f} ms, {len(times) / sum(times):7.1f} pages/s"
+        )
+    print(f"speedup: {sum(old_times) / sum(new_times):.1f}x")
+
+    if mismatches:
+        raise SystemExit(f"{mismatches} page(s) differ")
+    print(f"parity: {len(pages)} pages identical")
+
+
+if __name__ == "__main__":
+    main()
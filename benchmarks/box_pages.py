@@ -0,0 +1,98 @@
+#%%
+#======================================================================================
+#                       SYNTHETIC KENPOM BOX PAGES FOR BENCHMARKS
+#======================================================================================
+"""
+Generate KenPom box score pages (linescore table plus the player tables around
+it) for benchmarks and parity checks when no saved pages are at hand, and load
+saved pages from a directory or page cache.
+
+    python benchmarks/box_pages.py OUT_DIR --pages 60
+"""
+
+import argparse
+import os
+import random
+import sys
+from typing import Iterator, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fanmatch_pages import TEAMS  # noqa: E402
+
+
+def _player_table(rng: random.Random, team: str) -> str:
+    head = "".join(f"<th>{c}</th>" for c in ["Player", "Min", "Pts", "FGM-A", "3PM-A", "FTM-A", "Reb", "Ast"])
+    rows = "".join(
+        f'<tr><td><a href="player.php?p={rng.randint(1, 9999)}">Player {rng.randint(1, 999)}</a></td>'
+        f"<td>{rng.randint(0, 40)}</td><td>{rng.randint(0, 30)}</td><td>{rng.randint(0, 9)}-{rng.randint(9, 18)}</td>"
+        f"<td>{rng.randint(0, 4)}-{rng.randint(4, 9)}</td><td>{rng.randint(0, 6)}-{rng.randint(6, 9)}</td>"
+        f"<td>{rng.randint(0, 12)}</td><td>{rng.randint(0, 8)}</td></tr>"
+        for _ in range(rng.randint(8, 12))
+    )
+    return f'<table class="box-table"><caption>{team}</caption><thead><tr>{head}</tr></thead><tbody>{rows}</tbody></table>'
+
+
+def synthetic_box_page(team1: str, team2: str, seed: int = 0, n_ot: int = 0) -> bytes:
+    """A box page for team1 at team2 with `n_ot` overtime periods in the linescore."""
+    rng = random.Random(seed)
+    periods = ["Q1", "Q2", "Q3", "Q4"] + (["OT"] if n_ot == 1 else [f"OT{i}" for i in range(1, n_ot + 1)])
+    head = "<th></th>" + "".join(f"<th>{p}</th>" for p in periods) + "<th>T</th>"
+    rows = []
+    for team in (team1, team2):
+        scores = [rng.randint(10, 25) for _ in range(4)] + [rng.randint(2, 14) for _ in range(n_ot)]
+        cells = "".join(f"<td>{s}</td>" for s in scores)
+        rows.append(f'<tr><td><a href="team.php?team={team}">{team}</a></td>{cells}<td>{sum(scores)}</td></tr>')
+    linescore = (
+        f'<table id="linescore-table2"><thead><tr>{head}</tr></thead>'
+        f"<tbody>{''.join(rows)}</tbody></table>"
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Box score</title>'
+        "<script>var kp = {page: 'box'};</script></head><body>"
+        '<div id="header"><span class="login">Logged in as someone@example.com</span></div>'
+        f'<div id="content-header"><h2>{team1} at {team2}</h2></div>'
+        f"{linescore}{_player_table(rng, team1)}{_player_table(rng, team2)}"
+        "</body></html>"
+    ).encode("utf-8")
+
+
+def load_pages(path: str) -> List[Tuple[str, bytes]]:
+    """Load saved pages from a directory of .html files or a page_cache directory."""
+    if os.path.exists(os.path.join(path, "index.jsonl")):
+        from page_cache import PageCache
+
+        cache = PageCache(path, mode="replay")
+        return [(url, cache.get(url)) for url in cache.urls() if "box.php" in url]
+
+    pages = []
+    for name in sorted(os.listdir(path)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(path, name), "rb") as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def synthetic_pages(n_pages: int) -> Iterator[Tuple[str, bytes]]:
+    for i in range(n_pages):
+        rng = random.Random(i)
+        t1, t2 = rng.sample(TEAMS, 2)
+        n_ot = 0 if i % 10 else 1 + (i // 10) % 3
+        yield f"box-{i:03d}", synthetic_box_page(t1, t2, seed=i, n_ot=n_ot)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--pages", type=int, default=60)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for name, html in synthetic_pages(args.pages):
+        with open(os.path.join(args.out_dir, f"{name}.html"), "wb") as f:
+            f.write(html)
+    print(f"Wrote {args.pages} pages to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#%%
+#======================================================================================
+#                       SYNTHETIC FANMATCH PAGES FOR BENCHMARKS
+#======================================================================================
+"""
+Generate FanMatch-shaped HTML pages for benchmarks and parity checks when no
+saved pages are at hand, and load saved pages from a directory or page cache.
+
+    python benchmarks/fanmatch_pages.py OUT_DIR --pages 150 --games 60
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEAMS = [
+    "Duke", "North Carolina", "Kansas", "Iowa St.", "Houston", "Texas A&M",
+    "St. John's", "Saint Mary's", "Michigan St.", "UConn", "Gonzaga", "Purdue",
+    "Miami FL", "Loyola Chicago", "Texas A&M Corpus Chris", "UC Santa Barbara",
+    "Mount St. Mary's", "Florida Atlantic", "VCU", "Arkansas Pine Bluff",
+]
+CONFERENCES = ["ACC", "B12", "SEC", "BE", "WCC", "B10", "A10", "MVC", "Horz", "SWAC"]
+NETWORKS = ["ESPN", "ESPN2", "FS1", "CBS", "ESPN+", "BTN", "SECN", "Peacock"]
+ARENAS = [
+    ("Durham", "NC", "Cameron Indoor Stadium"),
+    ("Lawrence", "KS", "Allen Fieldhouse"),
+    ("Ames", "IA", "Hilton Coliseum"),
+    ("Houston", "TX", "Fertitta Center"),
+    ("New York", "NY", "Madison Square Garden"),
+    ("Spokane", "WA", "McCarthey Athletic Center"),
+]
+TOURNAMENTS = ["ACC-T", "B12-T", "NCAA"]
+
+
+def _rank(rng):
+    return "NR" if rng.random() < 0.05 else str(rng.randint(1, 364))
+
+
+def _game_row(rng: random.Random, completed: bool, malformed: bool) -> str:
+    t1, t2 = rng.sample(TEAMS, 2)
+    r1, r2 = _rank(rng), _rank(rng)
+    sep = rng.choice([" at ", " vs. "])
+    conf = rng.choice(CONFERENCES)
+    city, state, arena = rng.choice(ARENAS)
+
+    if completed:
+        s1, s2 = rng.randint(50, 100), rng.randint(50, 100)
+        if s1 == s2:
+            s2 += 1
+        ot = " (OT)" if rng.random() < 0.08 else ""
+        tourney = f" {rng.choice(TOURNAMENTS)}" if rng.random() < 0.1 else ""
+        game = (
+            f'<span class="seed-gray">{r1}</span> <a href="team.php?team={t1}">{t1}</a> {s1}, '
+            f'<span class="seed-gray">{r2}</span> <a href="team.php?team={t2}">{t2}</a> {s2}{ot} '
+            f'[{rng.randint(60, 78)}] <span style="color:#f768a1">{conf}</span> '
+            f'<span class="mvp">MVP: Player {rng.randint(1, 999)}</span>{tourney}'
+        )
+        time_cell = f'<a href="box.php?g={rng.randint(1000, 9999)}">box</a>'
+    else:
+        game = (
+            f'<span class="seed-gray">{r1}</span> <a href="team.php?team={t1}">{t1}</a>{sep}'
+            f'<span class="seed-gray">{r2}</span> <a href="team.php?team={t2}">{t2}</a> '
+            f'<span style="color:#f768a1">{conf}</span>'
+        )
+        network = rng.choice(NETWORKS)
+        net = (
+            f'<span class="seed-gray-block"><a href="#">{network}</a></span>'
+            if rng.random() < 0.5 else f'<span class="seed-gray-block">{network}</span>'
+        )
+        time_cell = f"{rng.randint(1, 11)}:{rng.choice(['00', '30'])} pm {net}"
+
+    winner = rng.choice([t1, t2])
+    hi = rng.randint(60, 90)
+    prediction = f"{winner} {hi}-{hi - rng.randint(1, 20)} ({rng.randint(51, 99)}%) [{rng.randint(60, 78)}]"
+    location = (
+        f'{city}, {state} <a href="arena.php?a={arena}"><span class="win-prob-link">{arena}</span></a>'
+    )
+    thrill = f'{rng.uniform(20, 90):.1f} <span class="seed-gray-block">{rng.randint(1, 60)}</span>'
+
+    cells = [game, prediction, time_cell, location, thrill]
+    if completed:
+        cells.append(f'{rng.uniform(0, 10):.1f} <span class="win-prob-link">·{rng.randint(1, 60)}·</span>')
+        cells.append(f'{rng.uniform(0, 10):.1f} <span class="win-prob-link">·{rng.randint(1, 60)}·</span>')
+
+    if malformed:
+        # Mirrors the missing </td> the FanMatch parser docstring warns about
+        tds = "".join(f"<td>{c}" if i == 2 else f"<td>{c}</td>" for i, c in enumerate(cells))
+    else:
+        tds = "".join(f"<td>{c}</td>" for c in cells)
+    return f"<tr>{tds}</tr>"
+
+
+def synthetic_fanmatch_page(
+    n_games: int = 60,
+    seed: int = 0,
+    day: Optional[date] = None,
+    completed: bool = True,
+    malformed_rate: float = 0.0,
+) -> str:
+    """Build one FanMatch page with `n_games` rows, lines of the night and summary stats."""
+    rng = random.Random(seed)
+    day = day or date(2025, 2, 1) + timedelta(days=seed)
+    suffix = {1: "st", 2: "nd", 3: "rd"}.get(day.day % 10 if day.day not in (11, 12, 13) else 0, "th")
+    header = f"FanMatch for {day.strftime('%A')}, {day.strftime('%B')} {day.day}{suffix}"
+
+    rows = [_game_row(rng, completed, rng.random() < malformed_rate) for _ in range(n_games)]
+    if completed:
+        rows.append('<tr><td colspan="7"><b>Lines of the night</b></td></tr>')
+        for i in range(3):
+            rows.append(f'<tr><td colspan="7">• Line {i}: {rng.choice(TEAMS)} "{rng.randint(1, 99)} points"</td></tr>')
+        rows.append(f'<tr><td colspan="7">Points per game: {rng.uniform(130, 150):.1f}</td></tr>')
+
+    summary = ""
+    if completed:
+        summary = (
+            '<div id="fm-summary">'
+            f"<p>Points per game: {rng.uniform(130, 150):.1f}<br>"
+            f"Average efficiency: {rng.uniform(98, 110):.1f}<br>"
+            f"Possessions per 40 minutes: {rng.uniform(64, 72):.1f}</p>"
+            f"<p>Mean absolute error of predicted total score: {rng.uniform(10, 16):.1f}<br>"
+            f"Bias of predicted total score: {rng.uniform(-3, 3):.1f}<br>"
+            f"Mean absolute error of predicted margin of victory: {rng.uniform(7, 11):.1f}</p>"
+            f"<p>Record of favorites today: {n_games - 15}-15 (expected: {n_games - 14}-14)<br>"
+            f"Exact MOV predictions: {rng.randint(0, 5)} of {n_games}</p>"
+            "</div>"
+        )
+
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>FanMatch</title>"
+        "<script>var kp = {page: 'fanmatch'};</script></head><body>"
+        f'<div id="content-header"><div class="lh12">{header} (<a href="#">Predictions</a>)</div></div>'
+        '<table id="fanmatch-table"><thead><tr><th>Game</th><th>Prediction</th><th>Time (ET)</th>'
+        "<th>Location</th><th>ThrillScore</th><th>Comeback</th><th>Excitement</th></tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table>{summary}"
+        "</body></html>"
+    )
+
+
+def load_pages(path: str) -> List[Tuple[str, bytes]]:
+    """Load saved pages from a directory of .html files or a page_cache directory."""
+    if os.path.exists(os.path.join(path, "index.jsonl")):
+        from page_cache import PageCache
+
+        cache = PageCache(path, mode="replay")
+        return [(url, cache.get(url)) for url in cache.urls() if "fanmatch.php" in url]
+
+    pages = []
+    for name in sorted(os.listdir(path)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(path, name), "rb") as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def synthetic_pages(n_pages: int, n_games: int, malformed_rate: float = 0.0) -> Iterator[Tuple[str, bytes]]:
+    for i in range(n_pages):
+        yield f"synthetic-{i:03d}", synthetic_fanmatch_page(
+            n_games, seed=i, completed=i % 5 != 4, malformed_rate=malformed_rate
+        ).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--pages", type=int, default=150)
+    parser.add_argument("--games", type=int, default=60)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for name, html in synthetic_pages(args.pages, args.games, args.malformed_rate):
+        with open(os.path.join(args.out_dir, f"{name}.html"), "wb") as f:
+            f.write(html)
+    print(f"Wrote {args.pages} pages to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#%%
+#======================================================================================
+#                   PROFILE: time spent per FanMatch regex pattern
+#======================================================================================
+"""
+Parse a season of FanMatch pages with every compiled pattern in `FanMatch._RE`
+(and the summary scan patterns) wrapped in a timer, then report calls and
+time per pattern and its share of the total parse time.
+
+Every call is also recorded and replayed two ways: through the `re` module
+functions with the raw `_PATTERNS` string (how the parser used to call them)
+and through the compiled registry. The replay checks that both give the same
+result, which covers the tightened rewrites in `_TIGHT_PATTERNS`.
+
+    python benchmarks/profile_fanmatch_patterns.py                # synthetic season
+    python benchmarks/profile_fanmatch_patterns.py --pages DIR    # saved .html files or a page cache
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FanMatch import FanMatch  # noqa: E402
+from fanmatch_pages import load_pages, synthetic_pages  # noqa: E402
+
+
+class TimedPattern:
+    """Stands in for a compiled pattern, timing and recording every call."""
+
+    def __init__(self, key, pattern, stats, calls):
+        self.key = key
+        self.pattern = pattern
+        self.stats = stats
+        self.calls = calls
+
+    def _add(self, seconds):
+        entry = self.stats[self.key]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def _call(self, method, *args):
+        self.calls[self.key].append((method, args))
+        started = time.perf_counter()
+        result = getattr(self.pattern, method)(*args)
+        self._add(time.perf_counter() - started)
+        return result
+
+    def search(self, *args):
+        return self._call("search", *args)
+
+    def match(self, *args):
+        return self._call("match", *args)
+
+    def sub(self, *args):
+        return self._call("sub", *args)
+
+    def finditer(self, *args):
+        # Timed per item, so callers that stop early are measured as such
+        iterator = self.pattern.finditer(*args)
+        seconds = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    match = next(iterator)
+                finally:
+                    seconds += time.perf_counter() - started
+                yield match
+        except StopIteration:
+            return
+        finally:
+            self._add(seconds)
+
+    def __getattr__(self, name):
+        return getattr(self.pattern, name)
+
+
+def profile(pages, engine):
+    stats = defaultdict(lambda: [0, 0.0])
+    calls = defaultdict(list)
+    saved = FanMatch._RE, FanMatch._SUMMARY_START, FanMatch._SUMMARY_SCAN
+    FanMatch._RE = {key: TimedPattern(key, p, stats, calls) for key, p in saved[0].items()}
+    FanMatch._SUMMARY_START = TimedPattern("summary_start", saved[1], stats, calls)
+    FanMatch._SUMMARY_SCAN = TimedPattern("summary_scan", saved[2], stats, calls)
+    try:
+        started = time.perf_counter()
+        for _, html in pages:
+            FanMatch(None, html_content=html, engine=engine)
+        total = time.perf_counter() - started
+    finally:
+        FanMatch._RE, FanMatch._SUMMARY_START, FanMatch._SUMMARY_SCAN = saved
+    return stats, calls, total
+
+
+def _same(a, b):
+    if isinstance(a, re.Match) and isinstance(b, re.Match):
+        return a.span() == b.span() and a.groups() == b.groups()
+    return a == b
+
+
+def replay(key, recorded):
+    """Seconds for the recorded calls via re.<method>(raw, ...) and via the registry, and parity."""
+    raw = FanMatch._PATTERNS[key]
+    flags = FanMatch._PATTERN_FLAGS.get(key, 0)
+    compiled = FanMatch._RE[key]
+
+    def module_call(method, args):
+        if method == "sub":
+            return re.sub(raw, *args, flags=flags)
+        return getattr(re, method)(raw, *args, flags=flags)
+
+    started = time.perf_counter()
+    old = [module_call(method, args) for method, args in recorded]
+    old_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    new = [getattr(compiled, method)(*args) for method, args in recorded]
+    new_s = time.perf_counter() - started
+
+    return old_s, new_s, all(_same(a, b) for a, b in zip(old, new))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="directory of saved FanMatch pages or a page cache")
+    parser.add_argument("--synthetic", type=int, default=150, help="synthetic pages when --pages is not given")
+    parser.add_argument("--games", type=int, default=60, help="games per synthetic page")
+    parser.add_argument("--engine", default="bs4", choices=FanMatch._ENGINES)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = list(synthetic_pages(args.synthetic, args.games))
+
+    stats, calls, total = profile(pages, args.engine)
+    regex_total = sum(seconds for _, seconds in stats.values())
+    print(
+        f"{len(pages)} pages, {args.engine}: parse {total:.3f} s, "
+        f"regex {regex_total:.3f} s ({100 * regex_total / total:.1f}%)\n"
+    )
+    print(f"{'pattern':<18}{'calls':>9}{'total ms':>11}{'us/call':>9}{'% parse':>9}"
+          f"{'re.fn us':>10}{'_RE us':>8}  tight  parity")
+
+    mismatches = 0
+    for key, (n, seconds) in sorted(stats.items(), key=lambda item: -item[1][1]):
+        line = f"{key:<18}{n:>9}{seconds * 1e3:>11.2f}{seconds / n * 1e6:>9.2f}{100 * seconds / total:>9.2f}"
+        if key in FanMatch._PATTERNS:
+            old_s, new_s, same = replay(key, calls[key])
+            mismatches += not same
+            tight = "yes" if FanMatch._RE[key].pattern != FanMatch._PATTERNS[key] else ""
+            line += (
+                f"{old_s / len(calls[key]) * 1e6:>10.2f}{new_s / len(calls[key]) * 1e6:>8.2f}"
+                f"  {tight:<5}  {'ok' if same else 'MISMATCH'}"
+            )
+        print(line)
+
+    if mismatches:
+        raise SystemExit(f"{mismatches} pattern(s) differ from their raw form")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#%%
+#======================================================================================
+#            SIMULATION: AdaptivePacer against a simulated server clock
+#======================================================================================
+"""
+Drive `rate_limit.AdaptivePacer` with a simulated clock (nothing really
+sleeps). A simulated server answers 429 once more than `--capacity`
+requests started in the last second. It answers 503 throughout an outage
+window, and its latency grows with load.
+
+Checks that the pacer:
+- speeds up from its start rate while the server is healthy;
+- never exceeds the host budget;
+- backs off exponentially (with jitter, within bounds) through the outage;
+- recovers afterwards;
+- keeps hosts independent.
+
+Also compares the requests completed with the old fixed 3 s sleep.
+
+    python benchmarks/sim_pacer.py --minutes 10 --capacity 3 --budget 4
+"""
+
+import argparse
+import os
+import random
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limit import AdaptivePacer  # noqa: E402
+
+HOST = "https://www.teamrankings.com/ncaa-basketball/stat/x"
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += max(0.0, seconds)
+
+
+class SimServer:
+    """Rate-limited server: 429 past `capacity` starts per second, 503 during the outage."""
+
+    def __init__(self, capacity, base_latency, outage):
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self.outage = outage
+        self.starts = deque()
+
+    def handle(self, now):
+        while self.starts and self.starts[0] <= now - 1.0:
+            self.starts.popleft()
+        self.starts.append(now)
+        load = len(self.starts)
+        if self.outage[0] <= now < self.outage[1]:
+            return 503, self.base_latency
+        if load > self.capacity:
+            return 429, self.base_latency
+        return 200, self.base_latency * (1 + load / self.capacity)
+
+
+def simulate(pacer, clock, server, seconds):
+    """One client thread fetching back to back. Returns (start, status, pause) per request."""
+    log = []
+    while clock.now < seconds:
+        pacer.acquire(HOST)
+        start = clock.now
+        status, latency = server.handle(start)
+        clock.now += latency
+        pause = pacer.record(HOST, latency, status)
+        log.append((start, status, pause))
+    return log
+
+
+def max_in_window(starts, window=1.0):
+    best, lo = 0, 0
+    for hi, t in enumerate(starts):
+        while starts[lo] <= t - window:
+            lo += 1
+        best = max(best, hi - lo + 1)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--capacity", type=int, default=3, help="requests per second the server accepts")
+    parser.add_argument("--budget", type=float, default=4.0, help="host budget, requests per second")
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--outage", type=float, nargs=2, default=[200.0, 320.0], help="503 window, seconds")
+    args = parser.parse_args()
+
+    seconds = args.minutes * 60
+    clock = SimClock()
+    pacer = AdaptivePacer(
+        budgets={"www.teamrankings.com": args.budget},
+        clock=clock, sleep=clock.sleep, random=random.Random(0).random,
+    )
+    server = SimServer(args.capacity, args.latency, args.outage)
+    log = simulate(pacer, clock, server, seconds)
+
+    starts = [t for t, _, _ in log]
+    ok = sum(1 for _, status, _ in log if status == 200)
+    throttled = sum(1 for _, status, _ in log if status == 429)
+    failed = sum(1 for _, status, _ in log if status == 503)
+    fixed = int(seconds // (3 + args.latency))
+    print(f"simulated {seconds:.0f} s: {len(log)} requests, {ok} ok, {throttled} x 429, {failed} x 503")
+    print(f"fixed 3 s sleep would complete {fixed} requests ({ok / fixed:.1f}x fewer)")
+
+    problems = []
+
+    # Ramp-up: the first 429 only comes once the pacer has sped past its start rate
+    first_throttle = next((t for t, status, _ in log if status == 429), None)
+    healthy_before = [t for t in starts if first_throttle is None or t < first_throttle]
+    ramp_rate = len([t for t in healthy_before if t >= healthy_before[-1] - 10]) / 10
+    print(f"ramp-up: start rate {pacer.start_rate}/s, {ramp_rate:.1f}/s before the first 429 "
+          f"at {first_throttle:.1f} s")
+    if ramp_rate <= pacer.start_rate:
+        problems.append("did not speed up while healthy")
+
+    # Budget: spacing never falls under 1 / budget
+    peak = max_in_window(starts)
+    print(f"budget: at most {peak} starts in any 1 s window (budget {args.budget}/s)")
+    if peak > int(args.budget) + 1:
+        problems.append(f"{peak} starts in one second exceeds the budget")
+
+    # Outage: consecutive pauses grow exponentially, with jitter between half and all of the step
+    outage = [(t, pause) for t, status, pause in log if status == 503]
+    pauses = [pause for _, pause in outage]
+    print("outage pauses (s): " + ", ".join(f"{p:.1f}" for p in pauses))
+    for i, pause in enumerate(pauses):
+        step = min(pacer.max_backoff, pacer.backoff * 2 ** i)
+        if not 0.5 * step <= pause <= step:
+            problems.append(f"outage pause {i} of {pause:.2f} s outside [{0.5 * step:.2f}, {step:.2f}]")
+    if outage and len(outage) > 12:
+        problems.append(f"{len(outage)} requests hit the outage; backoff is not slowing down")
+
+    # Recovery: back to most of the capacity within two minutes of the outage ending
+    end = args.outage[1]
+    recovered = [t for t, status, _ in log if status == 200 and end + 120 <= t < end + 180]
+    recovery_rate = len(recovered) / 60
+    print(f"recovery: {recovery_rate:.1f} ok/s, 2-3 min after the outage (capacity {args.capacity}/s)")
+    if recovery_rate < 0.5 * args.capacity:
+        problems.append("throughput did not recover after the outage")
+
+    # Hosts are independent: a backoff on one leaves the other untouched
+    other = "https://kenpom.com/fanmatch.php"
+    pacer.record(HOST, None, 503)
+    before = clock.now
+    waited = pacer.acquire(other)
+    if waited > 0 or clock.now != before:
+        problems.append("a backoff on one host delayed another")
+    print(f"hosts: {pacer.stats()}")
+
+    if problems:
+        raise SystemExit("; ".join(problems))
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+#%%
+#======================================================================================
+#           BENCHMARK SUITE: every parser and transform against stored baselines
+#======================================================================================
+"""
+Run each parser and loader transform over a page corpus and season-scale
+frames. For each stage, report:
+- throughput in pages/s and rows/s (best of `--repeat` timed samples, each
+  at least 0.2 s of back-to-back runs);
+- peak traced memory (tracemalloc, in a separate untimed run).
+
+Results are compared with the baselines stored in `baselines.json` under the
+corpus label. A stage regresses when its throughput falls, or its peak
+memory grows, by more than `--tolerance`. The suite then exits non-zero.
+
+Timings on a shared host can drift by tens of percent between runs. A run
+that flags a stage is worth repeating, with a higher `--repeat`, before
+you look for a cause.
+
+Stages:
+    fanmatch.parse           FanMatch pages -> typed frame (FanMatch._parse_game_row and friends)
+    fanmatch.season_df       a season of FanMatch pages -> one frame
+    fanmatch.build_game_rows typed day frames -> games rows (Kenpom_FanMatch)
+    spread                   season of win probabilities -> spreads
+    box.parse_linescore      box pages -> half and OT scores (BoxScore.parse_box_score)
+    box.upload_date          a season of box rows -> GameIndex matches -> games upserts
+    tr.extract_stat_table    TeamRankings pages -> team and value cells
+    tr.fetch_stat_table      TRScraper.fetch_stat_table over a replaying client
+    tr.build_rows            a season scrape frame -> tr_team_daily_stats rows
+
+Pages come from saved pages when given: a page_cache directory with `--pages`
+(each source is picked out by URL), or a page_cache or `.html` directory per
+source. Sources without saved pages use synthetic ones. The season-scale
+stages always use synthetic data.
+
+Baselines are specific to the machine. Save them again with `--save` after
+moving to another machine, or after a change that is meant to shift them.
+
+    python benchmarks/suite.py                      # compare with the stored baselines
+    python benchmarks/suite.py --only tr box        # stages starting with tr or box
+    python benchmarks/suite.py --pages .page_cache  # recorded pages, own baselines
+    python benchmarks/suite.py --save               # store the numbers as the new baselines
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import box_pages  # noqa: E402
+import fanmatch_pages  # noqa: E402
+import tr_pages  # noqa: E402
+from bench_fanmatch_season import season_pages  # noqa: E402
+from bench_game_index import synthetic_games  # noqa: E402
+from bench_spread import synthetic_frame as spread_frame  # noqa: E402
+from bench_tr_rows import synthetic_frame as tr_frame  # noqa: E402
+from box import BoxScore  # noqa: E402
+from FanMatch import FanMatch  # noqa: E402
+from Kenpom_FanMatch import build_game_rows, clean_team_name  # noqa: E402
+from lookups import AliasResolver, ArenaIndex, GameIndex  # noqa: E402
+from spread import spread_from_win_probability  # noqa: E402
+from tr_table import extract_stat_table  # noqa: E402
+from TR_Upload import TRScraper, build_rows  # noqa: E402
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+MIB = 1024 * 1024
+# Peaks this close to the baseline are never a regression, whatever the tolerance
+PEAK_SLACK_MIB = 0.5
+# Each timed sample repeats the stage until it has run this long, so stages that
+# take microseconds (spread) are timed over many runs instead of timer noise
+MIN_SAMPLE_SECONDS = 0.2
+DAY = "2025-01-15"
+
+Pages = List[Tuple[str, bytes]]
+
+
+class Stage(NamedTuple):
+    """A benchmark stage: `run()` does the work once and returns (pages, rows) handled."""
+    name: str
+    run: Callable[[], Tuple[int, int]]
+
+
+class _NullSupabase:
+    """Accepts every write and does nothing, so only the loader's own work is timed."""
+
+    def table(self, name):
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        return self
+
+    def update(self, row):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        return None
+
+
+class _ReplayClient:
+    """Stands in for `HttpClient`: answers every GET with the next page of the corpus."""
+
+    def __init__(self, pages: Pages):
+        self.pages = [html for _, html in pages]
+        self.i = 0
+
+    def get(self, url: str) -> bytes:
+        html = self.pages[self.i % len(self.pages)]
+        self.i += 1
+        return html
+
+
+#%%
+#Corpus
+def _pages(path: Optional[str], loader, synthetic, what: str) -> Tuple[Pages, bool]:
+    if path:
+        pages = loader(path)
+        if pages:
+            return pages, True
+        print(f"No {what} pages under {path}, using synthetic ones")
+    return list(synthetic()), False
+
+
+def fanmatch_stages(pages: Pages, season_days: int, games: int) -> List[Stage]:
+    frames = [FanMatch(None, html_content=html, typed=True).fm_df for _, html in pages]
+    frames = [df for df in frames if df is not None]
+    names = set()
+    for df in frames:
+        for col in ("Winner", "Loser", "PredictedWinner", "PredictedLoser"):
+            names.update(clean_team_name(n) for n in df[col].dropna())
+    teams = AliasResolver({name: i for i, name in enumerate(sorted(names), start=1)})
+    arenas = ArenaIndex(
+        {"arena_id": i, "arena_name": arena, "team_id": None}
+        for i, (_, _, arena) in enumerate(fanmatch_pages.ARENAS, start=1)
+    )
+    season = season_pages(season_days, games)
+    dates = list(season)
+
+    def parse():
+        rows = 0
+        for _, html in pages:
+            df = FanMatch(None, html_content=html, typed=True).fm_df
+            rows += 0 if df is None else len(df)
+        return len(pages), rows
+
+    def season_df():
+        return len(season), len(FanMatch.season_df(None, dates[0], dates[-1], html_pages=season, typed=True))
+
+    def game_rows():
+        # build_game_rows adds a column to the frame it is given
+        return 0, sum(len(build_game_rows(DAY, df.copy(), teams, arenas)) for df in frames)
+
+    return [
+        Stage("fanmatch.parse", parse),
+        Stage("fanmatch.season_df", season_df),
+        Stage("fanmatch.build_game_rows", game_rows),
+    ]
+
+
+def spread_stages(season_days: int, games: int) -> List[Stage]:
+    df = spread_frame(season_days * games)
+
+    def spread():
+        spread_from_win_probability(
+            df["WinProbabilityFraction"], df["PredictedWinnerScore"], df["PredictedLoserScore"]
+        )
+        return 0, len(df)
+
+    return [Stage("spread", spread)]
+
+
+def box_stages(pages: Pages, season_days: int, games: int) -> List[Stage]:
+    rng = random.Random(0)
+    season = synthetic_games(season_days, games)
+    rows_by_date: Dict[str, list] = {}
+    for g in season:
+        t1, t2 = (g["team1_id"], g["team2_id"]) if rng.random() < 0.7 else (g["team2_id"], g["team1_id"])
+        scores = [rng.randint(20, 50) for _ in range(4)]
+        rows_by_date.setdefault(g["game_date"], []).append({
+            "game_date": g["game_date"], "team1_id": t1, "team2_id": t2,
+            "H1_T1 Score": scores[0], "H2_T1 Score": scores[1], "OT_T1 Score": None,
+            "H1_T2 Score": scores[2], "H2_T2 Score": scores[3], "OT_T2 Score": None,
+            "OT Count": 0,
+        })
+    first, last = min(rows_by_date), max(rows_by_date)
+    bs = BoxScore(browser=None, supabase_client=_NullSupabase(), start_date=first, end_date=last)
+
+    def linescore():
+        rows = 0
+        for _, html in pages:
+            parsed, _ = BoxScore.parse_linescore(html)
+            rows += len(parsed or ())
+        return len(pages), rows
+
+    def upload():
+        game_index = GameIndex(season, first, last)
+        written = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for game_date, rows in rows_by_date.items():
+                written += sum(s["written"] for s in bs.upload_date(game_date, rows, game_index))
+        return 0, written
+
+    return [Stage("box.parse_linescore", linescore), Stage("box.upload_date", upload)]
+
+
+def tr_stages(pages: Pages, season_days: int) -> List[Stage]:
+    scraper = TRScraper(DAY, client=_ReplayClient(pages))
+    frame = tr_frame(360, season_days, len(tr_pages.STATS))
+    aliases = AliasResolver({f"Team {i}": i + 1 for i in range(360)})
+
+    def extract():
+        return len(pages), sum(len(extract_stat_table(html).teams) for _, html in pages)
+
+    def scrape():
+        rows = 0
+        for _ in pages:
+            rows += len(scraper.fetch_stat_table("bench-stat", DAY))
+        return len(pages), rows
+
+    def rows():
+        return 0, len(build_rows(frame, aliases))
+
+    return [
+        Stage("tr.extract_stat_table", extract),
+        Stage("tr.fetch_stat_table", scrape),
+        Stage("tr.build_rows", rows),
+    ]
+
+
+#%%
+#Measurement
+def measure(stage: Stage, repeat: int) -> dict:
+    """Peak memory from one traced run, then throughput from the best of `repeat`
+    untraced samples. A sample runs the stage as many times as it takes to
+    last MIN_SAMPLE_SECONDS and counts the mean time per run."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    pages, rows = stage.run()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    best = float("inf")
+    for _ in range(repeat):
+        runs, started = 0, time.perf_counter()
+        while True:
+            stage.run()
+            runs += 1
+            seconds = time.perf_counter() - started
+            if seconds >= MIN_SAMPLE_SECONDS:
+                break
+        best = min(best, seconds / runs)
+
+    return {
+        "seconds": round(best, 6),
+        "pages": pages,
+        "rows": rows,
+        "pages_per_s": round(pages / best, 2) if pages else None,
+        "rows_per_s": round(rows / best, 2) if rows else None,
+        "peak_mib": round(peak / MIB, 3),
+    }
+
+
+def compare(result: dict, baseline: Optional[dict], tolerance: float) -> Tuple[str, bool]:
+    """A short comparison with `baseline`, and whether it is a regression."""
+    if baseline is None:
+        return "no baseline", False
+    key = "rows_per_s" if result["rows_per_s"] else "pages_per_s"
+    notes, regressed = [], False
+    if baseline.get(key):
+        change = result[key] / baseline[key] - 1
+        notes.append(f"{change:+.0%} throughput")
+        if change < -tolerance:
+            regressed = True
+            notes[-1] += " SLOWER"
+    if result["peak_mib"] > baseline["peak_mib"] * (1 + tolerance) + PEAK_SLACK_MIB:
+        regressed = True
+        notes.append(f"peak {baseline['peak_mib']:.1f} -> {result['peak_mib']:.1f} MiB LARGER")
+    return ", ".join(notes), regressed
+
+
+def load_baselines(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(path: str, baselines: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def _rate(value: Optional[float]) -> str:
+    return f"{value:>12,.0f}" if value else f"{'-':>12}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="page_cache directory holding pages of every source")
+    parser.add_argument("--fanmatch-pages", help="FanMatch pages (page_cache or .html directory)")
+    parser.add_argument("--box-pages", help="box score pages (page_cache or .html directory)")
+    parser.add_argument("--tr-pages", help="TeamRankings pages (page_cache or .html directory)")
+    parser.add_argument("--synthetic-pages", type=int, default=50, help="pages per source when none are saved")
+    parser.add_argument("--games", type=int, default=60, help="games per synthetic FanMatch page and season day")
+    parser.add_argument("--season-days", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="run stages whose name starts with one of these")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed throughput drop / peak growth")
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument("--label", help="baseline set to use; default: synthetic, or recorded with saved pages")
+    parser.add_argument("--save", action="store_true", help="store this run as the baselines")
+    args = parser.parse_args()
+
+    def wanted(prefix):
+        return not args.only or any(prefix.startswith(o) or o.startswith(prefix) for o in args.only)
+
+    n = args.synthetic_pages
+    stages, recorded = [], False
+    if wanted("fanmatch"):
+        pages, saved = _pages(args.fanmatch_pages or args.pages, fanmatch_pages.load_pages,
+                              lambda: fanmatch_pages.synthetic_pages(n, args.games), "FanMatch")
+        recorded |= saved
+        stages += fanmatch_stages(pages, args.season_days, args.games)
+    if wanted("spread"):
+        stages += spread_stages(args.season_days, args.games)
+    if wanted("box"):
+        pages, saved = _pages(args.box_pages or args.pages, box_pages.load_pages,
+                              lambda: box_pages.synthetic_pages(n), "box")
+        recorded |= saved
+        stages += box_stages(pages, args.season_days, args.games // 2)
+    if wanted("tr"):
+        pages, saved = _pages(args.tr_pages or args.pages, tr_pages.load_pages,
+                              lambda: tr_pages.synthetic_pages(n), "TeamRankings")
+        recorded |= saved
+        stages += tr_stages(pages, args.season_days)
+    stages = [s for s in stages if not args.only or any(s.name.startswith(o) for o in args.only)]
+
+    label = args.label or ("recorded" if recorded else "synthetic")
+    sizes = {"synthetic_pages": n, "games": args.games, "season_days": args.season_days}
+    baselines = load_baselines(args.baselines)
+    stored = baselines.get(label, {}).get("stages", {})
+    if stored and baselines[label].get("args") != sizes:
+        print(f"Note: baselines {label!r} were saved with {baselines[label].get('args')}, this run uses {sizes}")
+
+    print(f"{'stage':<26} {'pages/s':>12} {'rows/s':>12} {'peak MiB':>9}   vs baseline ({label})")
+    results, regressions = {}, []
+    for stage in stages:
+        result = results[stage.name] = measure(stage, args.repeat)
+        note, regressed = compare(result, stored.get(stage.name), args.tolerance)
+        if regressed:
+            regressions.append(stage.name)
+        print(
+            f"{stage.name:<26} {_rate(result['pages_per_s'])} {_rate(result['rows_per_s'])} "
+            f"{result['peak_mib']:>9.2f}   {note}"
+        )
+
+    if args.save:
+        entry = baselines.setdefault(label, {"stages": {}})
+        entry["stages"].update(results)
+        entry.update({
+            "saved": date.today().isoformat(),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "args": sizes,
+        })
+        save_baselines(args.baselines, baselines)
+        print(f"Saved {len(results)} baselines under {label!r} to {args.baselines}")
+    elif regressions:
+        raise SystemExit(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
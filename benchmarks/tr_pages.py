@@ -0,0 +1,122 @@
+#%%
+#======================================================================================
+#                     SYNTHETIC TEAMRANKINGS PAGES FOR BENCHMARKS
+#======================================================================================
+"""
+Generate TeamRankings stat pages for benchmarks, parity checks and the stub
+server when no saved pages are at hand, and load saved pages from a directory
+or page cache.
+
+Synthetic pages carry the parts of a real stat page that cost parse time: a
+long navigation menu, inline scripts, the ranked stat table, and a second
+(sidebar) table after it.
+
+    python benchmarks/tr_pages.py OUT_DIR --pages 50
+"""
+
+import argparse
+import os
+import random
+import sys
+from typing import Iterator, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEAMS = [f"Team {i:03d}" for i in range(1, 361)] + [
+    "Texas A&amp;M", "St. John's", "Saint Mary's", "Miami (FL)",
+]
+STATS = [
+    "three-point-pct", "two-point-pct", "free-throw-pct", "free-throws-made-per-game", "three-point-rate",
+    "opponent-three-point-pct", "opponent-two-point-pct", "opponent-free-throw-pct",
+    "opponent-free-throws-made-per-game", "opponent-three-point-rate",
+]
+
+
+def _chrome(rng: random.Random) -> Tuple[str, str]:
+    nav = "".join(
+        f'<li class="menu-item"><a href="/ncaa-basketball/stat/{stat}-{i}">{stat.replace("-", " ").title()} {i}</a></li>'
+        for i in range(40) for stat in STATS
+    )
+    scripts = "".join(
+        f"<script>window.tr_ads = window.tr_ads || []; tr_ads.push({{slot: 'slot-{i}', size: [300, 250], "
+        f"seed: {rng.random():.12f}}});</script>"
+        for i in range(60)
+    )
+    header = f'<div id="header"><ul class="nav">{nav}</ul></div>{scripts}'
+    sidebar = (
+        '<div class="sidebar"><h3>Related Stats</h3><table class="tr-table"><thead><tr><th>Stat</th><th>Leader</th>'
+        "</tr></thead><tbody>"
+        + "".join(
+            f'<tr><td><a href="/ncaa-basketball/stat/{stat}">{stat}</a></td><td>{rng.choice(TEAMS)}</td></tr>'
+            for stat in STATS
+        )
+        + "</tbody></table></div>"
+    )
+    return header, sidebar
+
+
+def synthetic_tr_page(stat: str, date: str, n_teams: int = len(TEAMS)) -> bytes:
+    """A TeamRankings stat page: a ranked table of Team / season value / recent values."""
+    rng = random.Random(f"{stat}|{date}")
+    rows = []
+    for rank, team in enumerate(TEAMS[:n_teams], start=1):
+        value = f"{rng.uniform(20, 60):.1f}%" if stat.endswith("pct") else f"{rng.uniform(0, 90):.1f}"
+        missing = rng.random() < 0.01
+        rows.append(
+            f'<tr>\n  <td class="rank">{rank}</td>\n'
+            f'  <td class="text-left nowrap" data-sort="{team}"><a href="/ncaa-basketball/team/{rank}">{team}</a></td>\n'
+            f'  <td class="text-right" data-sort="{value}">{"--" if missing else value}</td>\n'
+            f'  <td class="text-right">{rng.uniform(0, 90):.1f}</td>\n'
+            f'  <td class="text-right">{rng.uniform(0, 90):.1f}</td>\n</tr>\n'
+        )
+    season = int(date[:4]) + (1 if int(date[5:7]) >= 7 else 0)
+    header, sidebar = _chrome(rng)
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>NCAA Basketball Stats</title>'
+        "<script>var tr = {};</script></head><body>"
+        f"{header}<h1>NCAA Basketball Team {stat} on {date}</h1>"
+        '<table class="tr-table datatable scrollable"><thead><tr>'
+        f'<th>Rank</th><th>Team</th><th>{season - 1}-{season}</th><th>Last 3</th><th>Last 1</th>'
+        f"</tr></thead><tbody>{''.join(rows)}</tbody></table>{sidebar}"
+        '<div id="footer">&copy; TeamRankings.com</div></body></html>'
+    ).encode("utf-8")
+
+
+def load_pages(path: str) -> List[Tuple[str, bytes]]:
+    """Load saved pages from a directory of .html files or a page_cache directory."""
+    if os.path.exists(os.path.join(path, "index.jsonl")):
+        from page_cache import PageCache
+
+        cache = PageCache(path, mode="replay")
+        return [(url, cache.get(url)) for url in cache.urls() if "/ncaa-basketball/stat/" in url]
+
+    pages = []
+    for name in sorted(os.listdir(path)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(path, name), "rb") as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def synthetic_pages(n_pages: int) -> Iterator[Tuple[str, bytes]]:
+    for i in range(n_pages):
+        stat = STATS[i % len(STATS)]
+        date = f"2025-{1 + (i // 28) % 12:02d}-{1 + i % 28:02d}"
+        yield f"{stat}_{date}", synthetic_tr_page(stat, date)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for name, html in synthetic_pages(args.pages):
+        with open(os.path.join(args.out_dir, f"{name}.html"), "wb") as f:
+            f.write(html)
+    print(f"Wrote {args.pages} pages to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
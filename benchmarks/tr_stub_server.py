@@ -0,0 +1,200 @@
+#%%
+#======================================================================================
+#               LOCAL TEAMRANKINGS STUB SERVER + HTTP CLIENT CHECK
+#======================================================================================
+"""
+A local HTTP/1.1 server that serves TeamRankings-shaped stat pages, gzips them
+when asked, counts connections and requests, and can fail the first requests
+for each page with 429/503 to exercise retries.
+
+Run directly, it scrapes a (stat, date) grid from the stub with
+`TRScraper.scrape_grid` over the pooled client, then checks that connections
+were reused, every response was gzipped, the injected failures were retried,
+and every cell came back. It also times the pooled client against one-off
+`urllib` requests.
+
+    python benchmarks/tr_stub_server.py --stats 4 --days 10 --fail-first 1
+"""
+
+import argparse
+import gzip
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tr_pages import synthetic_tr_page  # noqa: E402
+
+
+class StubServer:
+    """TeamRankings stub on 127.0.0.1, started in a background thread.
+
+    Args:
+        fail_first (int): Requests per page path answered with `fail_status` before succeeding.
+        fail_status (int): Status for injected failures (429 or a 5xx).
+        latency (float): Seconds added to every response.
+    """
+
+    def __init__(self, fail_first: int = 0, fail_status: int = 503, latency: float = 0.0):
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.gzipped = 0
+        self.failures = 0
+        self._seen = {}
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body go out in separate writes; without this a
+                # kept-alive connection waits on delayed ACKs
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                with stub._lock:
+                    stub.requests += 1
+                    seen = stub._seen.get(self.path, 0)
+                    stub._seen[self.path] = seen + 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if seen < stub.fail_first:
+                    with stub._lock:
+                        stub.failures += 1
+                    self.send_response(stub.fail_status)
+                    self.send_header("Retry-After", "0")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                stat = parsed.path.rstrip("/").split("/")[-1]
+                date = parse_qs(parsed.query).get("date", ["2025-01-01"])[0]
+                body = synthetic_tr_page(stat, date)
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body, compresslevel=6)
+                    self.send_header("Content-Encoding", "gzip")
+                    with stub._lock:
+                        stub.gzipped += 1
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    from http_client import HttpClient
+    from page_cache import fetch_url
+    from TR_Upload import TRScraper
+    from rate_limit import AdaptivePacer
+    import metrics
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stats", type=int, default=4)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--fail-first", type=int, default=1, help="failures injected per page before success")
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--metrics-dir", help="write the scrape's run metrics (JSON, Prometheus textfile) here")
+    args = parser.parse_args()
+
+    stats = [f"stat-{i}-pct" for i in range(args.stats)]
+    cells = args.stats * args.days
+    problems = []
+
+    with StubServer(args.fail_first, args.fail_status, args.latency) as server:
+        # A pacer fast enough for loopback; injected failures still go through its backoff
+        pacer = AdaptivePacer(start_rate=1000, min_rate=500, budgets={"127.0.0.1": 1e6}, backoff=0.01, max_backoff=0.1)
+        client = HttpClient(max_connections=args.workers, backoff=0.01, pacer=pacer)
+        scraper = TRScraper("2025-01-01", f"2025-01-{args.days:02d}", client=client)
+        scraper.BASE_URL = server.url
+
+        started = time.perf_counter()
+        with metrics.run("tr_stub", directory=args.metrics_dir) as run:
+            df = scraper.scrape_grid(stats, max_workers=args.workers)
+        seconds = time.perf_counter() - started
+        client.close()
+
+        print(
+            f"pooled client: {cells} cells in {seconds:.2f} s, {server.requests} requests over "
+            f"{server.connections} connections, {server.gzipped} gzipped, "
+            f"{server.failures} injected failures, {client.retried} retries"
+        )
+        if df is None or df[["stat", "date"]].drop_duplicates().shape[0] != cells:
+            problems.append("not every cell was scraped")
+        if server.connections > args.workers:
+            problems.append(f"{server.connections} connections for {args.workers} workers: no keep-alive")
+        if server.gzipped != server.requests - server.failures:
+            problems.append("not every page was gzipped")
+        if client.retried != server.failures:
+            problems.append("injected failures were not all retried")
+        if pacer.stats()["127.0.0.1"]["backoffs"] != server.failures:
+            problems.append("injected failures did not all back the pacer off")
+        counters = run.summary()["counters"]
+        if counters.get("pages_fetched") != cells or counters.get("retries", 0) != server.failures:
+            problems.append(f"run metrics disagree with the server: {counters}")
+
+    # Same pages, one urllib request (and connection) each against one kept-alive
+    # connection; uncompressed both ways so only connection reuse is measured
+    identity = {"Accept-Encoding": "identity"}
+    with StubServer(latency=args.latency) as server, HttpClient(max_connections=1, headers=identity) as client:
+        urls = [f"{server.url}/ncaa-basketball/stat/{stat}?date=2025-01-01" for stat in stats] * args.days
+        started = time.perf_counter()
+        for url in urls:
+            fetch_url(url)
+        urllib_s = time.perf_counter() - started
+        urllib_connections = server.connections
+
+        started = time.perf_counter()
+        for url in urls:
+            fetch_url(url, client=client)
+        pooled_s = time.perf_counter() - started
+        print(
+            f"sequential {len(urls)} GETs: urllib {urllib_s:.2f} s over {urllib_connections} connections, "
+            f"pooled {pooled_s:.2f} s over {server.connections - urllib_connections}"
+        )
+
+    if problems:
+        raise SystemExit("; ".join(problems))
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
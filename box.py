@@ -1,19 +1,27 @@
 #%%
 #Import Libraries
-import pandas as pd
 import os
+import re
+import queue
+import argparse
+import threading
 from bs4 import BeautifulSoup
+from lxml import etree
 from typing import Optional
-from kenpompy.utils import get_html
 import time
-from io import StringIO
 from supabase.client import create_client, Client
 from datetime import timedelta, datetime, date
-import random
+from concurrent.futures import ThreadPoolExecutor
+from session_pool import SessionPool
+from rate_limit import default_pacer
+from lookups import GameIndex, get_alias_resolver
+from journal import default_journal
+from FanMatch import FanMatch
+import metrics
 
 #%%
 #Authenticate Kenpom
-from kenpompy.utils import login
+from page_cache import login
 
 
 # --- 1. SETUP & AUTHENTICATION ---
@@ -22,9 +30,23 @@ USERNAME = os.environ.get("KENPOM_USER")
 PASSWORD = os.environ.get("KENPOM_PW")
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
+# Concurrent KenPom sessions for box pages, each with its own rate limit
+KENPOM_SESSIONS = int(os.environ.get("KENPOM_SESSIONS", "1"))
 
-browser = login(USERNAME, PASSWORD)
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Created in __main__ so BoxScore can be imported (and run against stub sessions)
+browser = None
+supabase: Optional[Client] = None
+
+
+# Box page linescore: plain etree elements, text normalised like pd.read_html
+_LINESCORE_PARSER = etree.HTMLParser(encoding="utf-8")
+_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+def _cell_text(el):
+    return _WHITESPACE.sub(" ", "".join(el.itertext())).strip()
+
+# End-of-stream marker for BoxScore.stream's upload queue
+_DONE = object()
 
 
 # %%
@@ -36,15 +58,52 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 #Box Score Class
 class BoxScore:
 
+    # Journal source; each game date is one unit
+    JOURNAL_SOURCE = "box"
+
+    # Score columns written by upload(), keyed by the team they belong to
+    SCORE_COLUMNS = {
+        "T1": ["H1_T1 Score", "H2_T1 Score", "OT_T1 Score"],
+        "T2": ["H1_T2 Score", "H2_T2 Score", "OT_T2 Score"],
+    }
+
     def __init__(
         self,
         browser,
         supabase_client,
         start_date: str,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        max_workers: int = 4,
+        requests_per_second: float = 0.25,
+        burst: int = 1,
+        error_cooldown: float = 20,
+        journal=None,
+        sessions: Optional[SessionPool] = None
     ):
+        """
+        Pages are fetched through `sessions`, a SessionPool; without one the
+        single `browser` is wrapped in a pool of one (which cannot log in
+        again). max_workers bounds how many box pages are in flight at once;
+        requests_per_second, burst and error_cooldown set each session's
+        token bucket, so the pool paces every fetch and a session that hits
+        an error rests alone.
+        With a journal, dates already uploaded are skipped by collect() and
+        upload() marks each date once every game on its FanMatch page was
+        scraped, matched and written.
+        """
         self.browser = browser
         self.supabase = supabase_client
+        self.journal = journal
+
+        self.max_workers = max_workers
+        if sessions is None:
+            sessions = SessionPool(
+                browsers=[browser],
+                requests_per_second=requests_per_second,
+                burst=burst,
+                error_cooldown=error_cooldown,
+            )
+        self.sessions = sessions
 
         self.start_date = datetime.strptime(start_date, "%Y-%m-%d")
         self.end_date = (
@@ -62,51 +121,26 @@ class BoxScore:
     
 
     def build_team_lookup(self):
-        lookup = {}
-
-        res = self.supabase.table("teams").select("team_id, team_name").execute()
-        for r in res.data:
-            lookup[r["team_name"]] = r["team_id"]
-
-        res = self.supabase.table("team_aliases") \
-            .select("alias_name, canonical_team_id").execute()
-
-        for r in res.data:
-            lookup[r["alias_name"]] = r["canonical_team_id"]
-
-        return lookup
+        # Process-wide cached resolver shared with the other loaders
+        return get_alias_resolver(self.supabase)
     
-    def build_game_lookup(self, game_date: str):
+    @metrics.timed("parse")
+    def get_links(self, date_str):
         """
-        Build a lookup for ONE date only:
-        (team1_id, team2_id) -> game_id
-        Allows swapped team order.
+        (team1, team2) -> box score URL for one date. A page saying there were
+        no games gives {}; any other page without #fanmatch-table (an error
+        or login page) gives None, so it is not taken for a day without games.
         """
-        res = (
-            self.supabase
-            .table("games")
-            .select("game_id, team1_id, team2_id")
-            .eq("game_date", game_date)
-            .execute()
-        )
-
-        lookup = {}
-
-        for r in res.data:
-            lookup[(r["team1_id"], r["team2_id"])] = r["game_id"]
-            lookup[(r["team2_id"], r["team1_id"])] = r["game_id"]
-
-        print(f"Loaded {len(lookup)//2} games for {game_date}")
-        return lookup
-
-    
-    def get_links(self, date_str):
         url = f"https://kenpom.com/fanmatch.php?d={date_str}"
-        soup = BeautifulSoup(get_html(self.browser, url), "html.parser")
+        soup = BeautifulSoup(self.sessions.get_html(url), "html.parser")
 
         table = soup.select_one("#fanmatch-table")
-        if not table:
+        if not table and FanMatch.NO_GAMES_TEXT in soup.get_text():
             return {}
+        if not table:
+            metrics.count("pages_failed")
+            print(f"⚠️ No FanMatch table for {date_str}")
+            return None
 
         match_links = {}
 
@@ -123,165 +157,457 @@ class BoxScore:
 
 
     
-    def parse_box_score(self, box_url):
-        soup = BeautifulSoup(get_html(browser, box_url), "html.parser")
-        table = soup.select_one("#linescore-table2")
-
+    @staticmethod
+    def _linescore_table(html):
+        """The #linescore-table2 element, parsing only that table when it can be cut out of the page."""
+        marker = html.find(b"linescore-table2")
+        if marker == -1:
+            return None
+        start = html.rfind(b"<table", 0, marker)
+        end = html.find(b"</table>", marker)
+        if start != -1 and end != -1:
+            fragment = html[start:end + len(b"</table>")]
+            if fragment.find(b"<table", 1) == -1:
+                table = etree.fromstring(fragment, _LINESCORE_PARSER).find(".//table[@id='linescore-table2']")
+                if table is not None:
+                    return table
+        return etree.fromstring(html, _LINESCORE_PARSER).find(".//table[@id='linescore-table2']")
+
+    @staticmethod
+    def parse_linescore(html):
+        """
+        Read the team name and Q1-Q4 / OT / T cells of a box page's linescore
+        straight into integers.
+
+        Returns (rows, ot_count): one {"team_name", "H1", "H2", "OT"} dict per
+        team, where H1 = Q1 + Q2, H2 = Q3 + Q4 and OT is whatever the total
+        has beyond them, and ot_count is the number of overtime columns (the
+        columns beyond team, Q1-Q4 and T). (None, None) when the page has no
+        linescore.
+        """
+        table = BoxScore._linescore_table(html)
         if table is None:
             return None, None
 
-        df = pd.read_html(StringIO(str(table)))[0]
-        df.rename(columns={"Unnamed: 0": "Team"}, inplace=True)
-
-        ot_count = max(0, df.shape[1] - 6)
+        header = None
+        body = []
+        for tr in table.iter("tr"):
+            cells = [cell for cell in tr if cell.tag in ("td", "th")]
+            if header is None and cells and all(cell.tag == "th" for cell in cells):
+                header = [_cell_text(cell) for cell in cells]
+            elif cells:
+                body.append(cells)
+        if header is None:
+            raise ValueError("linescore table has no header row")
 
-        df["H1"] = df["Q1"] + df["Q2"]
-        df["H2"] = df["Q3"] + df["Q4"]
-        df["OT"] = df["T"] - df["H1"] - df["H2"] if ot_count > 0 else 0
+        ot_count = max(0, len(header) - 6)
+        q1, q2, q3, q4, total = (header.index(col) for col in ("Q1", "Q2", "Q3", "Q4", "T"))
 
         rows = []
-        for _, r in df.iterrows():
+        for cells in body:
+            h1 = int(_cell_text(cells[q1])) + int(_cell_text(cells[q2]))
+            h2 = int(_cell_text(cells[q3])) + int(_cell_text(cells[q4]))
             rows.append({
-                "team_name": r["Team"],
-                "H1": int(r["H1"]),
-                "H2": int(r["H2"]),
-                "OT": int(r["OT"])
+                "team_name": _cell_text(cells[0]),
+                "H1": h1,
+                "H2": h2,
+                "OT": int(_cell_text(cells[total])) - h1 - h2 if ot_count > 0 else 0
             })
 
         return rows, ot_count
 
+    @metrics.timed("parse")
+    def parse_box_score(self, box_url):
+        return self.parse_linescore(self.sessions.get_html(box_url))
 
 
-    def collect(self):
-        self.boxscore_rows = []
-        team_lookup = self.build_team_lookup()
 
-        for game_date in self.date_range():
-            print(f"\n--- Collecting box scores for {game_date} ---")
+    def fetch_box_score(self, box_url):
+        """parse_box_score on the session pool. Failures are returned, not raised."""
+        try:
+            return self.parse_box_score(box_url)
+        except Exception as e:
+            metrics.count("pages_failed")
+            print(f"⚠️ Failed to parse {box_url}: {e}")
+            return None, None
 
-            daily_links = self.get_links(game_date)
-            if not daily_links:
-                print(f"No games found for {game_date}")
+    def fetch_box_scores(self, box_urls):
+        """
+        Fetch and parse box pages on a bounded worker pool.
+        Results come back in the same order as `box_urls`.
+        """
+        if not box_urls:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.fetch_box_score, box_urls))
+
+    def collect_date(self, game_date, team_lookup):
+        """
+        Scrape one date's box scores into `games` rows. Returns None when the
+        journal has the date as uploaded, else (rows, missing): `missing`
+        counts the games that could not be fetched, parsed or fully resolved
+        (1 when the FanMatch page itself failed). The date is marked parsed
+        only when nothing is missing.
+        """
+        if self.journal and self.journal.done(self.JOURNAL_SOURCE, game_date):
+            print(f"\n--- {game_date} already uploaded (journal), skipping ---")
+            return None
+
+        print(f"\n--- Collecting box scores for {game_date} ---")
+
+        daily_links = self.get_links(game_date)
+        if daily_links is None:
+            return [], 1
+        if not daily_links:
+            print(f"No games found for {game_date}")
+
+        missing = 0
+        games = []
+        for (team1, team2), box_url in daily_links.items():
+            team1_id = team_lookup.get(team1)
+            team2_id = team_lookup.get(team2)
+
+            if not team1_id or not team2_id:
+                missing += 1
                 continue
 
-            for (team1, team2), box_url in daily_links.items():
-                team1_id = team_lookup.get(team1)
-                team2_id = team_lookup.get(team2)
+            games.append((team1_id, team2_id, box_url))
 
-                if not team1_id or not team2_id:
-                    continue
+        results = self.fetch_box_scores([box_url for _, _, box_url in games])
 
-                jitter = random.uniform(3, 6)
-                time.sleep(jitter)
-                try:
-                    parsed_rows, ot_count = self.parse_box_score(box_url)
-                    if not parsed_rows:
-                        continue
-
-                    game_row = {
-                        "game_date": game_date,
-                        "team1_id": team1_id,
-                        "team2_id": team2_id,
-                        "H1_T1 Score": None,
-                        "H2_T1 Score": None,
-                        "OT_T1 Score": None,
-                        "H1_T2 Score": None,
-                        "H2_T2 Score": None,
-                        "OT_T2 Score": None,
-                        "OT Count": ot_count,
-                    }
-
-                    for r in parsed_rows:
-                        tid = team_lookup.get(r["team_name"])
-                        if tid == team1_id:
-                            game_row["H1_T1 Score"] = r["H1"]
-                            game_row["H2_T1 Score"] = r["H2"]
-                            game_row["OT_T1 Score"] = r["OT"]
-                        elif tid == team2_id:
-                            game_row["H1_T2 Score"] = r["H1"]
-                            game_row["H2_T2 Score"] = r["H2"]
-                            game_row["OT_T2 Score"] = r["OT"]
-
-                    self.boxscore_rows.append(game_row)
-                
-                except Exception as e:
-                    print(f"⚠️ Failed to parse {box_url}: {e}")
-                    # Wait a bit longer if we hit an error to "cool down"
-                    time.sleep(20)
+        with metrics.stage("transform"):
+            date_rows = []
+            for (team1_id, team2_id, _), (parsed_rows, ot_count) in zip(games, results):
+                if not parsed_rows:
+                    missing += 1
                     continue
+
+                game_row = {
+                    "game_date": game_date,
+                    "team1_id": team1_id,
+                    "team2_id": team2_id,
+                    "H1_T1 Score": None,
+                    "H2_T1 Score": None,
+                    "OT_T1 Score": None,
+                    "H1_T2 Score": None,
+                    "H2_T2 Score": None,
+                    "OT_T2 Score": None,
+                    "OT Count": ot_count,
+                }
+
+                for r in parsed_rows:
+                    tid = team_lookup.get(r["team_name"])
+                    if tid == team1_id:
+                        game_row["H1_T1 Score"] = r["H1"]
+                        game_row["H2_T1 Score"] = r["H2"]
+                        game_row["OT_T1 Score"] = r["OT"]
+                    elif tid == team2_id:
+                        game_row["H1_T2 Score"] = r["H1"]
+                        game_row["H2_T2 Score"] = r["H2"]
+                        game_row["OT_T2 Score"] = r["OT"]
+
+                # A box score team that did not resolve leaves that side's scores empty
+                if game_row["H1_T1 Score"] is None or game_row["H1_T2 Score"] is None:
+                    missing += 1
+                date_rows.append(game_row)
+
+        if missing:
+            print(f"⚠️ {missing} games missing for {game_date}; the date is left for the next run")
+        elif self.journal:
+            self.journal.mark(self.JOURNAL_SOURCE, game_date, "parsed")
+        return date_rows, missing
+
+    def collect(self):
+        self.boxscore_rows = []
+        # Games missing per date, so upload() journals only complete dates
+        self.missing_by_date = {}
+        team_lookup = self.build_team_lookup()
+
+        for game_date in self.date_range():
+            collected = self.collect_date(game_date, team_lookup)
+            if collected is None:
+                continue
+            date_rows, self.missing_by_date[game_date] = collected
+            self.boxscore_rows.extend(date_rows)
             print(f"Collected {len(self.boxscore_rows)} games so far")
 
         print(f"\n✅ Total collected box score rows: {len(self.boxscore_rows)}")
+        team_lookup.report_misses()
         return self.boxscore_rows
 
 
 
-    def upload(self, batch_size=500):
+    def build_update_row(self, row, game_id, swapped):
+        """
+        Map a collected row onto its `games` row. When the box score lists
+        the teams in the reverse order of `games`, the T1/T2 scores are swapped
+        so they stay attached to the right team.
+        """
+        t1, t2 = ("T2", "T1") if swapped else ("T1", "T2")
+        update_row = {
+            "game_id": game_id,
+            "game_date": row["game_date"],
+            "team1_id": row["team2_id"] if swapped else row["team1_id"],
+            "team2_id": row["team1_id"] if swapped else row["team2_id"],
+            "OT Count": row["OT Count"],
+        }
+        for dst, src in zip(self.SCORE_COLUMNS["T1"], self.SCORE_COLUMNS[t1]):
+            update_row[dst] = row[src]
+        for dst, src in zip(self.SCORE_COLUMNS["T2"], self.SCORE_COLUMNS[t2]):
+            update_row[dst] = row[src]
+        return update_row
+
+    def update_rows(self, rows):
+        """Row-level fallback: one UPDATE per game. Returns the number written."""
+        written = 0
+        for r in rows:
+            r = dict(r)
+            gid = r.pop("game_id")
+            try:
+                (
+                    self.supabase
+                    .table("games")
+                    .update(r)
+                    .eq("game_id", gid)
+                    .execute()
+                )
+                written += 1
+            except Exception as e:
+                print(f"⚠️ Failed to update game {gid}: {e}")
+        return written
+
+    def _upsert(self, rows):
+        """One upsert request keyed on game_id. Returns the error instead of raising it."""
+        try:
+            (
+                self.supabase
+                .table("games")
+                .upsert(rows, on_conflict="game_id")
+                .execute()
+            )
+        except Exception as e:
+            return e
+        return None
+
+    def upsert_rows(self, rows):
+        """
+        Upsert rows in a single request keyed on game_id. If the request is
+        rejected, the rows are split in half and retried so that only the
+        offending rows end up on the row-level update path. When both halves
+        are rejected with the same error the problem is not in particular
+        rows (e.g. a bad column), so it is reported once and the split stops
+        there instead of going down to single rows.
+        Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+        error = self._upsert(rows)
+        if error is None:
+            return len(rows)
+        return self._split_rejected(rows, error)
+
+    def _split_rejected(self, rows, error):
+        if len(rows) == 1:
+            print(f"⚠️ Upsert rejected game {rows[0]['game_id']}: {error}")
+            return self.update_rows(rows)
+
+        mid = len(rows) // 2
+        halves = (rows[:mid], rows[mid:])
+        errors = [self._upsert(half) for half in halves]
+        if all(e is not None for e in errors) and str(errors[0]) == str(errors[1]):
+            print(f"⚠️ Upsert rejected {len(rows)} games with the same error, not retried: {errors[0]}")
+            return 0
+
+        written = 0
+        for half, half_error in zip(halves, errors):
+            written += len(half) if half_error is None else self._split_rejected(half, half_error)
+        return written
+
+    def build_game_index(self, dates):
+        """One paged range query over `games` covering every date in `dates`."""
+        return GameIndex.load(self.supabase, min(dates), max(dates))
+
+    def upload_date(self, game_date, rows, game_index, batch_size=500, bulk=True, missing=0):
+        """
+        Resolve one date's rows through `game_index` and write them in
+        batches. Returns the per-batch stats (see upload()).
+
+        The date is marked uploaded only when collection missed nothing
+        (`missing`, from collect_date), every row matched a game (games not
+        in `games` yet are retried by the next run) and every row was written.
+        """
+        updates = []
+        skipped = 0
+        batch_stats = []
+
+        with metrics.stage("transform"):
+            for row in rows:
+                match = game_index.lookup(game_date, row["team1_id"], row["team2_id"])
+
+                if not match:
+                    skipped += 1
+                    continue
+
+                game_id, swapped = match
+                updates.append(self.build_update_row(row, game_id, swapped))
+
+        print(f"{len(updates)} matched, {skipped} skipped for {game_date}")
+
+        # Batch update
+        date_written = 0
+        for i in range(0, len(updates), batch_size):
+            batch = updates[i:i+batch_size]
+
+            started = time.perf_counter()
+            with metrics.stage("upsert"):
+                if bulk:
+                    written = self.upsert_rows(batch)
+                else:
+                    written = self.update_rows(batch)
+            elapsed = time.perf_counter() - started
+            date_written += written
+            metrics.count("rows_written", written)
+
+            batch_stats.append({
+                "game_date": game_date,
+                "rows": len(batch),
+                "written": written,
+                "seconds": elapsed,
+            })
+            print(
+                f"Batch {i//batch_size+1} for {game_date}: "
+                f"{written}/{len(batch)} rows in {elapsed*1000:.0f} ms"
+            )
+
+        if self.journal and missing == 0 and skipped == 0 and date_written == len(rows):
+            self.journal.mark(self.JOURNAL_SOURCE, game_date, "uploaded", detail=str(date_written))
+
+        return batch_stats
+
+    def upload(self, batch_size=500, bulk=True, game_index=None):
+        """
+        Write the collected half and OT scores to `games`.
+
+        Games are resolved through `game_index`, a GameIndex; without one
+        (or when it does not cover the collected dates) a single range query
+        loads it for the whole run. With bulk=True each batch is one upsert
+        keyed on game_id; with bulk=False every game is its own UPDATE.
+        Returns a list of per-batch stats: date, rows sent, rows written and
+        latency in seconds.
+        """
         print(f"Uploading {len(self.boxscore_rows)} box scores")
 
         rows_by_date = {}
+        batch_stats = []
 
         # Group updates by date
         for row in self.boxscore_rows:
             rows_by_date.setdefault(row["game_date"], []).append(row)
 
-        for game_date, rows in rows_by_date.items():
-            print(f"Resolving games for {game_date}")
-            game_lookup = self.build_game_lookup(game_date)
+        if rows_by_date and (game_index is None or not all(map(game_index.covers, rows_by_date))):
+            game_index = self.build_game_index(list(rows_by_date))
 
-            updates = []
-            skipped = 0
+        # Collected dates without rows go through upload_date too, so a day
+        # without games is journaled as stream() journals it
+        missing_by_date = getattr(self, "missing_by_date", {})
+        for game_date in dict.fromkeys([*rows_by_date, *missing_by_date]):
+            batch_stats.extend(self.upload_date(
+                game_date, rows_by_date.get(game_date, []), game_index, batch_size, bulk,
+                missing=missing_by_date.get(game_date, 0),
+            ))
 
-            for row in rows:
-                key = (row["team1_id"], row["team2_id"])
-                game_id = game_lookup.get(key)
+        return batch_stats
 
-                if not game_id:
-                    skipped += 1
-                    continue
-
-                update_row = {
-                    "game_id": game_id,
-                    "H1_T1 Score": row["H1_T1 Score"],
-                    "H2_T1 Score": row["H2_T1 Score"],
-                    "OT_T1 Score": row["OT_T1 Score"],
-                    "H1_T2 Score": row["H1_T2 Score"],
-                    "H2_T2 Score": row["H2_T2 Score"],
-                    "OT_T2 Score": row["OT_T2 Score"],
-                    "OT Count": row["OT Count"],
-                }
-
-                updates.append(update_row)
-
-            print(f"{len(updates)} matched, {skipped} skipped for {game_date}")
+    def stream(self, batch_size=500, bulk=True, queue_size=4, game_index=None):
+        """
+        collect() and upload() overlapped: each finished date's rows go
+        through a bounded queue to an uploader thread that resolves and
+        writes them while the next dates are scraped. At most `queue_size`
+        dates wait in memory, and self.boxscore_rows is not filled.
+
+        The game index is loaded once for the whole date range (unless a
+        covering `game_index` is given). An uploader error stops scraping
+        and is raised. Returns the per-batch stats, as upload() does.
+        """
+        dates = list(self.date_range())
+        if game_index is None or not all(map(game_index.covers, dates)):
+            game_index = self.build_game_index(dates)
+        team_lookup = self.build_team_lookup()
 
-            # Batch update
-            for i in range(0, len(updates), batch_size):
-                batch = updates[i:i+batch_size]
+        pending = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        batch_stats = []
+        errors = []
+
+        def uploader():
+            while True:
+                item = pending.get()
+                if item is _DONE:
+                    return
+                if stop.is_set():
+                    continue
+                game_date, rows, missing = item
+                try:
+                    batch_stats.extend(self.upload_date(game_date, rows, game_index, batch_size, bulk, missing))
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+
+        thread = threading.Thread(target=uploader, daemon=True)
+        thread.start()
+
+        collected = 0
+        try:
+            for game_date in dates:
+                if stop.is_set():
+                    break
+                date_collected = self.collect_date(game_date, team_lookup)
+                if date_collected is None:
+                    continue
+                date_rows, missing = date_collected
+                collected += len(date_rows)
+                print(f"Collected {collected} games so far")
+                pending.put((game_date, date_rows, missing))
+        finally:
+            # Also on a scraping error, so the uploader finishes what it has
+            pending.put(_DONE)
+            thread.join()
 
-                for r in batch:
-                    gid = r.pop("game_id")
-                    (
-                        self.supabase
-                        .table("games")
-                        .update(r)
-                        .eq("game_id", gid)
-                        .execute()
-                    )
+        if errors:
+            raise errors[0]
+        print(f"\n✅ Total streamed box score rows: {collected}")
+        team_lookup.report_misses()
+        return batch_stats
 
 
 
 #%%
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load KenPom box score half and OT scores into Supabase")
+    parser.add_argument("--start", help="first date (YYYY-MM-DD) of a range; default is yesterday only")
+    parser.add_argument("--end", help="last date of a range; default is yesterday")
+    args = parser.parse_args()
+
+    sessions = SessionPool(login=lambda: login(USERNAME, PASSWORD), size=KENPOM_SESSIONS, pacer=default_pacer())
+    browser = sessions.sessions[0].browser
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
     target_date = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
     bs = BoxScore(
         browser=browser,
         supabase_client=supabase,
-        start_date= target_date,
-        end_date= target_date
+        start_date= args.start or target_date,
+        end_date= args.end or target_date,
+        journal=default_journal(),
+        sessions=sessions
     )
 
-    checker = bs.collect()
-    bs.upload()
-    print("All box scores successfully uploaded!")
\ No newline at end of file
+    with metrics.run(BoxScore.JOURNAL_SOURCE):
+        if args.start:
+            # A range: write each date while the next ones are scraped
+            bs.stream()
+        else:
+            checker = bs.collect()
+            bs.upload()
+        print("All box scores successfully uploaded!")
\ No newline at end of file
@@ -0,0 +1,139 @@
+#%%
+#======================================================================================
+#                               POOLED HTTP CLIENT
+#======================================================================================
+"""
+Pooled HTTP client for public pages (TeamRankings).
+
+One `HttpClient` keeps a pool of keep-alive connections, asks for gzip, applies
+connect/read timeouts, and retries 429 and 5xx responses and connection errors
+with exponential backoff (honouring a numeric `Retry-After`). It is safe to
+share between the worker threads of a scrape.
+
+Given an `AdaptivePacer`, every attempt is paced per host and reported back
+to it, and retries wait out the host's backoff instead of the client's own.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+
+import metrics
+from rate_limit import AdaptivePacer, default_pacer
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; cbb-data-loader)",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class HttpClient:
+    """Thread-safe pooled GET client with retries.
+
+    Args:
+        max_connections (int): Connections kept in the pool (and the most in flight).
+        timeout (float): Connect and read timeout in seconds.
+        retries (int): Retries after the first attempt for 429/5xx and connection errors.
+        backoff (float): First retry delay in seconds; doubled on every further retry.
+        max_backoff (float): Cap on a single delay, including `Retry-After`.
+        headers (dict or None): Extra request headers.
+        sleep (callable): Sleep function matching `time.sleep`. Injectable for tests.
+        transport (httpx.BaseTransport or None): Custom transport, e.g. for tests.
+        pacer (AdaptivePacer or None): Per-host pacing for every attempt.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 8,
+        timeout: float = 20.0,
+        retries: int = 4,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        transport: Optional[httpx.BaseTransport] = None,
+        pacer: Optional[AdaptivePacer] = None,
+    ):
+        self.retries = retries
+        self.pacer = pacer
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._client = httpx.Client(
+            headers={**DEFAULT_HEADERS, **(headers or {})},
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            follow_redirects=True,
+            transport=transport,
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retried = 0
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        delay = self.backoff * (2 ** attempt)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return min(delay, self.max_backoff)
+
+    def get(self, url: str) -> bytes:
+        """GET `url` and return the (decompressed) body. Raises once retries are used up."""
+        for attempt in range(self.retries + 1):
+            response = None
+            if self.pacer is not None:
+                self.pacer.acquire(url)
+            with self._lock:
+                self.requests += 1
+            started = time.perf_counter()
+            try:
+                response = self._client.get(url)
+                if self.pacer is not None:
+                    self.pacer.record(url, time.perf_counter() - started, response.status_code,
+                                      response.headers.get("Retry-After"))
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.content
+                if attempt == self.retries:
+                    response.raise_for_status()
+            except httpx.TransportError:
+                if self.pacer is not None:
+                    self.pacer.record(url, time.perf_counter() - started, None)
+                if attempt == self.retries:
+                    raise
+
+            with self._lock:
+                self.retried += 1
+            metrics.count("retries")
+            if self.pacer is None:
+                self._sleep(self._delay(attempt, response))
+            # With a pacer, the next acquire() waits out the host's backoff
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    """The process-wide client, created on first use and paced by the process-wide pacer."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient(pacer=default_pacer())
+        return _default_client
@@ -0,0 +1,114 @@
+#%%
+#======================================================================================
+#                               INGESTION JOURNAL
+#======================================================================================
+"""
+Local SQLite journal of finished ingestion work, so an interrupted job can be
+restarted without redoing what it already finished.
+
+A unit of work is identified by its source ("tr", "box", "kenpom_fanmatch")
+and a unit key (a date, or "stat/date" for TeamRankings), and is marked as it
+passes each stage:
+
+    fetched   the page was downloaded
+    parsed    the page was turned into rows (units fetched and parsed in one
+              step are marked parsed directly)
+    uploaded  every row of the unit was written to Supabase
+
+Jobs skip units already marked uploaded. Fetched pages themselves are not
+kept here; with the page cache enabled a re-fetch is served from disk.
+
+The daily scripts journal when `INGEST_JOURNAL` is set to a database path,
+through `default_journal()`.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Set
+
+STAGES = ("fetched", "parsed", "uploaded")
+
+
+class Journal:
+    """SQLite journal of (source, unit, stage) marks.
+
+    Args:
+        path (str): Database file. Created if missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS units ("
+            " source TEXT NOT NULL, unit TEXT NOT NULL, stage TEXT NOT NULL,"
+            " detail TEXT, updated_at REAL NOT NULL,"
+            " PRIMARY KEY (source, unit, stage))"
+        )
+
+    def mark(self, source: str, unit: str, stage: str, detail: Optional[str] = None) -> None:
+        """Record that `unit` of `source` finished `stage`."""
+        self.mark_many(source, [unit], stage, detail)
+
+    def mark_many(self, source: str, units: Iterable[str], stage: str, detail: Optional[str] = None) -> None:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage {stage!r}, expected one of {STAGES}")
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO units (source, unit, stage, detail, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(source, unit, stage, detail, now) for unit in units],
+            )
+
+    def done(self, source: str, unit: str, stage: str = "uploaded") -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM units WHERE source = ? AND unit = ? AND stage = ?", (source, unit, stage)
+            ).fetchone()
+        return row is not None
+
+    def units(self, source: str, stage: str = "uploaded") -> Set[str]:
+        """Every unit of `source` marked with `stage`."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT unit FROM units WHERE source = ? AND stage = ?", (source, stage)
+            ).fetchall()
+        return {unit for (unit,) in rows}
+
+    def pending(self, source: str, units: Iterable[str], stage: str = "uploaded") -> List[str]:
+        """`units` not yet marked with `stage`, in the order given."""
+        finished = self.units(source, stage)
+        return [unit for unit in units if unit not in finished]
+
+    def clear(self, source: str, units: Optional[Iterable[str]] = None) -> None:
+        """Forget every mark of `source`, or only those of `units`."""
+        with self._lock:
+            if units is None:
+                self._db.execute("DELETE FROM units WHERE source = ?", (source,))
+            else:
+                self._db.executemany(
+                    "DELETE FROM units WHERE source = ? AND unit = ?", [(source, unit) for unit in units]
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_default_journal: Optional[Journal] = None
+_default_lock = threading.Lock()
+
+
+def default_journal() -> Optional[Journal]:
+    """The process-wide journal at INGEST_JOURNAL, or None when it is not set."""
+    global _default_journal
+    with _default_lock:
+        if _default_journal is None:
+            path = os.environ.get("INGEST_JOURNAL")
+            if path:
+                _default_journal = Journal(path)
+        return _default_journal
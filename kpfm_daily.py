@@ -11,9 +11,11 @@ import time
 import pandas as pd
 import kenpompy.FanMatch as kf
 from datetime import datetime, timedelta, date
-from kenpompy.utils import login
+from page_cache import login, CachedBrowser
 from supabase.client import create_client, Client
 from tqdm import tqdm
+from lookups import ArenaIndex, get_alias_resolver
+import metrics
 
 # %%
 # --- 1. SETUP & AUTHENTICATION ---
@@ -23,39 +25,15 @@ PASSWORD = os.environ.get("KENPOM_PW")
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
 
-browser = login(USERNAME, PASSWORD)
+# kenpompy.FanMatch calls browser.get directly, so route it through the page cache
+browser = CachedBrowser(login(USERNAME, PASSWORD))
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 #%%
 # Team Lookup
 def build_team_lookup(supabase):
-    lookup = {}
-
-    # Base KP teams
-    res = supabase.table("teams").select("team_id, team_name").execute()
-    for r in res.data:
-        lookup[r["team_name"]] = r["team_id"]
-
-    # Aliases -> canonical KP team_id
-    res = supabase.table("team_aliases").select("alias_name, canonical_team_id").execute()
-    for r in res.data:
-        lookup[r["alias_name"]] = r["canonical_team_id"]
-
-    return lookup
-
-#%%
-#Arena Lookup
-def lookup_arena_id(supabase, arena_name):
-    if not arena_name:
-        return None
-    
-    resp = supabase.table("arenas") \
-        .select("arena_id, team_id") \
-        .eq("arena_name", arena_name) \
-        .execute()
-    lst = [(row["arena_id"], row["team_id"]) for row in resp.data]
-    return lst
-
+    # Base KP teams + aliases -> canonical KP team_id, cached per process
+    return get_alias_resolver(supabase)
 
 #%%
 #Text cleaners
@@ -115,13 +93,16 @@ def parse_arena_name(location_text):
 
 #%%
 #Main Function
-def insert_fanmatch_to_supabase(date_str, browser):
+def insert_fanmatch_to_supabase(date_str, browser, arena_index=None):
     team_lookup = build_team_lookup(supabase)
+    if arena_index is None:
+        arena_index = ArenaIndex.load(supabase)
 
     #This commented line is only for leap year date
     #fm = fMatch(browser, date= date_str)
 
-    fm = kf.FanMatch(browser, date=date_str)
+    with metrics.stage("parse"):
+        fm = kf.FanMatch(browser, date=date_str)
     df = fm.fm_df
 
     if df is None:
@@ -130,84 +111,69 @@ def insert_fanmatch_to_supabase(date_str, browser):
 
     print(f"\nRetrieved {len(df)} FanMatch rows for {date_str}\n")
 
-    rows_to_insert = []
-    rows_missed = []
+    with metrics.stage("transform"):
+        rows_to_insert = []
+        rows_missed = []
 
-    for _, row in tqdm(df.iterrows(), total=len(df)):
+        for _, row in tqdm(df.iterrows(), total=len(df)):
         
-        # Clean names
-        winner_name = clean_team_name(row["PredictedWinner"])
-        loser_name  = clean_team_name(row["PredictedLoser"])
-
-        # Lookup team_id
-        team1_id = team_lookup.get(winner_name)
-        team2_id  = team_lookup.get(loser_name)
-
-        if not team1_id:
-            rows_missed.append(f"{winner_name} vs {loser_name}")
-            continue
-
-        if not team2_id:
-            rows_missed.append(f"{winner_name} vs {loser_name}")
-            continue
-
-        # Possessions (nullable)
-        predicted_possessions = None if pd.isna(row["PredictedPossessions"]) else int(row["PredictedPossessions"])
-        predicted_score = None if pd.isna(row["PredictedScore"]) else str(row["PredictedScore"])
-        # Predicted Score
-        if type(row['PredictedScore']) == float:
-            row['PredictedScore'] = None
-
-        # Location parsing
-        location_text = row["Location"]
-        city, state, arena_name = parse_location(location_text)
-
-        # Arena ID lookup
-        home_team = ''
-        is_neutral_site = False
-        arena_name = parse_arena_name(location_text)
-        arena_data = lookup_arena_id(supabase, arena_name)
-        if arena_data:
-            arena_id = arena_data[0][0]
-            home_team_id = arena_data[0][1]
-
-            if team1_id == home_team_id:
-                home_team = team1_id
-            elif team2_id == home_team_id:
-                home_team = team2_id
-            else:
-                home_team = None
-                is_neutral_site = True
-
-        else:
-            arena_id = None
-            home_team = None
-            is_neutral_site = True
-
-
-        # Final dict
-        game_row = {
-            "game_date": date_str,
-            "team1_id": team1_id,
-            "team2_id": team2_id,
-
-            "predicted_winner": team1_id,
-            "predicted_loser": team2_id,
-            "predicted_score": predicted_score,
-            "predicted_possessions": predicted_possessions,
-
-            "location": location_text,
-            "home_team_id": home_team,
-
-        }
-
-        rows_to_insert.append(game_row)
+            # Clean names
+            winner_name = clean_team_name(row["PredictedWinner"])
+            loser_name  = clean_team_name(row["PredictedLoser"])
+
+            # Lookup team_id
+            team1_id = team_lookup.get(winner_name)
+            team2_id  = team_lookup.get(loser_name)
+
+            if not team1_id:
+                rows_missed.append(f"{winner_name} vs {loser_name}")
+                continue
+
+            if not team2_id:
+                rows_missed.append(f"{winner_name} vs {loser_name}")
+                continue
+
+            # Possessions (nullable)
+            predicted_possessions = None if pd.isna(row["PredictedPossessions"]) else int(row["PredictedPossessions"])
+            predicted_score = None if pd.isna(row["PredictedScore"]) else str(row["PredictedScore"])
+            # Predicted Score
+            if type(row['PredictedScore']) == float:
+                row['PredictedScore'] = None
+
+            # Location parsing
+            location_text = row["Location"]
+            city, state, arena_name = parse_location(location_text)
+
+            # Arena ID lookup (served from the preloaded index)
+            arena_name = parse_arena_name(location_text)
+            arena_id, home_team, is_neutral_site = arena_index.resolve_site(arena_name, team1_id, team2_id)
+
+
+            # Final dict
+            game_row = {
+                "game_date": date_str,
+                "team1_id": team1_id,
+                "team2_id": team2_id,
+
+                "predicted_winner": team1_id,
+                "predicted_loser": team2_id,
+                "predicted_score": predicted_score,
+                "predicted_possessions": predicted_possessions,
+
+                "location": location_text,
+                "home_team_id": home_team,
+
+            }
+
+            rows_to_insert.append(game_row)
 
     # INSERT INTO SUPABASE
     if rows_to_insert:
         try:
             print(f"Inserting {len(rows_to_insert)} rows…")
-            supabase.table("day_schedule").upsert(rows_to_insert).execute()
+            with metrics.stage("upsert"):
+                supabase.table("day_schedule").upsert(rows_to_insert).execute()
+            metrics.count("rows_written", len(rows_to_insert))
             print("✅ Insert completed")
             if rows_missed:
                 print(f"Skipped {len(rows_missed)} rows of NR matches")
@@ -216,10 +182,13 @@ def insert_fanmatch_to_supabase(date_str, browser):
     else:
         print("⚠️ No rows to insert (all skipped due to missing data).")
 
+    team_lookup.report_misses()
+
 
 
 #%%
 if __name__ == "__main__":
     # Yesterday's data
     target_date = (date.today()).strftime("%Y-%m-%d")
-    insert_fanmatch_to_supabase(target_date, browser)
+    with metrics.run("kpfm_daily"):
+        insert_fanmatch_to_supabase(target_date, browser)
@@ -0,0 +1,346 @@
+#%%
+#======================================================================================
+#                           SHARED SUPABASE LOOKUP INDEXES
+#======================================================================================
+"""
+In-memory lookup indexes shared by the loader scripts.
+
+Each index is loaded with one paged select per run and then serves every
+lookup locally, instead of issuing one Supabase query per scraped row.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import metrics
+
+# PostgREST caps a single select at 1000 rows by default
+PAGE_SIZE = 1000
+
+
+def select_all(
+    supabase,
+    table: str,
+    columns: str,
+    order: str,
+    page_size: int = PAGE_SIZE,
+    filters: Iterable[Tuple[str, str, Any]] = (),
+) -> Iterator[Dict[str, Any]]:
+    """Yield every row of `table`, fetching `page_size` rows per request.
+
+    Args:
+        supabase (Client): Supabase client.
+        table (str): Table to read.
+        columns (str): Column list passed to `select`.
+        order (str): Column used to keep paging stable between requests.
+        page_size (int): Rows requested per page.
+        filters (iterable of tuple): `(operator, column, value)` filters applied
+            to every page, e.g. `("gte", "game_date", "2025-01-01")`.
+    """
+    filters = list(filters)
+    start = 0
+    while True:
+        query = supabase.table(table).select(columns)
+        for op, column, value in filters:
+            query = getattr(query, op)(column, value)
+        res = (
+            query
+            .order(order)
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        yield from res.data
+        if len(res.data) < page_size:
+            return
+        start += page_size
+
+
+#%%
+#Arena Index
+def normalize_arena_name(arena_name: Optional[str]) -> Optional[str]:
+    """Normalize an arena name for lookups: case-folded, single-spaced."""
+    if arena_name is None:
+        return None
+    key = re.sub(r"\s+", " ", str(arena_name)).strip().casefold()
+    if key in ("", "nan", "none"):
+        return None
+    return key
+
+
+class ArenaIndex:
+    """Arena name -> (arena_id, team_id) index built from the `arenas` table.
+
+    Args:
+        rows (iterable of dict): Rows with `arena_name`, `arena_id` and `team_id`.
+            When several rows share a normalized name, the first one wins.
+    """
+
+    _COLUMNS = "arena_id, arena_name, team_id"
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        self._index: Dict[str, Tuple[Any, Any]] = {}
+        for r in rows:
+            key = normalize_arena_name(r["arena_name"])
+            if key is not None:
+                self._index.setdefault(key, (r["arena_id"], r["team_id"]))
+
+    @classmethod
+    def load(cls, supabase, page_size: int = PAGE_SIZE) -> "ArenaIndex":
+        """Load the full `arenas` table with one paged select."""
+        with metrics.stage("lookup"):
+            index = cls(select_all(supabase, "arenas", cls._COLUMNS, "arena_id", page_size))
+        print(f"Loaded arena index: {len(index)} arenas")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, arena_name: Optional[str]) -> Optional[Tuple[Any, Any]]:
+        """Return `(arena_id, team_id)` for `arena_name`, or None if unknown."""
+        key = normalize_arena_name(arena_name)
+        if key is None:
+            return None
+        return self._index.get(key)
+
+    def resolve_site(self, arena_name: Optional[str], team1_id, team2_id) -> Tuple[Any, Any, bool]:
+        """Resolve `(arena_id, home_team_id, is_neutral_site)` for a game.
+
+        The game is at a home site only when the arena belongs to one of the
+        two teams. Unknown arenas fall back to a neutral site with no arena.
+        """
+        arena_data = self.lookup(arena_name)
+        if arena_data is None:
+            return None, None, True
+
+        arena_id, home_team_id = arena_data
+        if home_team_id is not None and home_team_id in (team1_id, team2_id):
+            return arena_id, home_team_id, False
+        return arena_id, None, True
+
+
+#%%
+#Game Index
+# Team ids up to 2**20 pack with the day number into one int key
+_TEAM_BITS = 20
+_TEAM_LIMIT = 1 << _TEAM_BITS
+
+
+def _day_number(game_date: Union[str, date]) -> int:
+    """Proleptic ordinal of a `game_date` string ("2025-01-15", or a timestamp) or date."""
+    if isinstance(game_date, date):
+        return game_date.toordinal()
+    return date.fromisoformat(str(game_date)[:10]).toordinal()
+
+
+def _game_key(day: int, team1_id, team2_id):
+    if (
+        type(team1_id) is int and type(team2_id) is int
+        and 0 <= team1_id < _TEAM_LIMIT and 0 <= team2_id < _TEAM_LIMIT
+    ):
+        return (day << (2 * _TEAM_BITS)) | (team1_id << _TEAM_BITS) | team2_id
+    # Ids that do not fit (or are not ints) keep a tuple key
+    return (day, team1_id, team2_id)
+
+
+class GameIndex:
+    """(game_date, team1_id, team2_id) -> game_id index over a date range of `games`.
+
+    Each game is stored once, under the team order it has in `games`, with the
+    date and both team ids packed into a single int key. `lookup` tries that
+    order and then the reverse, so it resolves either order and reports which
+    one matched.
+
+    Args:
+        rows (iterable of dict): Rows with `game_id`, `game_date`, `team1_id` and `team2_id`.
+            When two rows share a key, the later one wins.
+        start_date (str or None): First date the rows cover.
+        end_date (str or None): Last date the rows cover.
+    """
+
+    _COLUMNS = "game_id, game_date, team1_id, team2_id"
+
+    def __init__(self, rows: Iterable[Dict[str, Any]], start_date: Optional[str] = None, end_date: Optional[str] = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self._index: Dict[Any, Any] = {}
+        for r in rows:
+            key = _game_key(_day_number(r["game_date"]), r["team1_id"], r["team2_id"])
+            self._index[key] = r["game_id"]
+
+    @classmethod
+    def load(cls, supabase, start_date: str, end_date: Optional[str] = None, page_size: int = PAGE_SIZE) -> "GameIndex":
+        """Load the games from `start_date` to `end_date` (inclusive) with one paged range select."""
+        end_date = end_date or start_date
+        rows = select_all(
+            supabase, "games", cls._COLUMNS, "game_id", page_size,
+            filters=[("gte", "game_date", start_date), ("lte", "game_date", end_date)],
+        )
+        with metrics.stage("lookup"):
+            index = cls(rows, start_date, end_date)
+        print(f"Loaded game index: {len(index)} games from {start_date} to {end_date}")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def covers(self, game_date: str) -> bool:
+        """Whether `game_date` lies in the range the index was loaded for."""
+        if self.start_date is None or self.end_date is None:
+            return True
+        return _day_number(self.start_date) <= _day_number(game_date) <= _day_number(self.end_date)
+
+    def lookup(self, game_date: Union[str, date], team1_id, team2_id) -> Optional[Tuple[Any, bool]]:
+        """Return `(game_id, swapped)`, or None if no such game.
+
+        `swapped` is True when the teams are stored in `games` in the reverse order.
+        """
+        day = _day_number(game_date)
+        game_id = self._index.get(_game_key(day, team1_id, team2_id))
+        if game_id is not None:
+            return game_id, False
+        game_id = self._index.get(_game_key(day, team2_id, team1_id))
+        if game_id is not None:
+            return game_id, True
+        return None
+
+
+#%%
+#Team Alias Resolver
+# Optional JSON snapshot of the alias table, e.g. for local backfills
+ALIAS_SNAPSHOT_PATH = os.environ.get("TEAM_ALIAS_SNAPSHOT")
+ALIAS_TTL_SECONDS = 6 * 60 * 60
+
+
+class AliasResolver:
+    """Team name -> team_id resolver built from `teams` and `team_aliases`.
+
+    Behaves like the dict the scripts used to build, but every `get` that
+    fails is counted in `misses` so unresolved names can be reported once per
+    run instead of grepped from stdout.
+
+    Args:
+        lookup (dict): Team or alias name -> team_id.
+        loaded_at (float): Unix time the data was read from Supabase.
+    """
+
+    def __init__(self, lookup: Dict[str, Any], loaded_at: Optional[float] = None):
+        self._lookup = dict(lookup)
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+        self.misses: Counter = Counter()
+
+    @classmethod
+    def fetch(cls, supabase, page_size: int = PAGE_SIZE) -> "AliasResolver":
+        """Read both tables from Supabase. Aliases win over base team names."""
+        lookup = {}
+        with metrics.stage("lookup"):
+            for r in select_all(supabase, "teams", "team_id, team_name", "team_id", page_size):
+                lookup[r["team_name"]] = r["team_id"]
+            for r in select_all(supabase, "team_aliases", "alias_name, canonical_team_id", "alias_name", page_size):
+                lookup[r["alias_name"]] = r["canonical_team_id"]
+        return cls(lookup)
+
+    @classmethod
+    def from_snapshot(cls, path: str, ttl: float) -> Optional["AliasResolver"]:
+        """Load a snapshot written by `save_snapshot`, or None if missing or stale."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - snapshot.get("loaded_at", 0) > ttl:
+            return None
+        return cls(snapshot["lookup"], loaded_at=snapshot["loaded_at"])
+
+    def save_snapshot(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"loaded_at": self.loaded_at, "lookup": self._lookup}, f)
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.loaded_at <= ttl
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+    def __contains__(self, name) -> bool:
+        return name in self._lookup
+
+    def __getitem__(self, name):
+        return self._lookup[name]
+
+    def get(self, name, default=None):
+        """Resolve `name`, counting the miss if it is unknown."""
+        team_id = self._lookup.get(name)
+        if team_id is None:
+            if name is not None:
+                self.misses[name] += 1
+                metrics.count("alias_misses")
+            return default
+        return team_id
+
+    def get_many(self, names, counts=None) -> list:
+        """Resolve distinct `names` in one pass.
+
+        `counts[i]` is how many rows carry `names[i]`, so the miss tally matches
+        what per-row `get` calls would have recorded.
+        """
+        resolved = []
+        for i, name in enumerate(names):
+            team_id = self._lookup.get(name)
+            if team_id is None and name is not None:
+                missed = 1 if counts is None else int(counts[i])
+                self.misses[name] += missed
+                metrics.count("alias_misses", missed)
+            resolved.append(team_id)
+        return resolved
+
+    def report_misses(self, limit: int = 20) -> None:
+        if not self.misses:
+            return
+        print(f"Unresolved team names: {len(self.misses)} distinct, {sum(self.misses.values())} lookups")
+        for name, count in self.misses.most_common(limit):
+            print(f"  {name}: {count}")
+
+
+_alias_resolver: Optional[AliasResolver] = None
+_alias_lock = threading.Lock()
+
+
+def get_alias_resolver(
+    supabase,
+    snapshot_path: Optional[str] = ALIAS_SNAPSHOT_PATH,
+    ttl: float = ALIAS_TTL_SECONDS,
+) -> AliasResolver:
+    """Return the process-wide AliasResolver, loading it at most once per `ttl`.
+
+    The in-process copy is tried first, then the on-disk snapshot (if a path
+    is configured), and only then Supabase. A fresh Supabase read refreshes
+    the snapshot.
+    """
+    global _alias_resolver
+    with _alias_lock:
+        if _alias_resolver is not None and _alias_resolver.is_fresh(ttl):
+            return _alias_resolver
+
+        resolver = None
+        if snapshot_path:
+            resolver = AliasResolver.from_snapshot(snapshot_path, ttl)
+        if resolver is None:
+            resolver = AliasResolver.fetch(supabase)
+            if snapshot_path:
+                resolver.save_snapshot(snapshot_path)
+
+        # Keep miss counts across a TTL refresh within the same run
+        if _alias_resolver is not None:
+            resolver.misses = _alias_resolver.misses
+
+        print("Loaded alias lookup:", len(resolver))
+        _alias_resolver = resolver
+        return resolver
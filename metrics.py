@@ -0,0 +1,219 @@
+#%%
+#======================================================================================
+#                             PIPELINE RUN METRICS
+#======================================================================================
+"""
+Per-stage timing and counters for one pipeline run.
+
+A script's `__main__` wraps its work in `with metrics.run("box"):`. Every
+module then records into that run without it being passed around:
+
+    with metrics.stage("parse"):
+        rows = parse(html)
+    metrics.count("rows_written", len(rows))
+
+or decorates a function with `@metrics.timed("transform")`.
+
+Stages used by the scrapers:
+    fetch      network fetches (cache hits are only counted)
+    wait       sleeping for a rate limiter or a host's backoff
+    parse      turning a page into a table or rows
+    transform  resolving ids and building database rows
+    lookup     loading lookup indexes from Supabase
+    upsert     writing to Supabase
+
+Stage times are exclusive. A fetch run inside a parse counts toward fetch
+only, so one thread's stages add up to the time it was busy. Stages run on
+several threads are summed over those threads.
+
+At the end of the run a summary is printed. When `PIPELINE_METRICS_DIR` is
+set, the summary is also written to that directory:
+- `<pipeline>.json`, the last run;
+- one line appended to `<pipeline>.runs.jsonl`;
+- `<pipeline>.prom`, for the Prometheus node_exporter textfile collector.
+
+Outside a run, records go to a scratch run that is never written.
+"""
+
+import functools
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+METRICS_DIR = os.environ.get("PIPELINE_METRICS_DIR")
+
+_METRIC_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class RunMetrics:
+    """Stage timers and counters of one run. Thread-safe.
+
+    Args:
+        pipeline (str): Pipeline name, e.g. "tr" or "box". Used in file and label names.
+        clock (callable): Monotonic clock in seconds. Injectable for tests.
+    """
+
+    def __init__(self, pipeline: str, clock: Callable[[], float] = time.perf_counter):
+        self.pipeline = pipeline
+        self.status = "running"
+        self.started_at = time.time()
+        self.seconds: Optional[float] = None
+        self.stage_seconds: Dict[str, float] = defaultdict(float)
+        self.stage_calls: Counter = Counter()
+        self.counters: Counter = Counter()
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        # Per thread, the nested-stage time of each open stage
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the block as stage `name`, minus any stage nested in it."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            elapsed = self._clock() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.stage_seconds[name] += elapsed - nested
+                self.stage_calls[name] += 1
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def finish(self, status: str = "ok") -> None:
+        self.status = status
+        self.seconds = self._clock() - self._started
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "pipeline": self.pipeline,
+                "status": self.status,
+                "started_at": self.started_at,
+                "seconds": self.seconds,
+                "stages": {
+                    name: {"seconds": round(self.stage_seconds[name], 6), "calls": self.stage_calls[name]}
+                    for name in sorted(self.stage_calls)
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def prometheus(self) -> str:
+        """The summary in the Prometheus text exposition format (one gauge per value)."""
+        summary = self.summary()
+        label = f'pipeline="{self.pipeline}"'
+        lines = [
+            "# HELP pipeline_run_seconds Wall time of the last run.",
+            "# TYPE pipeline_run_seconds gauge",
+            f"pipeline_run_seconds{{{label}}} {summary['seconds'] or 0}",
+            "# HELP pipeline_run_success Whether the last run finished without an error.",
+            "# TYPE pipeline_run_success gauge",
+            f"pipeline_run_success{{{label}}} {int(summary['status'] == 'ok')}",
+            "# HELP pipeline_run_timestamp_seconds Unix time the last run started.",
+            "# TYPE pipeline_run_timestamp_seconds gauge",
+            f"pipeline_run_timestamp_seconds{{{label}}} {summary['started_at']}",
+            "# HELP pipeline_stage_seconds Exclusive seconds per stage in the last run, summed over threads.",
+            "# TYPE pipeline_stage_seconds gauge",
+        ]
+        for name, stage in summary["stages"].items():
+            lines.append(f'pipeline_stage_seconds{{{label},stage="{name}"}} {stage["seconds"]}')
+        lines += [
+            "# HELP pipeline_stage_calls Times each stage ran in the last run.",
+            "# TYPE pipeline_stage_calls gauge",
+        ]
+        for name, stage in summary["stages"].items():
+            lines.append(f'pipeline_stage_calls{{{label},stage="{name}"}} {stage["calls"]}')
+        for name, value in summary["counters"].items():
+            metric = "pipeline_" + _METRIC_NAME.sub("_", name)
+            lines += [f"# TYPE {metric} gauge", f"{metric}{{{label}}} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str) -> None:
+        """Write the JSON and Prometheus textfile summaries to `directory`."""
+        os.makedirs(directory, exist_ok=True)
+        summary = self.summary()
+        base = os.path.join(directory, self.pipeline)
+        # Replaced atomically, so the textfile collector never reads half a file
+        for path, text in ((f"{base}.json", json.dumps(summary, indent=2)), (f"{base}.prom", self.prometheus())):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        with open(f"{base}.runs.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary) + "\n")
+
+    def report(self) -> None:
+        summary = self.summary()
+        print(f"Run {self.pipeline} {summary['status']} in {summary['seconds'] or 0:.1f} s")
+        for name, stage in sorted(summary["stages"].items(), key=lambda kv: -kv[1]["seconds"]):
+            print(f"  {name:<10} {stage['seconds']:9.2f} s  {stage['calls']:>7} calls")
+        for name, value in summary["counters"].items():
+            print(f"  {name:<16} {value:,}")
+
+
+_current = RunMetrics("scratch")
+_current_lock = threading.Lock()
+
+
+def current() -> RunMetrics:
+    """The run being recorded (a scratch run outside `run`)."""
+    return _current
+
+
+def stage(name: str):
+    """`current().stage(name)`."""
+    return _current.stage(name)
+
+
+def count(name: str, n: float = 1) -> None:
+    """`current().count(name, n)`."""
+    _current.count(name, n)
+
+
+def timed(name: str):
+    """Decorator: every call of the function is timed as stage `name` of the current run."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def run(pipeline: str, directory: Optional[str] = METRICS_DIR) -> Iterator[RunMetrics]:
+    """Record a pipeline run; report it (and write it to `directory`, if set) at the end.
+
+    A run that raises is reported with status "failed" and the error is re-raised.
+    """
+    global _current
+    metrics = RunMetrics(pipeline)
+    with _current_lock:
+        previous, _current = _current, metrics
+    status = "failed"
+    try:
+        yield metrics
+        status = "ok"
+    finally:
+        metrics.finish(status)
+        with _current_lock:
+            _current = previous
+        metrics.report()
+        if directory:
+            metrics.write(directory)
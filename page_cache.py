@@ -0,0 +1,305 @@
+#%%
+#======================================================================================
+#                               OFFLINE HTML PAGE CACHE
+#======================================================================================
+"""
+Content-addressed on-disk cache for scraped pages.
+
+Page bodies are stored gzip-compressed under `objects/`, named by the SHA-256
+of their content, so identical pages are stored once. `index.jsonl` maps each
+URL to the hash of its latest body; it is append-only, and the last entry for
+a URL wins.
+
+Modes:
+    off      no caching, every fetch goes to the network
+    rw       serve from cache when present, otherwise fetch and store
+    refresh  always fetch and store, overwriting the URL's index entry
+    replay   serve only from cache; a miss raises `CacheMiss` (no network)
+
+The scripts pick up `PAGE_CACHE_DIR` and `PAGE_CACHE_MODE` (default `rw` when
+a directory is set) from the environment through `default_cache()`.
+
+A `validate` callable rejects a fetched page before it is stored by raising
+`InvalidPage`; KenPom pages are checked for the login form, so an expired
+session never leaves a login page in the cache for later runs to replay.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from typing import Callable, Dict, Iterator, Optional
+
+from kenpompy.utils import get_html as _kenpompy_get_html
+from kenpompy.utils import login as _kenpompy_login
+
+import metrics
+
+MODES = ("off", "rw", "refresh", "replay")
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a URL has never been cached."""
+
+
+class InvalidPage(Exception):
+    """Raised by a `validate` callable for a page that must not be used or cached."""
+
+
+def logged_out(html: bytes) -> bool:
+    """An expired KenPom session is served the login form (posting to login_handler.php)."""
+    return b"login_handler.php" in html
+
+
+def reject_logged_out(html: bytes) -> None:
+    """`validate` for KenPom pages: raise `InvalidPage` for the login form."""
+    if logged_out(html):
+        raise InvalidPage("KenPom session is logged out (got the login page)")
+
+
+class PageCache:
+    """Content-addressed page cache.
+
+    Args:
+        root (str): Cache directory. Created if missing.
+        mode (str): One of `MODES`.
+    """
+
+    def __init__(self, root: str, mode: str = "rw"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}, expected one of {MODES}")
+        self.root = root
+        self.mode = mode
+        self._objects = os.path.join(root, "objects")
+        self._index_path = os.path.join(root, "index.jsonl")
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self._objects, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crashed run; earlier entries are fine
+                    continue
+                self._index[entry["url"]] = entry
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects, digest[:2], f"{digest}.html.gz")
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def urls(self) -> Iterator[str]:
+        """Cached URLs, in index order."""
+        return iter(list(self._index))
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Return the cached body for `url`, or None."""
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        try:
+            with gzip.open(self._object_path(entry["sha256"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, url: str, content: bytes) -> str:
+        """Store `content` for `url` and return its content hash."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        entry = {"url": url, "sha256": digest, "size": len(content), "fetched_at": time.time()}
+        with self._lock:
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._index[url] = entry
+        return digest
+
+    def fetch(
+        self,
+        url: str,
+        fetcher: Callable[[str], bytes],
+        validate: Optional[Callable[[bytes], None]] = None,
+    ) -> bytes:
+        """Return the body for `url`, consulting the cache according to `mode`.
+
+        `validate(content)` raises `InvalidPage` for a fetched page that must
+        not be stored. A cached page it rejects (stored before the check
+        existed) is treated as a miss.
+        """
+        if self.mode == "off":
+            content = fetcher(url)
+            if validate is not None:
+                validate(content)
+            return content
+
+        if self.mode != "refresh":
+            content = self.get(url)
+            if content is not None and _accepted(content, validate):
+                self.hits += 1
+                metrics.count("cache_hits")
+                return content
+
+        self.misses += 1
+        if self.mode == "replay":
+            raise CacheMiss(f"{url} is not in the page cache at {self.root}")
+
+        content = fetcher(url)
+        if validate is not None:
+            validate(content)
+        self.put(url, content)
+        return content
+
+
+def _accepted(content: bytes, validate: Optional[Callable[[bytes], None]]) -> bool:
+    if validate is None:
+        return True
+    try:
+        validate(content)
+    except InvalidPage:
+        return False
+    return True
+
+
+_default_cache: Optional[PageCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> Optional[PageCache]:
+    """The process-wide cache configured by PAGE_CACHE_DIR / PAGE_CACHE_MODE, or None."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            root = os.environ.get("PAGE_CACHE_DIR")
+            mode = os.environ.get("PAGE_CACHE_MODE", "rw")
+            if root and mode != "off":
+                _default_cache = PageCache(root, mode)
+        return _default_cache
+
+
+def replaying() -> bool:
+    cache = default_cache()
+    return cache is not None and cache.mode == "replay"
+
+
+#%%
+#Drop-in fetchers
+def _network_fetch(fetch: Callable[[str], bytes], url: str) -> bytes:
+    """`fetch(url)` timed as the fetch stage and counted in the run metrics."""
+    with metrics.stage("fetch"):
+        content = fetch(url)
+    metrics.count("pages_fetched")
+    metrics.count("bytes_fetched", len(content))
+    return content
+
+
+def get_html(
+    browser,
+    url: str,
+    cache: Optional[PageCache] = None,
+    pacer=None,
+    validate: Optional[Callable[[bytes], None]] = reject_logged_out,
+) -> bytes:
+    """`kenpompy.utils.get_html` routed through the page cache.
+
+    `pacer` is an optional `rate_limit.AdaptivePacer`; only network fetches
+    (not cache hits) are paced and reported to it. `validate` checks the page
+    before it is cached; by default a login page raises `InvalidPage`.
+    """
+    def _get(u):
+        if pacer is not None:
+            return pacer.call(u, lambda v: _kenpompy_get_html(browser, v))
+        return _kenpompy_get_html(browser, u)
+
+    def _fetch(u):
+        return _network_fetch(_get, u)
+
+    if cache is None:
+        cache = default_cache()
+    if cache is None:
+        content = _fetch(url)
+        if validate is not None:
+            validate(content)
+        return content
+    return cache.fetch(url, _fetch, validate)
+
+
+def fetch_url(url: str, cache: Optional[PageCache] = None, client=None) -> bytes:
+    """Plain GET of a public page (what `pd.read_html(url)` does), routed through the cache.
+
+    `client` is an optional `http_client.HttpClient` (pooled, with retries);
+    without one each call is a one-off `urllib` request.
+    """
+    def _get(u):
+        if client is not None:
+            return client.get(u)
+        with urllib.request.urlopen(u) as resp:
+            return resp.read()
+
+    def _fetch(u):
+        return _network_fetch(_get, u)
+
+    if cache is None:
+        cache = default_cache()
+    if cache is None:
+        return _fetch(url)
+    return cache.fetch(url, _fetch)
+
+
+def login(email: str, password: str):
+    """`kenpompy.utils.login`, skipped in replay mode where no page is fetched."""
+    if replaying():
+        return None
+    return _kenpompy_login(email, password)
+
+
+class CachedBrowser:
+    """Wraps a browser so libraries that call `browser.get(url)` directly
+    (e.g. `kenpompy.FanMatch`) go through the page cache. Pages are checked
+    like `get_html`'s, so a login page raises `InvalidPage` and is not cached.
+    """
+
+    class _Response:
+        status_code = 200
+
+        def __init__(self, content: bytes):
+            self.content = content
+
+        @property
+        def text(self) -> str:
+            return self.content.decode("utf-8", errors="replace")
+
+    def __init__(self, browser, cache: Optional[PageCache] = None):
+        self.browser = browser
+        self.cache = cache
+
+    def get(self, url: str, *args, **kwargs):
+        return self._Response(get_html(self.browser, url, self.cache))
+
+    def __getattr__(self, name):
+        return getattr(self.browser, name)
@@ -0,0 +1,293 @@
+#%%
+#======================================================================================
+#                                   REQUEST RATE LIMITING
+#======================================================================================
+"""
+Rate limiting shared by the scrapers.
+
+A single `TokenBucket` can gate any number of worker threads, so concurrency
+(how many requests are in flight) and rate (how many start per second) are
+configured independently.
+
+`AdaptivePacer` paces requests per host instead of at a fixed rate: it speeds
+up while a host answers quickly, backs off exponentially (with jitter) on
+429/5xx responses, and never exceeds the host's budget.
+"""
+
+import random as _random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import metrics
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Args:
+        rate (float): Tokens added per second, i.e. the sustained request rate.
+        capacity (float): Maximum tokens held, i.e. the largest burst allowed.
+        clock (callable): Monotonic clock in seconds. Injectable for tests.
+        sleep (callable): Sleep function matching `time.sleep`. Injectable for tests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> Optional[float]:
+        """Take `tokens` if available. Returns None on success, else seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return None
+            # While a hold() lasts, _updated is in the future and refilling waits for it
+            return max(self._updated - now, 0.0) + (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until `tokens` are available, then take them."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait is None:
+                return
+            with metrics.stage("wait"):
+                self._sleep(wait)
+
+    def hold(self, seconds: float) -> None:
+        """Empty the bucket so no request starts for at least `seconds`.
+
+        Used as a shared cool-down after a failure: every worker waiting on
+        this bucket is paused, not just the one that saw the error. Holds
+        that overlap end at the latest of them; they do not add up.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            # The bucket refills again from the end of the hold
+            self._updated = max(self._updated, now + seconds)
+
+
+#%%
+#Adaptive per-host pacing
+# Most requests per second ever sent to a host, whatever the pacer learns
+HOST_BUDGETS = {
+    "kenpom.com": 1.0,
+    "www.teamrankings.com": 4.0,
+}
+
+_STATUS_IN_MESSAGE = re.compile(r"status code:? (\d{3})")
+
+
+def host_of(url: str) -> str:
+    """Host of `url`; a bare host is returned as is."""
+    if "://" not in url:
+        return url
+    return urlparse(url).hostname or url
+
+
+def status_from_error(error: BaseException) -> Optional[int]:
+    """HTTP status behind a failed fetch, or None when there was no response.
+
+    Understands exceptions carrying a response (httpx, requests) and
+    kenpompy's "Failed to retrieve ... (status code: 429)" messages.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status
+    match = _STATUS_IN_MESSAGE.search(str(error))
+    return int(match.group(1)) if match else None
+
+
+class _HostPace:
+    def __init__(self, rate: float, budget: float, now: float):
+        self.rate = rate
+        self.budget = budget
+        self.next_at = now
+        self.failures = 0
+        self.requests = 0
+        self.backoffs = 0
+
+
+class AdaptivePacer:
+    """Thread-safe request pacing per host that adapts to the server's health.
+
+    Each host has its own rate, and request starts are spaced `1 / rate`
+    apart. While responses come back OK and faster than `slow_latency`,
+    the rate grows by `increase` per response, up to the host's budget.
+    A slow response trims the rate by `slow_factor`.
+    A 429, a 5xx or a failed connection does three things:
+    - cuts the rate by `backoff_factor`;
+    - pauses the host for `backoff * 2 ** (failures - 1)` seconds, jittered
+      to between half and all of that, capped at `max_backoff`, and never
+      shorter than a numeric Retry-After;
+    - pauses every thread waiting on that host, not just the one that failed.
+
+    Args:
+        start_rate (float): Requests per second a host starts at (capped by its budget).
+        min_rate (float): Lowest rate backoff drives a host to.
+        budgets (dict or None): Host -> most requests per second, `HOST_BUDGETS` by default.
+        default_budget (float): Budget of hosts not in `budgets`.
+        increase (float): Requests per second added per healthy response.
+        slow_latency (float): Response time in seconds above which the rate is trimmed.
+        slow_factor (float): Rate multiplier after a slow response.
+        backoff_factor (float): Rate multiplier after a failure.
+        backoff (float): Pause after a first failure; doubled per consecutive failure.
+        max_backoff (float): Longest pause.
+        clock (callable): Monotonic clock in seconds. Injectable for tests.
+        sleep (callable): Sleep function matching `time.sleep`. Injectable for tests.
+        random (callable): Uniform [0, 1) source for the jitter. Injectable for tests.
+    """
+
+    def __init__(
+        self,
+        start_rate: float = 0.5,
+        min_rate: float = 0.05,
+        budgets: Optional[Dict[str, float]] = None,
+        default_budget: float = 1.0,
+        increase: float = 0.05,
+        slow_latency: float = 2.0,
+        slow_factor: float = 0.9,
+        backoff_factor: float = 0.5,
+        backoff: float = 2.0,
+        max_backoff: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        random: Callable[[], float] = _random.random,
+    ):
+        if not 0 < min_rate <= start_rate:
+            raise ValueError("need 0 < min_rate <= start_rate")
+
+        self.start_rate = float(start_rate)
+        self.min_rate = float(min_rate)
+        self.budgets = dict(HOST_BUDGETS if budgets is None else budgets)
+        self.default_budget = float(default_budget)
+        self.increase = increase
+        self.slow_latency = slow_latency
+        self.slow_factor = slow_factor
+        self.backoff_factor = backoff_factor
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._random = random
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostPace] = {}
+
+    def _host(self, host: str) -> _HostPace:
+        state = self._hosts.get(host)
+        if state is None:
+            budget = max(self.min_rate, self.budgets.get(host, self.default_budget))
+            state = self._hosts[host] = _HostPace(min(self.start_rate, budget), budget, self._clock())
+        return state
+
+    def acquire(self, url: str) -> float:
+        """Block until the next request to `url`'s host may start. Returns the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            state = self._host(host_of(url))
+            start = max(now, state.next_at)
+            state.next_at = start + 1.0 / state.rate
+            state.requests += 1
+        wait = start - now
+        if wait > 0:
+            with metrics.stage("wait"):
+                self._sleep(wait)
+        return wait
+
+    def record(self, url: str, latency: Optional[float], status: Optional[int] = 200,
+               retry_after: Optional[str] = None) -> float:
+        """Adjust `url`'s host after a response. Returns the pause imposed (0 when healthy).
+
+        `status` None means no response at all (connection error or timeout).
+        Other 4xx responses say nothing about server load and change nothing.
+        """
+        with self._lock:
+            state = self._host(host_of(url))
+            if status is None or status == 429 or status >= 500:
+                state.failures += 1
+                state.backoffs += 1
+                metrics.count("backoffs")
+                state.rate = max(self.min_rate, state.rate * self.backoff_factor)
+                pause = min(self.max_backoff, self.backoff * 2 ** (state.failures - 1))
+                pause *= 0.5 + 0.5 * self._random()
+                if retry_after:
+                    try:
+                        pause = max(pause, min(self.max_backoff, float(retry_after)))
+                    except ValueError:
+                        pass
+                state.next_at = max(state.next_at, self._clock() + pause)
+                return pause
+
+            if status < 400:
+                state.failures = 0
+                if latency is not None and latency > self.slow_latency:
+                    state.rate = max(self.min_rate, state.rate * self.slow_factor)
+                else:
+                    state.rate = min(state.budget, state.rate + self.increase)
+            return 0.0
+
+    def call(self, url: str, fetch: Callable[[str], Any]) -> Any:
+        """`fetch(url)` paced for its host, recording how it went. Exceptions are re-raised."""
+        self.acquire(url)
+        started = self._clock()
+        try:
+            result = fetch(url)
+        except Exception as e:
+            self.record(url, self._clock() - started, status_from_error(e))
+            raise
+        self.record(url, self._clock() - started)
+        return result
+
+    def rate(self, url: str) -> float:
+        """Current requests per second for `url`'s host."""
+        with self._lock:
+            return self._host(host_of(url)).rate
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Rate, budget, requests and backoffs per host seen so far."""
+        with self._lock:
+            return {
+                host: {"rate": s.rate, "budget": s.budget, "requests": s.requests, "backoffs": s.backoffs}
+                for host, s in self._hosts.items()
+            }
+
+
+_default_pacer: Optional[AdaptivePacer] = None
+_default_lock = threading.Lock()
+
+
+def default_pacer() -> AdaptivePacer:
+    """The process-wide pacer, created on first use, so every scraper shares host budgets."""
+    global _default_pacer
+    with _default_lock:
+        if _default_pacer is None:
+            _default_pacer = AdaptivePacer()
+        return _default_pacer
@@ -0,0 +1,180 @@
+#%%
+#======================================================================================
+#                           POOL OF KENPOM SESSIONS
+#======================================================================================
+"""
+A pool of authenticated KenPom sessions for scrapers that fetch many pages.
+
+Every session has its own token bucket, so the pool's throughput grows with
+its size while each session keeps to the per-session rate. A fetch takes the
+first session with a token free, or waits for whichever frees one first.
+
+A session is expired when a page it fetched comes back as the login form.
+That session alone is logged in again (once, however many threads saw it
+expire) and the page is fetched again; the other sessions keep working.
+
+Pages go through the page cache like `page_cache.get_html`; the expiry check
+applies only to pages fetched from the network.
+
+With an `AdaptivePacer`, network fetches are also paced per host across all
+sessions (the host's budget caps the pool as a whole), and a failed fetch
+backs the host off exponentially instead of resting its session for a fixed
+`error_cooldown`.
+"""
+
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from kenpompy.utils import get_html as _kenpompy_get_html
+
+import metrics
+from page_cache import PageCache, default_cache, logged_out
+from rate_limit import AdaptivePacer, TokenBucket
+
+
+class SessionExpired(Exception):
+    """Raised when a session is still logged out after logging in again, or cannot log in again."""
+
+
+class _Session:
+    def __init__(self, index: int, browser, limiter: TokenBucket):
+        self.index = index
+        self.browser = browser
+        self.limiter = limiter
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.relogins = 0
+
+
+class SessionPool:
+    """Authenticated sessions, each with its own rate limit.
+
+    Args:
+        login (callable or None): Returns a new logged-in browser. Used to create
+            `size` sessions when `browsers` is not given, and to renew expired ones.
+            Without it an expired session raises `SessionExpired`.
+        size (int): Sessions to create with `login`.
+        browsers (iterable or None): Already logged-in browsers to use instead (e.g. stubs).
+        requests_per_second (float): Sustained request rate of each session.
+        burst (int): Requests a session may start back to back.
+        error_cooldown (float): Seconds a session rests after a failed request (without a pacer).
+        is_expired (callable): Tells from a fetched page whether its session expired.
+        pacer (AdaptivePacer or None): Per-host pacing shared by every session.
+        clock (callable): Monotonic clock in seconds. Injectable for tests.
+        sleep (callable): Sleep function matching `time.sleep`. Injectable for tests.
+    """
+
+    def __init__(
+        self,
+        login: Optional[Callable[[], object]] = None,
+        size: int = 1,
+        browsers: Optional[Iterable] = None,
+        requests_per_second: float = 0.25,
+        burst: int = 1,
+        error_cooldown: float = 20,
+        is_expired: Callable[[bytes], bool] = logged_out,
+        pacer: Optional[AdaptivePacer] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if browsers is None:
+            if login is None:
+                raise ValueError("SessionPool needs either a login function or browsers")
+            browsers = [login() for _ in range(size)]
+        browsers = list(browsers)
+        if not browsers:
+            raise ValueError("SessionPool needs at least one session")
+
+        self._login = login
+        self.error_cooldown = error_cooldown
+        self.is_expired = is_expired
+        self.pacer = pacer
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next = 0
+        self.sessions: List[_Session] = [
+            _Session(i, browser, TokenBucket(requests_per_second, capacity=burst, clock=clock, sleep=sleep))
+            for i, browser in enumerate(browsers)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def _acquire(self) -> _Session:
+        """Take a token from the first session that has one, round robin."""
+        while True:
+            with self._lock:
+                start = self._next
+                self._next = (self._next + 1) % len(self.sessions)
+            waits = []
+            for offset in range(len(self.sessions)):
+                session = self.sessions[(start + offset) % len(self.sessions)]
+                wait = session.limiter.try_acquire()
+                if wait is None:
+                    return session
+                waits.append(wait)
+            with metrics.stage("wait"):
+                self._sleep(min(waits))
+
+    def _relogin(self, session: _Session, generation: int) -> None:
+        """Log `session` in again, unless another thread already has since it was used."""
+        with session.lock:
+            if session.generation != generation:
+                return
+            if self._login is None:
+                raise SessionExpired(f"Session {session.index} expired and the pool has no login function")
+            print(f"Session {session.index} expired, logging in again")
+            session.browser = self._login()
+            session.generation += 1
+            session.relogins += 1
+            metrics.count("relogins")
+
+    def _get(self, session: _Session, url: str) -> bytes:
+        with self._lock:
+            session.requests += 1
+        with metrics.stage("fetch"):
+            if self.pacer is not None:
+                # The pacer backs the host off on failure
+                html = self.pacer.call(url, lambda u: _kenpompy_get_html(session.browser, u))
+            else:
+                try:
+                    html = _kenpompy_get_html(session.browser, url)
+                except Exception:
+                    # Rest this session only; the others keep fetching
+                    session.limiter.hold(self.error_cooldown)
+                    raise
+        metrics.count("pages_fetched")
+        metrics.count("bytes_fetched", len(html))
+        return html
+
+    def fetch(self, url: str) -> bytes:
+        """Fetch `url` on the next free session, logging it in again if it expired."""
+        session = self._acquire()
+        generation = session.generation
+        html = self._get(session, url)
+        if not self.is_expired(html):
+            return html
+
+        self._relogin(session, generation)
+        session.limiter.acquire()
+        html = self._get(session, url)
+        if self.is_expired(html):
+            raise SessionExpired(f"Session {session.index} still logged out after logging in again")
+        return html
+
+    def get_html(self, url: str, cache: Optional[PageCache] = None) -> bytes:
+        """`page_cache.get_html` spread over the pool."""
+        if cache is None:
+            cache = default_cache()
+        if cache is None:
+            return self.fetch(url)
+        return cache.fetch(url, self.fetch)
+
+    def stats(self) -> List[dict]:
+        """Requests and re-logins per session."""
+        return [
+            {"session": s.index, "requests": s.requests, "relogins": s.relogins}
+            for s in self.sessions
+        ]
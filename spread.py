@@ -0,0 +1,51 @@
+#%%
+#======================================================================================
+#                       WIN PROBABILITY -> POINT SPREAD
+#======================================================================================
+"""
+Turn KenPom win probabilities into point spreads for whole columns at once.
+
+For a probability up to `SPREAD_CUTOFF` the spread is `SPREAD_SCALE` times the
+standard normal quantile of the probability; above it the quantile blows up,
+so the predicted score margin is used instead.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+SPREAD_SCALE = 11.06
+SPREAD_CUTOFF = 0.97
+
+
+def _as_float(values) -> np.ndarray:
+    """Float ndarray from a list, ndarray or (nullable) Series, with NA as NaN."""
+    return pd.array(values, dtype="Float64").to_numpy(dtype=float, na_value=np.nan)
+
+
+def spread_from_win_probability(
+    win_probability,
+    predicted_winner_score,
+    predicted_loser_score,
+    scale: float = SPREAD_SCALE,
+    cutoff: float = SPREAD_CUTOFF,
+) -> np.ndarray:
+    """Predicted winner's margin for every game, from one `norm.ppf` call.
+
+    Args:
+        win_probability: Predicted winner's win probability as a fraction (0.73).
+        predicted_winner_score: Predicted winner's score, used above `cutoff`.
+        predicted_loser_score: Predicted loser's score, used above `cutoff`.
+        scale (float): Points per standard deviation.
+        cutoff (float): Highest probability converted through the normal quantile.
+
+    Returns:
+        ndarray of floats, NaN where the win probability is missing.
+    """
+    wp = _as_float(win_probability)
+    spread = _as_float(predicted_winner_score) - _as_float(predicted_loser_score)
+
+    low = wp <= cutoff
+    spread[low] = scale * norm.ppf(wp[low], loc=0, scale=1)
+    spread[np.isnan(wp)] = np.nan
+    return spread
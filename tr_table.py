@@ -0,0 +1,88 @@
+#%%
+#======================================================================================
+#                       TEAMRANKINGS STAT TABLE EXTRACTION
+#======================================================================================
+"""
+Pull the team and value cells of a TeamRankings stat page's first table
+without `pd.read_html`.
+
+`pd.read_html` parses the whole page, builds a DataFrame for every table and
+infers column types, when only two columns of the first table are used. Here
+the first `<table>...</table>` is cut out of the page bytes and only that
+fragment is parsed with lxml; the page is parsed whole only when the table
+holds a nested table.
+
+Cell text is normalised the way `pd.read_html` does it (runs of whitespace
+collapsed, stripped). Values stay strings ("38.2%", "--"); `build_rows`
+converts them.
+"""
+
+import re
+from typing import List, NamedTuple
+
+from lxml import etree
+
+# Plain etree elements: lxml.html's per-element class lookup costs more than the parse
+_PARSER = etree.HTMLParser(encoding="utf-8")
+_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+class StatTable(NamedTuple):
+    """Team and value columns of a stat table, in page order."""
+    stat_col: str
+    teams: List[str]
+    values: List[str]
+
+
+def _text(el) -> str:
+    return _WHITESPACE.sub(" ", "".join(el.itertext())).strip()
+
+
+def _first_table(html: bytes):
+    start = html.find(b"<table")
+    end = html.find(b"</table>", start)
+    if start == -1 or end == -1:
+        raise ValueError("No tables found")
+    fragment = html[start:end + len(b"</table>")]
+    if fragment.find(b"<table", 1) == -1:
+        return etree.fromstring(fragment, _PARSER).find(".//table")
+    # Nested table: let lxml find where the outer one really ends
+    return etree.fromstring(html, _PARSER).find(".//table")
+
+
+def extract_stat_table(html: bytes, team_col: str = "Team", value_index: int = 2) -> StatTable:
+    """Team and value cells of the first table on a TeamRankings stat page.
+
+    Args:
+        html (bytes): Page body.
+        team_col (str): Header of the team column.
+        value_index (int): Position of the value column, as `df.columns[2]` of `pd.read_html`.
+
+    Returns:
+        StatTable with the value column's header and the team and value cell texts.
+
+    Raises:
+        ValueError: When the page has no table.
+        KeyError: When the table has no `team_col` header.
+    """
+    table = _first_table(html)
+
+    body_rows = []
+    header = None
+    for tr in table.iter("tr"):
+        cells = [cell for cell in tr if cell.tag in ("td", "th")]
+        if header is None and cells and all(cell.tag == "th" for cell in cells):
+            header = [_text(th) for th in cells]
+        else:
+            body_rows.append(cells)
+    if header is None or team_col not in header:
+        raise KeyError(team_col)
+
+    team_index = header.index(team_col)
+    teams, values = [], []
+    for cells in body_rows:
+        if len(cells) <= max(team_index, value_index):
+            continue
+        teams.append(_text(cells[team_index]))
+        values.append(_text(cells[value_index]))
+    return StatTable(header[value_index], teams, values)